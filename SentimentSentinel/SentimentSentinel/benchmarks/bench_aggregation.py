@@ -0,0 +1,133 @@
+"""
+Compare the shared bincount aggregation kernel with per-chart pandas aggregates.
+
+The pandas path repeats what the News page charts used to do separately
+(groupby per column, value_counts, crosstab and pivot_table). The kernel
+path factorizes the key columns once and computes every grouping with
+np.bincount. Results are checked for equality.
+
+Usage:
+    python -m benchmarks.bench_aggregation --rows 1000000 --repeats 5
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from utils.aggregation import compute_aggregates, aggregate_matrix
+from benchmarks.synthetic import make_scored_frame
+
+# Groupings needed by the News page charts
+GROUPINGS = [('source', 'query'), ('country', 'source'), 'source', 'query', 'sentiment_category']
+
+def pandas_aggregates(df):
+    """
+    Compute the News page aggregates with independent pandas calls.
+
+    Args:
+        df (DataFrame): Scored news data
+
+    Returns:
+        dict: Aggregates by name
+    """
+    return {
+        "query_mean": df.groupby('query', observed=True)['sentiment_score'].mean(),
+        "source_mean": df.groupby('source', observed=True)['sentiment_score'].mean(),
+        "source_count": df['source'].value_counts(),
+        "category_count": df['sentiment_category'].value_counts(),
+        "coverage": pd.crosstab(df['source'], df['query']),
+        "heatmap": df.pivot_table(values='sentiment_score', index='country', columns='source', aggfunc='mean',
+                                  observed=True)
+    }
+
+def kernel_aggregates(df):
+    """
+    Compute the News page aggregates with the shared kernel.
+
+    Args:
+        df (DataFrame): Scored news data
+
+    Returns:
+        dict: Aggregates by name
+    """
+    aggregates = compute_aggregates(df, 'sentiment_score', GROUPINGS)
+    return {
+        "query_mean": aggregates[('query',)].set_index('query')['mean'],
+        "source_mean": aggregates[('source',)].set_index('source')['mean'],
+        "source_count": aggregates[('source',)].set_index('source')['size'],
+        "category_count": aggregates[('sentiment_category',)].set_index('sentiment_category')['size'],
+        "coverage": aggregate_matrix(aggregates[('source', 'query')], 'source', 'query', 'size', fill_value=0),
+        "heatmap": aggregate_matrix(aggregates[('country', 'source')], 'country', 'source', 'mean')
+    }
+
+def _matches(expected, actual):
+    """
+    Check that a kernel aggregate matches its pandas counterpart.
+
+    Args:
+        expected (Series or DataFrame): pandas result
+        actual (Series or DataFrame): Kernel result
+
+    Returns:
+        bool: True if labels and values agree
+    """
+    if isinstance(expected, pd.Series):
+        actual = actual.reindex(expected.index.astype(object))
+        return np.allclose(expected.to_numpy(dtype=float), actual.to_numpy(dtype=float), equal_nan=True)
+
+    actual = actual.reindex(index=expected.index.astype(object), columns=expected.columns.astype(object))
+    return np.allclose(expected.to_numpy(dtype=float), actual.to_numpy(dtype=float), equal_nan=True)
+
+def _best_time(function, df, repeats):
+    """
+    Time a function and keep the fastest run.
+
+    Args:
+        function (callable): Function taking the frame
+        df (DataFrame): Input frame
+        repeats (int): Number of runs
+
+    Returns:
+        tuple: (fastest seconds, last result)
+    """
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function(df)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def run_aggregation_benchmark(rows=1000000, repeats=5, seed=0):
+    """
+    Time both aggregation paths and check that they agree.
+
+    Args:
+        rows (int): Number of articles
+        repeats (int): Runs per path
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: One row per path with the fastest time and the agreement check
+    """
+    df = make_scored_frame(rows, seed=seed)
+
+    pandas_seconds, expected = _best_time(pandas_aggregates, df, repeats)
+    kernel_seconds, actual = _best_time(kernel_aggregates, df, repeats)
+    agrees = all(_matches(expected[name], actual[name]) for name in expected)
+
+    return pd.DataFrame([
+        {"path": "pandas", "seconds": round(pandas_seconds, 4), "speedup": 1.0, "matches": True},
+        {"path": "bincount kernel", "seconds": round(kernel_seconds, 4),
+         "speedup": round(pandas_seconds / kernel_seconds, 2), "matches": agrees}
+    ])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Sentigrade aggregation kernel")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run_aggregation_benchmark(args.rows, args.repeats)
+    print(results.to_string(index=False))
+
+    if not results["matches"].all():
+        raise SystemExit("Aggregation results differ")
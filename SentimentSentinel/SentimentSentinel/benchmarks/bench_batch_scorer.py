@@ -0,0 +1,127 @@
+"""
+Benchmark the headless batch scorer and check that resuming is lossless.
+
+Scores a synthetic CSV with different worker counts, then kills a CLI run
+partway through, resumes it with --resume and checks the output matches
+an uninterrupted run row for row.
+
+Usage:
+    python -m benchmarks.bench_batch_scorer --rows 100000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from utils.batch_scorer import load_checkpoint, score_file
+from benchmarks.bench_scoring_service import SAMPLE_TEXTS
+
+def make_text_frame(rows, seed=0):
+    """
+    Build unscored posts with varied sentiment.
+
+    Args:
+        rows (int): Number of rows
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: Rows with 'id', 'text' and 'country'
+    """
+    rng = np.random.default_rng(seed)
+    texts = np.array(SAMPLE_TEXTS, dtype=object)[rng.integers(0, len(SAMPLE_TEXTS), rows)]
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "text": [f"{text} ({i})" for i, text in enumerate(texts)],
+        "country": rng.choice(["Singapore", "Malaysia", "Indonesia", "Thailand", "Vietnam"], rows)
+    })
+
+def run_batch_benchmark(rows=50000, workers=(1, 2, 4), chunk_size=2000, seed=0):
+    """
+    Time score_file for each worker count.
+
+    Args:
+        rows (int): Number of rows
+        workers (tuple): Worker counts to compare
+        chunk_size (int): Rows per chunk
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: One row per worker count with elapsed time and docs/sec
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, "input.csv")
+        make_text_frame(rows, seed).to_csv(input_path, index=False)
+
+        for count in workers:
+            output_path = os.path.join(directory, f"output_{count}.csv")
+            summary = score_file(input_path, output_path, workers=count, chunk_size=chunk_size, progress_stream=None)
+            results.append({"workers": count, "elapsed_s": summary["elapsed_s"], "docs_per_s": summary["docs_per_s"]})
+
+    return pd.DataFrame(results)
+
+def check_resume(rows=20000, chunk_size=1000, workers=2, seed=0):
+    """
+    Kill a CLI run after a few chunks, resume it and compare with an uninterrupted run.
+
+    Args:
+        rows (int): Number of rows
+        chunk_size (int): Rows per chunk
+        workers (int): Scoring processes
+        seed (int): Random seed
+
+    Returns:
+        dict: Chunks finished before the kill and whether the outputs match
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, "input.csv")
+        reference_path = os.path.join(directory, "reference.csv")
+        output_path = os.path.join(directory, "output.csv")
+        make_text_frame(rows, seed).to_csv(input_path, index=False)
+
+        score_file(input_path, reference_path, workers=workers, chunk_size=chunk_size, progress_stream=None)
+
+        command = [sys.executable, "-m", "utils.batch_scorer", input_path, "-o", output_path,
+                   "--workers", str(workers), "--chunk-size", str(chunk_size)]
+        # Own session so the kill takes the worker processes down too
+        process = subprocess.Popen(command, stderr=subprocess.DEVNULL, start_new_session=True)
+
+        # Hard-kill the run once a few chunks are checkpointed
+        checkpoint_path = output_path + ".checkpoint.json"
+        chunks_before_kill = 0
+        while process.poll() is None:
+            try:
+                checkpoint = load_checkpoint(checkpoint_path)
+            except ValueError:
+                checkpoint = None
+            if checkpoint and checkpoint["chunks_done"] >= 3:
+                os.killpg(process.pid, signal.SIGKILL)
+                chunks_before_kill = checkpoint["chunks_done"]
+                break
+            time.sleep(0.01)
+        process.wait()
+
+        subprocess.run(command + ["--resume"], check=True, stderr=subprocess.DEVNULL)
+
+        expected = pd.read_csv(reference_path)
+        actual = pd.read_csv(output_path)
+        return {"chunks_before_kill": chunks_before_kill, "rows": len(actual), "identical": expected.equals(actual)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Sentigrade batch scorer")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(run_batch_benchmark(args.rows, args.workers, args.chunk_size).to_string(index=False))
+
+    resume = check_resume()
+    print(f"Resume after kill at chunk {resume['chunks_before_kill']}: {resume['rows']} rows, "
+          f"identical to uninterrupted run: {resume['identical']}")
+    if not resume["identical"]:
+        raise SystemExit("Resumed output differs from an uninterrupted run")
@@ -0,0 +1,149 @@
+"""
+Offline agreement benchmark for the cascade scorer.
+
+Compares the cascade (local first, Gemini only for uncertain texts)
+against sending every text to Gemini, for several escalation margins.
+Reports the escalation rate, the Gemini time saved and how often the
+cascade's category agrees with the all-Gemini category.
+
+Without --labels, a synthetic headline corpus with known sentiment is
+used and Gemini is simulated by those reference scores plus noise. With
+--labels, a CSV of recorded Gemini scores (columns 'text' and
+'gemini_score', optionally 'language') is used as the reference instead.
+
+Usage:
+    python -m benchmarks.bench_cascade --rows 5000 --margins 0 0.05 0.1 0.2
+    python -m benchmarks.bench_cascade --labels recorded_gemini_scores.csv
+"""
+import argparse
+import numpy as np
+import pandas as pd
+from utils.scoring import CASCADE_MARGIN, score_batch, score_cascade
+from utils.sentiment_analyzer import categorize_sentiment
+
+# Headline subjects
+SUBJECTS = [
+    "Government", "Central bank", "Local farmers", "Tech startup", "Tourism board",
+    "Opposition party", "Court", "City council", "Exporters", "Hospital staff"
+]
+
+# English phrases with the reference sentiment Gemini is assumed to give them
+ENGLISH_PHRASES = [
+    ("celebrates record growth and a great year", 0.8),
+    ("wins praise for excellent flood relief", 0.7),
+    ("reports strong gains in exports", 0.5),
+    ("sees modest improvement in sales", 0.2),
+    ("is cautiously optimistic about talks", 0.15),
+    ("announces meeting schedule for next week", 0.0),
+    ("publishes quarterly figures", 0.0),
+    ("reviews proposal without a decision", -0.05),
+    ("faces delays in road project", -0.2),
+    ("warns of slower growth", -0.3),
+    ("struggles with rising debt and layoffs", -0.6),
+    ("condemned over deadly disaster response", -0.8)
+]
+
+# Non-English phrases (escalated for their language or their neutral local score)
+OTHER_PHRASES = [
+    ("dan warga menyambut baik program baru ini", 0.5),
+    ("tidak setuju dengan kebijakan yang baru", -0.4),
+    ("ang mga magsasaka ay masaya sa ani", 0.6),
+    ("đã công bố kết quả kinh doanh quý này", 0.0)
+]
+
+# Share of generated headlines that are non-English
+OTHER_SHARE = 0.15
+
+# Noise added to reference scores to simulate Gemini's variability
+GEMINI_NOISE = 0.05
+
+# Simulated Gemini latency per call, for the time-saved estimate
+GEMINI_LATENCY_MS = 400
+
+def make_labelled_headlines(rows, seed=0):
+    """
+    Build synthetic headlines with reference (simulated Gemini) scores.
+
+    Args:
+        rows (int): Number of headlines
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: Columns 'text' and 'gemini_score'
+    """
+    rng = np.random.default_rng(seed)
+    subjects = rng.choice(SUBJECTS, rows)
+    other = rng.random(rows) < OTHER_SHARE
+    english = rng.integers(0, len(ENGLISH_PHRASES), rows)
+    foreign = rng.integers(0, len(OTHER_PHRASES), rows)
+
+    texts, scores = [], []
+    for subject, is_other, e, f in zip(subjects, other, english, foreign):
+        phrase, score = OTHER_PHRASES[f] if is_other else ENGLISH_PHRASES[e]
+        texts.append(f"{subject} {phrase}")
+        scores.append(score)
+
+    # Gemini at temperature 0 gives a repeated text the same score, so noise is per distinct text
+    df = pd.DataFrame({"text": texts, "gemini_score": scores})
+    codes, uniques = pd.factorize(df["text"])
+    noise = rng.normal(0, GEMINI_NOISE, len(uniques))
+    df["gemini_score"] = np.clip(df["gemini_score"] + noise[codes], -1, 1)
+    return df
+
+def run_cascade_benchmark(labels, margins=(0.0, 0.05, CASCADE_MARGIN, 0.2), latency_ms=GEMINI_LATENCY_MS):
+    """
+    Measure escalation and category agreement for each margin.
+
+    Args:
+        labels (DataFrame): 'text' and 'gemini_score' columns (optionally 'language')
+        margins (tuple): Escalation margins to compare
+        latency_ms (float): Gemini latency per call used for the time estimate
+
+    Returns:
+        DataFrame: One row per margin (plus a local-only baseline)
+    """
+    texts = labels["text"].astype(str).tolist()
+    languages = labels["language"].tolist() if "language" in labels.columns else None
+    # Repeated texts in recorded labels are averaged so each text has one reference score
+    reference = labels.groupby(labels["text"].astype(str))["gemini_score"].mean().to_dict()
+    gemini_categories = np.array([categorize_sentiment(reference[text]) for text in texts], dtype=object)
+
+    def gemini_function(text, api_key, retry_budget):
+        return reference[text]
+
+    rows = []
+    local = score_batch(texts, languages)
+    local_categories = np.array([result["category"] for result in local], dtype=object)
+    rows.append({
+        "margin": "local only",
+        "escalation_rate": 0.0,
+        "gemini_calls": 0,
+        "gemini_s_saved": round(len(texts) * latency_ms / 1000, 1),
+        "agreement": round(float((local_categories == gemini_categories).mean()), 4)
+    })
+
+    for margin in margins:
+        results = score_cascade(texts, "offline", languages, margin=margin, gemini_function=gemini_function)
+        calls = sum(result["escalated"] for result in results)
+        categories = np.array([result["category"] for result in results], dtype=object)
+        rows.append({
+            "margin": margin,
+            "escalation_rate": round(calls / len(texts), 4),
+            "gemini_calls": calls,
+            "gemini_s_saved": round((len(texts) - calls) * latency_ms / 1000, 1),
+            "agreement": round(float((categories == gemini_categories).mean()), 4)
+        })
+
+    return pd.DataFrame(rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark cascade scoring agreement and escalation")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--margins", type=float, nargs="+", default=[0.0, 0.05, CASCADE_MARGIN, 0.2])
+    parser.add_argument("--labels", default=None, help="CSV of recorded Gemini scores ('text', 'gemini_score')")
+    parser.add_argument("--latency-ms", type=float, default=GEMINI_LATENCY_MS)
+    args = parser.parse_args()
+
+    labels = pd.read_csv(args.labels) if args.labels else make_labelled_headlines(args.rows)
+    print(f"{len(labels)} headlines; agreement is category agreement with all-Gemini scoring")
+    print(run_cascade_benchmark(labels, args.margins, args.latency_ms).to_string(index=False))
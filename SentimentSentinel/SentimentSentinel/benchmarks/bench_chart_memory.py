@@ -0,0 +1,104 @@
+"""
+Profile peak memory of the time-based chart factories.
+
+Charts are built straight from a frame as the page loaders produce it
+(random date order, cast and sorted once by apply_compact_schema), so the
+prepare_time_frame call inside each chart is measured too. The peak traced
+allocation must stay well below the size of the frame (no full copy), and
+the caller's frame must be left unchanged. The copy prepare_time_frame
+makes for a frame that skipped ingest is reported for comparison.
+
+Usage:
+    python -m benchmarks.bench_chart_memory --rows 1000000
+"""
+import argparse
+import tracemalloc
+import pandas as pd
+from utils.chart_data import prepare_time_frame
+from utils.schema import apply_compact_schema
+from utils.figure_cache import set_figure_cache_enabled
+from utils.visualization import create_sentiment_timeline, create_trend_chart, create_forecast_chart
+from benchmarks.synthetic import make_scored_frame
+
+# Peak allocation allowed per chart, as a fraction of the frame's size
+MAX_PEAK_FRACTION = 0.5
+
+def _frame_fingerprint(df):
+    """
+    Fingerprint a frame's dtypes and contents to detect mutation.
+
+    Args:
+        df (DataFrame): Frame to fingerprint
+
+    Returns:
+        tuple: (dtypes, content hash)
+    """
+    return tuple(map(str, df.dtypes)), int(pd.util.hash_pandas_object(df, index=False).sum())
+
+def run_chart_memory_profile(rows=200000, seed=0):
+    """
+    Measure peak memory per chart on an ingested (unprepared) frame.
+
+    Args:
+        rows (int): Number of posts
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: One row per chart with peak MB, frame MB and checks; the
+            'prepare (not ingested)' row shows the sorted copy made for a frame
+            that skipped ingest and is not checked
+    """
+    # Rows are generated in random date order; the compact schema sorts them at ingest
+    df = apply_compact_schema(make_scored_frame(rows, seed=seed, compact=False))
+    # The same compact frame with rows out of date order, as if it skipped ingest
+    unsorted = df.sample(frac=1, random_state=seed)
+    frame_bytes = df.memory_usage(deep=True).sum()
+    countries = list(df['country'].cat.categories)[:5]
+
+    charts = {
+        "prepare (ingested)": lambda: prepare_time_frame(df, 'date'),
+        "timeline": lambda: create_sentiment_timeline(df, 'date', 'sentiment_score'),
+        "timeline (raw)": lambda: create_sentiment_timeline(df, 'date', 'sentiment_score', max_points=None),
+        "trend": lambda: create_trend_chart(df, 'date', 'country', 'sentiment_score', countries),
+        "forecast": lambda: create_forecast_chart(df, None, 'date', 'sentiment_score'),
+        "prepare (not ingested)": lambda: prepare_time_frame(unsorted, 'date')
+    }
+
+    # Measure the chart builds themselves, not cache hits
+    set_figure_cache_enabled(False)
+
+    results = []
+    for name, build in charts.items():
+        before = _frame_fingerprint(df)
+
+        # Warm up so one-time imports and caches aren't counted
+        build()
+
+        tracemalloc.start()
+        build()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results.append({
+            "chart": name,
+            "peak_mb": round(peak / 1e6, 1),
+            "frame_mb": round(frame_bytes / 1e6, 1),
+            "peak_fraction": round(peak / frame_bytes, 2),
+            "no_full_copy": peak < MAX_PEAK_FRACTION * frame_bytes,
+            "frame_unchanged": _frame_fingerprint(df) == before
+        })
+
+    set_figure_cache_enabled(True)
+    return pd.DataFrame(results)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile Sentigrade chart memory")
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    results = run_chart_memory_profile(args.rows)
+    print(results.to_string(index=False))
+
+    checked = results[results["chart"] != "prepare (not ingested)"]
+    if not (checked["no_full_copy"].all() and results["frame_unchanged"].all()):
+        raise SystemExit("Chart memory profile failed")
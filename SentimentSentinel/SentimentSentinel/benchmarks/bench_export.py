@@ -0,0 +1,68 @@
+"""
+Benchmark export formats: write time, file size and re-read time.
+
+Usage:
+    python -m benchmarks.bench_export --rows 1000000
+"""
+import argparse
+import io
+import time
+import pandas as pd
+from utils.data_processor import export_to_buffer
+from benchmarks.synthetic import make_scored_frame
+
+# Formats compared and the reader used to re-parse each one
+READERS = {
+    "csv": pd.read_csv,
+    "json": pd.read_json,
+    "jsonl": lambda buffer: pd.read_json(buffer, lines=True),
+    "parquet": pd.read_parquet,
+    "feather": pd.read_feather
+}
+
+def run_export_benchmark(rows=100000, compression=None, seed=0):
+    """
+    Time each export format on a synthetic scored frame.
+
+    Args:
+        rows (int): Number of rows
+        compression (str): Compression passed to export_to_buffer
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: One row per format with write time, size and read time
+    """
+    df = make_scored_frame(rows, seed=seed)
+    results = []
+
+    for format, reader in READERS.items():
+        start = time.perf_counter()
+        buffer = export_to_buffer(df, format=format, compression=compression)
+        write_seconds = time.perf_counter() - start
+
+        data = buffer.read()
+        buffer.close()
+
+        read_seconds = None
+        if compression is None or format in ("parquet", "feather"):
+            start = time.perf_counter()
+            reader(io.BytesIO(data))
+            read_seconds = time.perf_counter() - start
+
+        results.append({
+            "format": format,
+            "write_s": round(write_seconds, 3),
+            "size_mb": round(len(data) / 1e6, 2),
+            "bytes_per_row": round(len(data) / rows, 1),
+            "read_s": None if read_seconds is None else round(read_seconds, 3)
+        })
+
+    return pd.DataFrame(results)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Sentigrade export formats")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--compression", choices=["gzip", "zstd"], default=None)
+    args = parser.parse_args()
+
+    print(run_export_benchmark(args.rows, args.compression).to_string(index=False))
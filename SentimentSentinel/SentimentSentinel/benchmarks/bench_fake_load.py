@@ -0,0 +1,99 @@
+"""
+Load-test the news pipeline against the offline Google stand-in.
+
+Starts benchmarks.fake_google, points the real Custom Search and Gemini
+clients at it and has several concurrent sessions request the same news
+view through fetch_and_analyze_news. Scenarios: no shared cache, the
+shared result cache, injected transient errors and an exhausted Gemini
+quota. Reports wall time, requests seen by the fake service and headlines
+left unscored.
+
+Usage:
+    python -m benchmarks.bench_fake_load --sessions 8 --latency 0.05 --error-rate 0.1
+"""
+import argparse
+import threading
+import time
+import pandas as pd
+import utils.news_api as news_api
+from utils.result_cache import shared_results
+from benchmarks.fake_google import FakeGoogleService, use_fake_service
+from benchmarks.bench_result_cache import VIEW_QUERIES
+
+# Results requested per query
+RESULTS_PER_QUERY = 5
+
+def _run_sessions(sessions, use_cache):
+    """
+    Request the news view from several threads at once.
+
+    Args:
+        sessions (int): Concurrent sessions
+        use_cache (bool): Whether sessions use the shared result cache
+
+    Returns:
+        tuple: (wall time in seconds, list of result DataFrames)
+    """
+    barrier = threading.Barrier(sessions)
+    frames = []
+
+    def session():
+        barrier.wait()
+        frames.append(news_api.fetch_and_analyze_news(VIEW_QUERIES, RESULTS_PER_QUERY, with_progress=False,
+                                                      use_cache=use_cache))
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, frames
+
+def run_fake_load_benchmark(sessions=8, latency=0.05, error_rate=0.1, seed=0):
+    """
+    Run the load scenarios against fresh fake services.
+
+    Args:
+        sessions (int): Concurrent sessions
+        latency (float): Simulated latency per request in seconds
+        error_rate (float): Share of requests failing with 503 in the error scenario
+        seed (int): Random seed for the fake service
+
+    Returns:
+        DataFrame: One row per scenario with wall time, request counts and unscored headlines
+    """
+    scenarios = [
+        ("no shared cache", {}, False),
+        ("shared cache", {}, True),
+        (f"{error_rate:.0%} transient errors", {"error_rate": error_rate}, False),
+        ("Gemini quota exhausted", {"gemini_quota": 0}, False)
+    ]
+
+    rows = []
+    for scenario, options, use_cache in scenarios:
+        shared_results.clear()
+        with FakeGoogleService(latency=latency, seed=seed, **options) as service, use_fake_service(service):
+            seconds, frames = _run_sessions(sessions, use_cache)
+            stats = service.stats()
+        rows.append({
+            "scenario": scenario,
+            "seconds": round(seconds, 3),
+            "cse_requests": stats["cse"]["requests"],
+            "gemini_requests": stats["gemini"]["requests"],
+            "failed_requests": sum(counts["errors"] + counts["quota_exceeded"] for counts in stats.values()),
+            "headlines": sum(len(frame) for frame in frames),
+            "unscored": sum(int(frame["sentiment_score"].isna().sum()) for frame in frames if not frame.empty)
+        })
+    shared_results.clear()
+
+    return pd.DataFrame(rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the news pipeline against the offline Google stand-in")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(run_fake_load_benchmark(args.sessions, args.latency, args.error_rate).to_string(index=False))
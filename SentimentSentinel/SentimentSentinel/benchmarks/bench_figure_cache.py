@@ -0,0 +1,91 @@
+"""
+Measure the figure cache speedup on the News page chart set.
+
+Simulates Streamlit reruns that rebuild every News page figure from the
+same data, with the cache disabled and enabled.
+
+Usage:
+    python -m benchmarks.bench_figure_cache --rows 100000 --reruns 5
+"""
+import argparse
+import time
+import pandas as pd
+from utils.aggregation import compute_aggregates
+from utils.figure_cache import clear_figure_cache, get_figure_cache_stats, set_figure_cache_enabled
+from utils.visualization import (
+    create_sentiment_pie_chart, create_topic_sentiment_chart, create_source_count_chart,
+    create_source_comparison, create_topic_coverage_chart, create_sentiment_heatmap
+)
+from benchmarks.synthetic import make_scored_frame
+
+# Groupings behind the News page charts; per-column results come from the pair cells
+NEWS_PAGE_GROUPINGS = [('source', 'query'), ('country', 'source'), 'source', 'query', 'sentiment_category']
+
+def build_news_page_figures(news_df):
+    """
+    Build the figures rendered by the News page tabs.
+
+    Args:
+        news_df (DataFrame): Scored news data
+
+    Returns:
+        list: Plotly figures
+    """
+    aggregates = compute_aggregates(news_df, 'sentiment_score', NEWS_PAGE_GROUPINGS)
+    category_counts = aggregates[('sentiment_category',)]
+    sentiment_counts = dict(zip(category_counts['sentiment_category'], category_counts['size']))
+    return [
+        create_sentiment_pie_chart(sentiment_counts, "Sentiment Distribution"),
+        create_topic_sentiment_chart(news_df, 'query', 'sentiment_score', aggregates=aggregates),
+        create_source_count_chart(news_df, 'source', aggregates=aggregates),
+        create_source_comparison(news_df, 'source', 'sentiment_score', title="Media Outlet Sentiment Comparison",
+                                 aggregates=aggregates),
+        create_topic_coverage_chart(news_df, 'source', 'query', aggregates=aggregates),
+        create_sentiment_heatmap(news_df, 'source', 'country', 'sentiment_score', aggregates=aggregates)
+    ]
+
+def run_figure_cache_benchmark(rows=100000, reruns=5, seed=0):
+    """
+    Time News page reruns with and without the figure cache.
+
+    Args:
+        rows (int): Number of articles
+        reruns (int): Number of simulated reruns
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: Mean rerun time per mode and the cache statistics
+    """
+    news_df = make_scored_frame(rows, seed=seed)
+    results = []
+
+    for mode, enabled in [("uncached", False), ("cached", True)]:
+        set_figure_cache_enabled(enabled)
+        clear_figure_cache()
+
+        timings = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            build_news_page_figures(news_df)
+            timings.append(time.perf_counter() - start)
+
+        stats = get_figure_cache_stats()
+        results.append({
+            "mode": mode,
+            "first_rerun_s": round(timings[0], 3),
+            "later_reruns_s": round(sum(timings[1:]) / max(len(timings) - 1, 1), 4),
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "cached_kb": round(stats["bytes"] / 1024, 1)
+        })
+
+    set_figure_cache_enabled(True)
+    return pd.DataFrame(results)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Sentigrade figure cache")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--reruns", type=int, default=5)
+    args = parser.parse_args()
+
+    print(run_figure_cache_benchmark(args.rows, args.reruns).to_string(index=False))
@@ -0,0 +1,124 @@
+"""
+Startup budget check for the Streamlit entry points.
+
+Runs the top-level imports of app.py and each page in a fresh
+interpreter with -X importtime, subtracts the time spent importing
+Streamlit itself (and everything it pulls in) and compares what is left
+against a per-script budget.
+Also fails if a heavy module that should be deferred until first use
+(NLTK, the Google clients, plotly.express) is loaded at import time.
+
+Usage:
+    python -m benchmarks.bench_importtime --runs 5
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+import pandas as pd
+
+# Project root (the directory holding app.py)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import time allowed on top of `import streamlit`, per script (ms)
+STARTUP_BUDGETS_MS = {
+    "app.py": 100,
+    "pages/news_analysis.py": 700,
+    "pages/social_media_analysis.py": 700,
+    "pages/trend_analysis.py": 700
+}
+
+# Modules that must only be imported when first used
+DEFERRED_MODULES = ["nltk", "googleapiclient", "google.generativeai", "plotly.express"]
+
+# Extra modules the landing page must not load (it renders no data)
+APP_DEFERRED_MODULES = ["pandas", "pyarrow"]
+
+def top_level_imports(path):
+    """
+    Extract a script's module-level import statements.
+
+    Args:
+        path (str): Script path relative to the project root
+
+    Returns:
+        str: Source containing only the import statements
+    """
+    with open(os.path.join(ROOT, path), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+def measure_imports(source, watched=()):
+    """
+    Run import statements in a fresh interpreter under -X importtime.
+
+    Args:
+        source (str): Import statements to run
+        watched (tuple): Module names to check for in sys.modules afterwards
+
+    Returns:
+        tuple: (total import time in ms, Streamlit's cumulative import time in ms,
+            list of watched modules that were loaded)
+    """
+    probe = f"{source}\nimport sys\nprint(','.join(m for m in {list(watched)!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", probe],
+                            capture_output=True, text=True, cwd=ROOT, check=True)
+
+    total_us = streamlit_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        total_us += int(self_us)
+        if name.rstrip() == " streamlit":
+            streamlit_us = int(cumulative_us)
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    return total_us / 1000, streamlit_us / 1000, loaded
+
+def run_importtime_check(runs=5, budgets=None):
+    """
+    Measure each entry point's import cost beyond Streamlit's own.
+
+    Args:
+        runs (int): Fresh interpreters per script (the median is kept)
+        budgets (dict): Script path -> allowed ms beyond Streamlit's import
+
+    Returns:
+        DataFrame: One row per script with import time, budget and violations
+    """
+    budgets = budgets or STARTUP_BUDGETS_MS
+
+    rows = []
+    for path, budget in budgets.items():
+        source = top_level_imports(path)
+        forbidden = DEFERRED_MODULES + (APP_DEFERRED_MODULES if path == "app.py" else [])
+        samples = [measure_imports(source, forbidden) for _ in range(runs)]
+        import_ms = statistics.median(total for total, _, _ in samples)
+        own_ms = statistics.median(total - streamlit for total, streamlit, _ in samples)
+        loaded = sorted({name for _, _, names in samples for name in names})
+        rows.append({
+            "script": path,
+            "import_ms": round(import_ms, 1),
+            "above_streamlit_ms": round(own_ms, 1),
+            "budget_ms": budget,
+            "over_budget": own_ms > budget,
+            "eager_heavy_modules": ", ".join(loaded)
+        })
+
+    return pd.DataFrame(rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check Streamlit entry points against a startup budget")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run_importtime_check(args.runs)
+    print(results.to_string(index=False))
+
+    failures = results[results["over_budget"] | (results["eager_heavy_modules"] != "")]
+    if not failures.empty:
+        raise SystemExit(f"Startup budget exceeded or heavy modules imported eagerly: {', '.join(failures['script'])}")
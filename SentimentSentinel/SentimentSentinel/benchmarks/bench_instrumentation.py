@@ -0,0 +1,81 @@
+"""
+Measure the cost of instrumentation on the per-text scoring hot path.
+
+Scores the same texts with undecorated analyze_sentiment/detect_language,
+with instrumentation off and with it on, and reports the overhead per
+scored text.
+
+Usage:
+    python -m benchmarks.bench_instrumentation --texts 20000 --repeats 5
+"""
+import argparse
+import time
+import pandas as pd
+import utils.scoring as scoring
+from utils import instrumentation
+from benchmarks.bench_batch_scorer import make_text_frame
+
+def _best_time(texts, repeats):
+    """
+    Time score_batch over the texts.
+
+    Args:
+        texts (list): Texts to score
+        repeats (int): Timed repetitions (the fastest is kept)
+
+    Returns:
+        float: Fastest time in seconds
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        scoring.score_batch(texts)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run_instrumentation_benchmark(n_texts=20000, repeats=5):
+    """
+    Compare scoring time without decorators, with instrumentation off and on.
+
+    Args:
+        n_texts (int): Texts scored per repetition
+        repeats (int): Timed repetitions per mode
+
+    Returns:
+        DataFrame: One row per mode with time and overhead per text
+    """
+    texts = make_text_frame(n_texts)["text"].tolist()
+    analyze, detect = scoring.analyze_sentiment, scoring.detect_language
+    was_enabled = instrumentation.enabled()
+
+    try:
+        # Untimed warm-up, so VADER and NLTK loading isn't charged to the first mode
+        instrumentation.set_enabled(False)
+        scoring.score_batch(texts)
+
+        # Undecorated baseline
+        scoring.analyze_sentiment, scoring.detect_language = analyze.__wrapped__, detect.__wrapped__
+        instrumentation.set_enabled(False)
+        baseline = _best_time(texts, repeats)
+        scoring.analyze_sentiment, scoring.detect_language = analyze, detect
+
+        disabled = _best_time(texts, repeats)
+        instrumentation.set_enabled(True)
+        enabled = _best_time(texts, repeats)
+    finally:
+        scoring.analyze_sentiment, scoring.detect_language = analyze, detect
+        instrumentation.set_enabled(was_enabled)
+
+    return pd.DataFrame([
+        {"mode": mode, "seconds": round(seconds, 4),
+         "overhead_ns_per_text": round((seconds - baseline) / n_texts * 1e9)}
+        for mode, seconds in [("undecorated", baseline), ("disabled", disabled), ("enabled", enabled)]
+    ])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark instrumentation overhead")
+    parser.add_argument("--texts", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(run_instrumentation_benchmark(args.texts, args.repeats).to_string(index=False))
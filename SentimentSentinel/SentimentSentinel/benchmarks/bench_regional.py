@@ -0,0 +1,117 @@
+"""
+Benchmark weighted regional aggregation.
+
+Compares a per-region loop (filter rows, average per day and country,
+weight by online users; no intervals) with regional_aggregates computing
+every region at once with bootstrap intervals: cold, fully cached, and
+after one new day of posts is appended (only that day is bootstrapped).
+Fails if the weighted means disagree with the loop.
+
+Usage:
+    python -m benchmarks.bench_regional --rows 1000000 --samples 1000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from data.sea_countries import COUNTRY_ORDER, country_code_categorical, country_regions
+from utils.regional import clear_regional_cache, online_user_weights, regional_aggregates
+from benchmarks.synthetic import make_multilingual_posts
+
+def _scored_posts(rows, seed):
+    """
+    Build synthetic posts with random sentiment scores.
+
+    Args:
+        rows (int): Number of posts
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: Posts with 'country', 'date' and 'sentiment_score'
+    """
+    posts = make_multilingual_posts(rows, seed)[['country', 'date']]
+    posts['country'] = posts['country'].astype('category')
+    posts['sentiment_score'] = np.random.default_rng(seed).normal(0, 0.4, rows).clip(-1, 1)
+    return posts
+
+def loop_regional_means(df):
+    """
+    Compute daily weighted regional means one region at a time.
+
+    Args:
+        df (DataFrame): Posts with 'country', 'date' and 'sentiment_score'
+
+    Returns:
+        DataFrame: date, 'region' and 'weighted_mean'
+    """
+    weights = pd.Series(online_user_weights(), index=COUNTRY_ORDER)
+    codes = pd.Series(np.asarray(country_code_categorical(df['country'])), index=df.index)
+    days = df['date'].dt.floor('1D')
+
+    frames = []
+    for region, members in country_regions.items():
+        in_region = codes.isin(members)
+        daily = df['sentiment_score'][in_region].groupby([days[in_region], codes[in_region]]).mean()
+        daily = daily.rename_axis(['date', 'code']).reset_index()
+        daily['weight'] = daily['code'].map(weights)
+        daily['weighted'] = daily['sentiment_score'] * daily['weight']
+        summed = daily.groupby('date')[['weighted', 'weight']].sum()
+        frames.append(pd.DataFrame({
+            'date': summed.index, 'region': region, 'weighted_mean': summed['weighted'] / summed['weight']
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+def run_regional_benchmark(rows=1000000, samples=1000, seed=0):
+    """
+    Time the per-region loop against the vectorized, cached aggregation.
+
+    Args:
+        rows (int): Number of posts
+        samples (int): Bootstrap replicates per bucket
+        seed (int): Random seed
+
+    Returns:
+        tuple: (DataFrame with one row per scenario, largest absolute difference
+            between the loop's and the vectorized weighted means)
+    """
+    posts = _scored_posts(rows, seed)
+    last_day = posts['date'].max().floor('1D')
+    history = posts[posts['date'] < last_day]
+
+    results = []
+
+    start = time.perf_counter()
+    expected = loop_regional_means(posts)
+    results.append({"scenario": "per-region loop (no intervals)", "seconds": time.perf_counter() - start})
+
+    clear_regional_cache()
+    start = time.perf_counter()
+    regional_aggregates(history, samples=samples)
+    results.append({"scenario": "vectorized, cold", "seconds": time.perf_counter() - start})
+
+    start = time.perf_counter()
+    regional_aggregates(history, samples=samples)
+    results.append({"scenario": "vectorized, cached", "seconds": time.perf_counter() - start})
+
+    start = time.perf_counter()
+    regional = regional_aggregates(posts, samples=samples)
+    results.append({"scenario": "vectorized, one day appended", "seconds": time.perf_counter() - start})
+
+    merged = expected.merge(regional, on=['date', 'region'], suffixes=('_loop', ''))
+    difference = float((merged['weighted_mean_loop'] - merged['weighted_mean']).abs().max())
+
+    results = pd.DataFrame(results)
+    results['seconds'] = results['seconds'].round(4)
+    return results, difference
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark weighted regional aggregation")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--samples", type=int, default=1000)
+    args = parser.parse_args()
+
+    results, difference = run_regional_benchmark(args.rows, args.samples)
+    print(results.to_string(index=False))
+    print(f"Largest weighted-mean difference from the loop: {difference:.2e}")
+    if difference > 1e-9:
+        raise SystemExit("Vectorized regional means disagree with the per-region loop")
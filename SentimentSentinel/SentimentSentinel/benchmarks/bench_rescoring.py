@@ -0,0 +1,86 @@
+"""
+Compare a full re-score of a store with incremental re-scoring.
+
+Scores a synthetic multilingual store with the batch scorer, then
+measures: re-scoring everything from scratch, an incremental run after
+the non-English scorer version is bumped, and an incremental run after
+only the category thresholds change (which must make no model calls).
+Rollups are kept up to date in every incremental run.
+
+Usage:
+    python -m benchmarks.bench_rescoring --rows 100000 --workers 1
+"""
+import argparse
+import os
+import tempfile
+import time
+import pandas as pd
+import utils.scoring as scoring
+import utils.sentiment_analyzer as sentiment_analyzer
+from utils.batch_scorer import score_file
+from utils.rescoring import rescore_store
+from benchmarks.synthetic import make_multilingual_posts
+
+# Rollups maintained during the incremental runs
+ROLLUP_GROUPINGS = [("country",), ("country", "sentiment_category"), ("language", "sentiment_category")]
+
+# Tuned category boundary for the threshold scenario (synthetic scores cluster around 0, 0.3, 0.5 and 0.75)
+TUNED_BOUNDARY = 0.55
+
+def run_rescoring_benchmark(rows=100000, workers=1, seed=0):
+    """
+    Time a full re-score against incremental re-scoring runs.
+
+    Args:
+        rows (int): Rows in the store
+        workers (int): Scoring processes (1 so the version bump applies in this process)
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: One row per scenario with elapsed time, stale rows and texts scored
+    """
+    results = []
+    versions = dict(scoring.LOCAL_SCORER_VERSIONS)
+    boundary = sentiment_analyzer.CATEGORY_BOUNDARY
+
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, "posts.csv")
+        store_path = os.path.join(directory, "scored.csv")
+        make_multilingual_posts(rows, seed).to_csv(input_path, index=False)
+
+        start = time.perf_counter()
+        score_file(input_path, store_path, workers=workers, progress_stream=None)
+        results.append({"scenario": "full re-score", "elapsed_s": round(time.perf_counter() - start, 2),
+                        "stale": rows, "texts_scored": rows, "rows_changed": rows})
+
+        # Build the rollups once so later runs update them incrementally
+        rescore_store(store_path, workers=workers, rollup_groupings=ROLLUP_GROUPINGS, progress_stream=None)
+
+        try:
+            scoring.LOCAL_SCORER_VERSIONS["*"] += "-bench"
+            summary = rescore_store(store_path, workers=workers, rollup_groupings=ROLLUP_GROUPINGS,
+                                    progress_stream=None)
+            results.append({"scenario": "non-English version bump", **summary})
+
+            sentiment_analyzer.CATEGORY_BOUNDARY = TUNED_BOUNDARY
+            summary = rescore_store(store_path, workers=workers, rollup_groupings=ROLLUP_GROUPINGS,
+                                    progress_stream=None)
+            results.append({"scenario": "threshold change only", **summary})
+        finally:
+            scoring.LOCAL_SCORER_VERSIONS.clear()
+            scoring.LOCAL_SCORER_VERSIONS.update(versions)
+            sentiment_analyzer.CATEGORY_BOUNDARY = boundary
+
+    columns = ["scenario", "elapsed_s", "stale", "texts_scored", "rows_changed"]
+    return pd.DataFrame(results)[columns]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark incremental re-scoring")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    results = run_rescoring_benchmark(args.rows, args.workers)
+    print(results.to_string(index=False))
+    if results.iloc[-1]["texts_scored"]:
+        raise SystemExit("A threshold-only change made model calls")
@@ -0,0 +1,102 @@
+"""
+Benchmark the shared result cache with concurrent sessions.
+
+Starts several threads (one per simulated session) that request the same
+news view at once through fetch_and_analyze_news, against the stubbed
+search and Gemini services with a simulated per-query search latency.
+Compares running without the shared cache, with it (identical requests
+coalesce onto one fetch), and a repeat request served from the cache.
+Fails if the cached runs fetched more than once.
+
+Usage:
+    python -m benchmarks.bench_result_cache --sessions 10 --latency 0.05
+"""
+import argparse
+import threading
+import time
+import pandas as pd
+import utils.news_api as news_api
+from utils.result_cache import shared_results
+from benchmarks.suite import stubbed_news_services
+from benchmarks.synthetic import make_multilingual_posts
+
+# News view every simulated session asks for (topic x country queries)
+VIEW_QUERIES = [f"{topic}, {country}" for topic in ["Politics", "Economy"] for country in ["Singapore", "Malaysia"]]
+
+def _run_sessions(sessions, use_cache):
+    """
+    Request the same view from several threads at once.
+
+    Args:
+        sessions (int): Concurrent sessions
+        use_cache (bool): Whether sessions use the shared result cache
+
+    Returns:
+        float: Wall time until every session has its result, in seconds
+    """
+    barrier = threading.Barrier(sessions)
+
+    def session():
+        barrier.wait()
+        news_api.fetch_and_analyze_news(VIEW_QUERIES, 5, with_progress=False, use_cache=use_cache)
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+def run_result_cache_benchmark(sessions=10, latency=0.05, seed=0):
+    """
+    Time concurrent identical requests with and without the shared cache.
+
+    Args:
+        sessions (int): Concurrent sessions
+        latency (float): Simulated search latency per query in seconds
+        seed (int): Random seed for the stub headlines
+
+    Returns:
+        DataFrame: One row per scenario with wall time and fetch pipelines run
+    """
+    headlines = make_multilingual_posts(1000, seed)["text"].tolist()
+    fetches = []
+    results = []
+
+    with stubbed_news_services(headlines):
+        search_news, fetch_and_score = news_api.search_news, news_api._fetch_and_score
+
+        def slow_search(*args, **kwargs):
+            time.sleep(latency)
+            return search_news(*args, **kwargs)
+
+        def counted_fetch(*args, **kwargs):
+            fetches.append(1)
+            return fetch_and_score(*args, **kwargs)
+
+        news_api.search_news, news_api._fetch_and_score = slow_search, counted_fetch
+        try:
+            shared_results.clear()
+            for scenario, use_cache in [("no shared cache", False), ("shared cache, cold", True),
+                                        ("shared cache, warm", True)]:
+                fetches.clear()
+                seconds = _run_sessions(sessions, use_cache)
+                results.append({"scenario": scenario, "sessions": sessions, "seconds": round(seconds, 3),
+                                "fetches": len(fetches)})
+        finally:
+            news_api.search_news, news_api._fetch_and_score = search_news, fetch_and_score
+            shared_results.clear()
+
+    return pd.DataFrame(results)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the shared result cache")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    results = run_result_cache_benchmark(args.sessions, args.latency)
+    print(results.to_string(index=False))
+    if results.iloc[1:]["fetches"].sum() > 1:
+        raise SystemExit("Concurrent identical requests were not coalesced")
@@ -0,0 +1,145 @@
+"""
+Load-test the scoring server.
+
+Starts a server in-process on a free port, then sends small /score
+requests from concurrent client threads (each reusing its keep-alive
+connection). Reports latency percentiles, throughput and the mean number
+of texts the micro-batcher coalesced per model call, with and without
+a batching wait.
+
+The local analyzer has no fixed cost per call, so batching mostly shows
+its value with --call-overhead-ms, which simulates a model with per-call
+overhead (e.g. a GPU or remote batch model).
+
+Usage:
+    python -m benchmarks.bench_scoring_service --clients 32 --requests 200 --call-overhead-ms 5
+"""
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from utils.scoring_client import ScoringClient
+from utils.scoring import score_batch
+from utils.scoring_service import MicroBatcher, ScoringServer
+
+# Headline templates scored by the load test
+SAMPLE_TEXTS = [
+    "Markets rally as investors welcome strong growth figures",
+    "Flooding forces thousands to evacuate coastal villages",
+    "Government announces new budget for public schools",
+    "Protesters clash with police over disputed election results",
+    "Tech startup wins award for innovative clean energy design",
+    "Officials say talks ended without agreement",
+    "Tourism recovers slowly after a difficult year",
+    "Court rejects appeal in high-profile corruption case"
+]
+
+def start_server(max_wait_ms, call_overhead_ms=0):
+    """
+    Start a scoring server on a background thread.
+
+    Args:
+        max_wait_ms (float): Micro-batching wait
+        call_overhead_ms (float): Simulated fixed cost per model call
+
+    Returns:
+        tuple: (base URL, server, stop callable)
+    """
+    def score_function(texts, languages):
+        if call_overhead_ms:
+            time.sleep(call_overhead_ms / 1000)
+        return score_batch(texts, languages)
+
+    server = ScoringServer(MicroBatcher(score_function, max_wait_ms=max_wait_ms))
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    bound = {}
+
+    def on_ready(port):
+        bound["port"] = port
+        ready.set()
+
+    task_holder = {}
+
+    def run():
+        asyncio.set_event_loop(loop)
+        task_holder["task"] = loop.create_task(server.serve("127.0.0.1", 0, ready=on_ready))
+        try:
+            loop.run_until_complete(task_holder["task"])
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    ready.wait()
+
+    def stop():
+        loop.call_soon_threadsafe(task_holder["task"].cancel)
+        thread.join(timeout=5)
+
+    return f"http://127.0.0.1:{bound['port']}", server, stop
+
+def run_load_test(clients=32, requests=200, max_texts=4, max_wait_ms=2, call_overhead_ms=0, seed=0):
+    """
+    Send concurrent small requests and measure latency.
+
+    Args:
+        clients (int): Concurrent client threads
+        requests (int): Requests per client
+        max_texts (int): Largest number of texts per request
+        max_wait_ms (float): Server micro-batching wait
+        call_overhead_ms (float): Simulated fixed cost per model call
+        seed (int): Random seed
+
+    Returns:
+        dict: Latency percentiles, throughput and batching statistics
+    """
+    base_url, server, stop = start_server(max_wait_ms, call_overhead_ms)
+    client = ScoringClient(base_url)
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(1, max_texts + 1, (clients, requests))
+
+    def worker(row):
+        latencies = []
+        for size in sizes[row]:
+            texts = [SAMPLE_TEXTS[(row + i) % len(SAMPLE_TEXTS)] for i in range(size)]
+            start = time.perf_counter()
+            client.score(texts)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        latencies = np.concatenate([np.array(result) for result in pool.map(worker, range(clients))])
+    elapsed = time.perf_counter() - start
+
+    stats = client.stats()
+    stop()
+
+    return {
+        "call_overhead_ms": call_overhead_ms,
+        "max_wait_ms": max_wait_ms,
+        "p50_ms": round(np.percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(np.percentile(latencies, 99) * 1000, 2),
+        "requests_per_s": round(len(latencies) / elapsed),
+        "texts_per_s": round(int(sizes.sum()) / elapsed),
+        "mean_batch_texts": stats["mean_batch_texts"]
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the Sentigrade scoring server")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--max-texts", type=int, default=4)
+    parser.add_argument("--call-overhead-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    results = [
+        run_load_test(args.clients, args.requests, args.max_texts, max_wait_ms=wait,
+                      call_overhead_ms=args.call_overhead_ms)
+        for wait in (0, 2, 5)
+    ]
+    print(pd.DataFrame(results).to_string(index=False))
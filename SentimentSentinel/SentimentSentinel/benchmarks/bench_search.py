@@ -0,0 +1,89 @@
+"""
+Benchmark the full-text search index.
+
+Indexes synthetic articles with a Zipf-distributed vocabulary, then
+times keyword, phrase and prefix queries with and without filters.
+
+Usage:
+    python -m benchmarks.bench_search --rows 1000000 --queries 50
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from utils.search_index import SearchIndex
+from benchmarks.bench_terms import make_term_frame
+
+# Query templates per mode; {a} and {b} are vocabulary words, {prefix} a word prefix
+QUERY_TEMPLATES = {
+    "keyword": "{a} {b}",
+    "phrase": "{a} {b}",
+    "prefix": "{prefix}"
+}
+
+def run_search_benchmark(rows=200000, queries=50, seed=0):
+    """
+    Time indexing and query latency.
+
+    Args:
+        rows (int): Number of articles
+        queries (int): Queries per mode
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: One row per query mode and filter setting with median and
+            95th percentile latency in milliseconds and mean hit count
+    """
+    rng = np.random.default_rng(seed)
+    df = make_term_frame(rows, seed=seed)
+
+    index = SearchIndex()
+    start = time.perf_counter()
+    index.add_documents(df)
+    index.optimize()
+    index_seconds = time.perf_counter() - start
+
+    countries = list(df['country'].cat.categories[:3])
+    filters = {
+        "none": {},
+        "country+sentiment+date": {
+            "countries": countries,
+            "sentiment_range": (-1.0, 0.0),
+            "start_date": "2024-03-01",
+            "end_date": "2024-06-30"
+        }
+    }
+
+    results = []
+    for mode, template in QUERY_TEMPLATES.items():
+        for filter_name, filter_args in filters.items():
+            timings = []
+            hits = []
+            for _ in range(queries):
+                # Mid-frequency words give realistic posting list lengths
+                a, b = rng.integers(10, 2000, 2)
+                query = template.format(a=f"word{a}", b=f"word{b}", prefix=f"word{a}"[:6])
+
+                start = time.perf_counter()
+                found = index.search(query, mode=mode, limit=20, **filter_args)
+                timings.append(time.perf_counter() - start)
+                hits.append(len(found))
+
+            results.append({
+                "mode": mode,
+                "filters": filter_name,
+                "p50_ms": round(np.percentile(timings, 50) * 1000, 2),
+                "p95_ms": round(np.percentile(timings, 95) * 1000, 2),
+                "mean_hits": round(float(np.mean(hits)), 1)
+            })
+
+    print(f"Indexed {rows} articles in {index_seconds:.1f}s ({rows / index_seconds:.0f} docs/s)")
+    return pd.DataFrame(results)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Sentigrade search index")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    print(run_search_benchmark(args.rows, args.queries).to_string(index=False))
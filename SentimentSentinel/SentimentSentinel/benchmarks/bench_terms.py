@@ -0,0 +1,110 @@
+"""
+Benchmark top-terms counting and check that chunked counts merge exactly.
+
+Documents are synthetic headlines with a Zipf-distributed vocabulary.
+The corpus is counted once in full and once chunk by chunk (each chunk
+in its own counter, merged at the end); both must give identical counts.
+
+Usage:
+    python -m benchmarks.bench_terms --rows 200000 --chunk-size 20000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from utils.terms import TermCounter, count_terms
+from benchmarks.synthetic import make_scored_frame
+
+# Vocabulary size and Zipf exponent for synthetic text
+VOCABULARY_SIZE = 20000
+ZIPF_EXPONENT = 1.2
+WORDS_PER_DOCUMENT = 25
+
+def make_term_frame(rows, seed=0):
+    """
+    Build scored news rows whose snippets use a Zipf-distributed vocabulary.
+
+    Args:
+        rows (int): Number of rows
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: Synthetic scored data
+    """
+    rng = np.random.default_rng(seed)
+    df = make_scored_frame(rows, seed=seed)
+
+    words = np.array([f"word{i}" for i in range(VOCABULARY_SIZE)])
+    ranks = np.minimum(rng.zipf(ZIPF_EXPONENT, (rows, WORDS_PER_DOCUMENT)), VOCABULARY_SIZE) - 1
+    df["snippet"] = [" ".join(row) for row in words[ranks]]
+    return df
+
+def _same_counts(expected, actual):
+    """
+    Check that two counters hold identical statistics.
+
+    Args:
+        expected (TermCounter): Reference counter
+        actual (TermCounter): Counter to compare
+
+    Returns:
+        bool: True if vocabularies and all counts agree
+    """
+    if set(expected.terms) != set(actual.terms) or expected.n_documents != actual.n_documents:
+        return False
+    ids = np.array([actual.vocabulary[term] for term in expected.terms], dtype=np.int64)
+    return (
+        np.array_equal(expected.total_counts, actual.total_counts[ids])
+        and np.array_equal(expected.category_counts, actual.category_counts[:, ids])
+        and np.array_equal(expected.document_frequency, actual.document_frequency[ids])
+    )
+
+def run_terms_benchmark(rows=200000, chunk_size=20000, seed=0):
+    """
+    Time full and chunked term counting plus ranking.
+
+    Args:
+        rows (int): Number of documents
+        chunk_size (int): Documents per chunk
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: One row per mode with throughput, timings and the merge check
+    """
+    df = make_term_frame(rows, seed=seed)
+    text_columns = ['title', 'snippet']
+
+    start = time.perf_counter()
+    full = count_terms(df, text_columns)
+    full_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    merged = TermCounter()
+    for offset in range(0, rows, chunk_size):
+        merged.merge(count_terms(df.iloc[offset:offset + chunk_size], text_columns))
+    chunked_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    full.top_terms(20, weighting='tfidf')
+    full.associated_terms('negative', 20)
+    rank_seconds = time.perf_counter() - start
+
+    return pd.DataFrame([
+        {"mode": "full", "docs_per_s": round(rows / full_seconds), "count_s": round(full_seconds, 3),
+         "rank_ms": round(rank_seconds * 1000, 2), "terms": len(full.terms), "merge_matches": True},
+        {"mode": f"chunks of {chunk_size}", "docs_per_s": round(rows / chunked_seconds),
+         "count_s": round(chunked_seconds, 3), "rank_ms": None, "terms": len(merged.terms),
+         "merge_matches": _same_counts(full, merged)}
+    ])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Sentigrade top-terms counting")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--chunk-size", type=int, default=20000)
+    args = parser.parse_args()
+
+    results = run_terms_benchmark(args.rows, args.chunk_size)
+    print(results.to_string(index=False))
+
+    if not results["merge_matches"].all():
+        raise SystemExit("Merged term counts differ from a full count")
@@ -0,0 +1,82 @@
+"""
+Compare Plotly payload size and build time for raw vs downsampled timelines.
+
+Usage:
+    python -m benchmarks.bench_timeline --rows 500000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from utils.visualization import create_sentiment_timeline, create_trend_chart
+from benchmarks.synthetic import make_scored_frame
+
+def _measure(build):
+    """
+    Build a figure and serialize it as Streamlit would.
+
+    Args:
+        build (callable): Function returning a Plotly figure
+
+    Returns:
+        dict: Build time, serialization time and payload bytes
+    """
+    start = time.perf_counter()
+    fig = build()
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    payload = fig.to_json()
+    serialize_seconds = time.perf_counter() - start
+
+    return {
+        "build_s": round(build_seconds, 3),
+        "serialize_s": round(serialize_seconds, 3),
+        "payload_mb": round(len(payload) / 1e6, 2),
+        "traces": sum(1 for trace in fig.data if trace.type in ("scatter", "scattergl")),
+        "trace_type": fig.data[-1].type
+    }
+
+def run_timeline_benchmark(rows=200000, max_points=2000, seed=0):
+    """
+    Benchmark timeline charts with and without downsampling.
+
+    Args:
+        rows (int): Number of posts
+        max_points (int): Target points per series when downsampling
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: One row per chart and mode
+    """
+    df = make_scored_frame(rows, seed=seed)
+
+    # Spread posts across the day so rows have distinct timestamps
+    seconds = np.random.default_rng(seed).integers(0, 86400, len(df))
+    df['date'] = df['date'] + pd.to_timedelta(seconds, unit='s')
+    df = df.sort_values('date')
+    countries = list(df['country'].cat.categories)
+
+    modes = [("raw", None, 'lttb')] + [(method, max_points, method) for method in ("lttb", "minmax", "bucket")]
+    results = []
+
+    for mode, points, method in modes:
+        result = _measure(lambda: create_sentiment_timeline(
+            df.copy(), 'date', 'sentiment_score', max_points=points, downsample_method=method
+        ))
+        results.append({"chart": "timeline", "mode": mode, **result})
+
+        result = _measure(lambda: create_trend_chart(
+            df.copy(), 'date', 'country', 'sentiment_score', countries, max_points=points, downsample_method=method
+        ))
+        results.append({"chart": "trend", "mode": mode, **result})
+
+    return pd.DataFrame(results)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Sentigrade timeline rendering")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--max-points", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(run_timeline_benchmark(args.rows, args.max_points).to_string(index=False))
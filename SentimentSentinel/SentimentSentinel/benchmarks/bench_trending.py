@@ -0,0 +1,125 @@
+"""
+Benchmark the streaming trending-tag tracker.
+
+Generates posts whose hashtags follow a Zipf distribution over a given
+number of distinct tags, with one injected burst. Reports throughput,
+recall of the exact top tags, whether the burst was flagged, and the
+tracker's retained memory, which must not grow with the number of
+distinct tags.
+
+Usage:
+    python -m benchmarks.bench_trending --rows 500000
+"""
+import argparse
+import time
+import tracemalloc
+from collections import Counter
+import numpy as np
+import pandas as pd
+from utils.trending import TrendingTracker
+from data.sea_countries import sea_countries
+
+# Distinct-tag counts compared for memory growth
+DISTINCT_TAG_LEVELS = [1000, 100000, 1000000]
+
+# Retained memory may grow by at most this factor across distinct-tag levels
+MAX_MEMORY_GROWTH = 1.5
+
+BURST_TAG = "#breakingburst"
+
+def make_tagged_posts(rows, distinct_tags, seed=0):
+    """
+    Build posts with Zipf-distributed hashtags and mentions plus a burst on the last day.
+
+    Args:
+        rows (int): Number of posts
+        distinct_tags (int): Number of distinct hashtags
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: 'text', 'date' and 'country' columns
+    """
+    rng = np.random.default_rng(seed)
+    tags = np.minimum(rng.zipf(1.2, rows), distinct_tags)
+    users = rng.integers(0, 1000, rows)
+    dates = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 14 * 24 * 3600, rows), unit="s")
+
+    texts = [f"post about #tag{tag} with @user{user}" for tag, user in zip(tags, users)]
+    burst_rows = max(rows // 500, 20)
+    texts += [f"{BURST_TAG} happening now"] * burst_rows
+    dates = dates.append(pd.DatetimeIndex([pd.Timestamp("2024-01-14 18:00")] * burst_rows))
+
+    return pd.DataFrame({
+        "text": texts,
+        "date": dates,
+        "country": rng.choice(list(sea_countries.keys()), len(texts))
+    })
+
+def _retained_bytes(df):
+    """
+    Measure memory retained by a tracker after counting a frame.
+
+    Args:
+        df (DataFrame): Posts
+
+    Returns:
+        int: Retained bytes
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tracker = TrendingTracker(bucket="1D")
+    tracker.update_frame(df)
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return retained
+
+def run_trending_benchmark(rows=500000, seed=0):
+    """
+    Measure throughput, accuracy and memory of the trending tracker.
+
+    Args:
+        rows (int): Number of posts per level
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: One row per distinct-tag level
+    """
+    results = []
+    for distinct_tags in DISTINCT_TAG_LEVELS:
+        df = make_tagged_posts(rows, distinct_tags, seed=seed)
+
+        start = time.perf_counter()
+        tracker = TrendingTracker(bucket="1D")
+        tracker.update_frame(df)
+        seconds = time.perf_counter() - start
+        retained = _retained_bytes(df)
+
+        # Exact top hashtags over the tracker's long window
+        window_start = df['date'].max().floor("1D") - (tracker.long_buckets - 1) * pd.Timedelta(days=1)
+        recent = df.loc[df['date'] >= window_start, 'text']
+        exact = Counter(word for text in recent for word in text.split() if word.startswith('#'))
+        exact_top = {tag for tag, _ in exact.most_common(10)}
+        tracked_top = set(tracker.top_tags(k=10, kind='#')['tag'])
+
+        results.append({
+            "distinct_tags": distinct_tags,
+            "posts_per_s": round(len(df) / seconds),
+            "top10_recall": len(exact_top & tracked_top) / len(exact_top),
+            "burst_flagged": BURST_TAG in set(tracker.bursts()['tag']),
+            "retained_kb": round(retained / 1024)
+        })
+
+    results = pd.DataFrame(results)
+    results["memory_bounded"] = results["retained_kb"] <= MAX_MEMORY_GROWTH * results["retained_kb"].iloc[0]
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Sentigrade trending-tag detection")
+    parser.add_argument("--rows", type=int, default=500000)
+    args = parser.parse_args()
+
+    results = run_trending_benchmark(args.rows)
+    print(results.to_string(index=False))
+
+    if not (results["memory_bounded"].all() and results["burst_flagged"].all()):
+        raise SystemExit("Trending benchmark failed")
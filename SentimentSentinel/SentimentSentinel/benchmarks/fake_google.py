@@ -0,0 +1,422 @@
+"""
+Offline stand-in for Google Custom Search and the Gemini API.
+
+Serves deterministic Custom Search JSON from a fixture corpus of
+headlines, and Gemini generateContent responses scored by the local
+analyzer, over plain HTTP. Latency, error rate and per-API quotas are
+configurable, so the fetch pipeline can be load-tested without keys or
+network. The real clients are pointed at it through the
+GOOGLE_CSE_ENDPOINT and GEMINI_ENDPOINT environment variables (see
+utils.news_api); running this module prints the environment to export.
+
+Usage:
+    python -m benchmarks.fake_google --port 8775 --latency 0.05 --error-rate 0.02 --cse-quota 100
+    python -m benchmarks.fake_google --corpus fixtures.jsonl
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+from utils.news_api import CSE_ENDPOINT_ENV, GEMINI_ENDPOINT_ENV
+from utils.sentiment_analyzer import analyze_sentiment
+from benchmarks.synthetic import make_multilingual_posts
+
+# Headlines in the generated fixture corpus
+FIXTURE_SIZE = 5000
+
+# Topics the pages search for; every fixture headline names one topic and one country
+FIXTURE_TOPICS = ["Politics", "Economy", "Environment", "Health", "Technology", "Culture"]
+
+# Outlets used as the fixture results' display links
+FIXTURE_OUTLETS = [
+    "www.straitstimes.example", "www.thestar.example", "www.jakartapost.example",
+    "www.bangkokpost.example", "www.vnexpress.example", "www.inquirer.example"
+]
+
+# Results per Custom Search page (the real API's maximum)
+CSE_MAX_NUM = 10
+
+# Placeholder credentials exported alongside the endpoints
+FAKE_API_KEY = "fake-api-key"
+FAKE_CSE_ID = "fake-cse-id"
+
+# Command-line default port, clear of the scoring service's 8765 so both can run
+DEFAULT_PORT = 8775
+
+# Gemini generateContent path, e.g. /v1beta/models/gemini-1.5-flash:generateContent
+_GENERATE_PATH = re.compile(r"^/v1(?:beta)?/models/(?P<model>[^/:]+):generateContent$")
+
+def make_fixture_corpus(size=FIXTURE_SIZE, seed=0):
+    """
+    Generate a deterministic corpus of Custom Search result items.
+
+    Args:
+        size (int): Number of headlines
+        seed (int): Random seed
+
+    Returns:
+        list: Result items with 'title', 'link', 'snippet', 'displayLink' and 'publishedTime'
+    """
+    posts = make_multilingual_posts(size, seed)
+    rng = np.random.default_rng(seed)
+    topics = rng.choice(FIXTURE_TOPICS, size)
+    outlets = rng.choice(FIXTURE_OUTLETS, size)
+
+    return [
+        {
+            "title": f"{country} {topic}: {text[:80]}",
+            "link": f"https://{outlet}/news/{i}",
+            "snippet": text,
+            "displayLink": outlet,
+            "publishedTime": date.isoformat()
+        }
+        for i, (text, country, date, topic, outlet) in enumerate(zip(
+            posts["text"], posts["country"], posts["date"], topics, outlets
+        ))
+    ]
+
+def load_corpus(path):
+    """
+    Load result items from a JSON Lines fixture file.
+
+    Args:
+        path (str): File with one Custom Search result item per line
+
+    Returns:
+        list: Result items
+    """
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def _error_body(code, status, message, reason=None):
+    """
+    Build a Google API error response body.
+
+    Args:
+        code (int): HTTP status code
+        status (str): Google status name, e.g. 'UNAVAILABLE'
+        message (str): Error message
+        reason (str): Custom Search error reason, e.g. 'rateLimitExceeded'
+
+    Returns:
+        dict: Error body
+    """
+    error = {"code": code, "message": message, "status": status}
+    if reason:
+        error["errors"] = [{"message": message, "domain": "usageLimits", "reason": reason}]
+    return {"error": error}
+
+class FakeGoogleService:
+    """
+    Local HTTP server answering like Custom Search and Gemini.
+    Search results match every keyword of the query against the corpus
+    titles, in corpus order; Gemini scores are the local analyzer's score
+    for the prompt's headline, scaled to -10..10. Injected errors and quota
+    rejections come from a seeded random generator and per-API counters.
+    """
+
+    def __init__(self, corpus=None, latency=0.0, jitter=0.0, error_rate=0.0, cse_quota=None, gemini_quota=None,
+                 seed=0, host="127.0.0.1", port=0):
+        """
+        Args:
+            corpus (list): Result items (None for make_fixture_corpus())
+            latency (float): Seconds added to every response
+            jitter (float): Extra random delay of up to this many seconds
+            error_rate (float): Share of requests answered with 503 Unavailable
+            cse_quota (int): Search requests served before 429 responses (None for no limit)
+            gemini_quota (int): Gemini requests served before 429 responses (None for no limit)
+            seed (int): Random seed for jitter and injected errors
+            host (str): Interface to listen on
+            port (int): Port to listen on (0 picks a free port)
+        """
+        self.corpus = make_fixture_corpus() if corpus is None else corpus
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.quotas = {"cse": cse_quota, "gemini": gemini_quota}
+        self.host = host
+        self.port = port
+        self._titles = [item["title"].casefold() for item in self.corpus]
+        self._matches = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._server = None
+        self._thread = None
+        self.reset()
+
+    @property
+    def url(self):
+        """
+        str: Base URL of the running server
+        """
+        return f"http://{self.host}:{self.port}"
+
+    def environment(self):
+        """
+        Get the environment variables that point the clients at this server.
+
+        Returns:
+            dict: Variable name -> value
+        """
+        return {
+            "GOOGLE_API_KEY": FAKE_API_KEY,
+            "GOOGLE_CSE_ID": FAKE_CSE_ID,
+            "GEMINI_API_KEY": FAKE_API_KEY,
+            CSE_ENDPOINT_ENV: self.url + "/",
+            GEMINI_ENDPOINT_ENV: self.url
+        }
+
+    def start(self):
+        """
+        Start serving on a background thread.
+
+        Returns:
+            FakeGoogleService: This service
+        """
+        self._server = ThreadingHTTPServer((self.host, self.port), _FakeGoogleHandler)
+        self._server.daemon_threads = True
+        self._server.service = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop the server.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reset(self):
+        """
+        Reset request counters and used quota.
+        """
+        with self._lock:
+            self._counts = {
+                api: {"requests": 0, "served": 0, "errors": 0, "quota_exceeded": 0} for api in ("cse", "gemini")
+            }
+
+    def stats(self):
+        """
+        Get request counters.
+
+        Returns:
+            dict: Per API ('cse', 'gemini'): requests, served, injected errors and quota rejections
+        """
+        with self._lock:
+            return {api: dict(counts) for api, counts in self._counts.items()}
+
+    def _admit(self, api):
+        """
+        Count a request, wait out the latency and decide whether it fails.
+
+        Args:
+            api (str): 'cse' or 'gemini'
+
+        Returns:
+            str: None to serve the request, 'error' or 'quota_exceeded'
+        """
+        with self._lock:
+            counts = self._counts[api]
+            counts["requests"] += 1
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            quota = self.quotas[api]
+            if quota is not None and counts["served"] + counts["errors"] >= quota:
+                outcome = "quota_exceeded"
+            elif self.error_rate and self._rng.random() < self.error_rate:
+                outcome = "errors"
+            else:
+                outcome = "served"
+            counts[outcome] += 1
+
+        if delay:
+            time.sleep(delay)
+        return None if outcome == "served" else outcome
+
+    def _matching(self, query):
+        """
+        Find the corpus positions whose titles contain every query keyword.
+
+        Args:
+            query (str): Custom Search query, e.g. '"Politics AND Singapore" site:news'
+
+        Returns:
+            list: Matching positions in corpus order
+        """
+        with self._lock:
+            if query in self._matches:
+                return self._matches[query]
+
+        # Quoted phrases joined by AND, ignoring operators such as site:
+        phrases = re.findall(r'"([^"]*)"', query) or [re.sub(r"\S+:\S+", "", query)]
+        keywords = [k.strip().casefold() for phrase in phrases for k in phrase.split(" AND ") if k.strip()]
+        matches = [i for i, title in enumerate(self._titles) if all(k in title for k in keywords)]
+
+        with self._lock:
+            self._matches[query] = matches
+        return matches
+
+    def search(self, params):
+        """
+        Answer a Custom Search list request.
+
+        Args:
+            params (dict): Query parameters ('q', 'cx', 'key', 'num', 'start')
+
+        Returns:
+            tuple: (HTTP status, response body)
+        """
+        if not params.get("key") or not params.get("cx"):
+            return 400, _error_body(400, "INVALID_ARGUMENT", "Missing API key or search engine ID.", "badRequest")
+
+        failure = self._admit("cse")
+        if failure == "quota_exceeded":
+            return 429, _error_body(429, "RESOURCE_EXHAUSTED", "Quota exceeded for quota metric 'Queries'.",
+                                    "rateLimitExceeded")
+        if failure:
+            return 503, _error_body(503, "UNAVAILABLE", "The service is currently unavailable.", "backendError")
+
+        num = min(int(params.get("num", CSE_MAX_NUM)), CSE_MAX_NUM)
+        start = max(int(params.get("start", 1)), 1)
+        matches = self._matching(params.get("q", ""))
+
+        body = {
+            "kind": "customsearch#search",
+            "searchInformation": {"totalResults": str(len(matches))}
+        }
+        page = matches[start - 1:start - 1 + num]
+        if page:
+            body["items"] = [dict(self.corpus[i], kind="customsearch#result") for i in page]
+        return 200, body
+
+    def generate(self, request):
+        """
+        Answer a Gemini generateContent request with a JSON score.
+
+        Args:
+            request (dict): Request body with 'contents'
+
+        Returns:
+            tuple: (HTTP status, response body)
+        """
+        failure = self._admit("gemini")
+        if failure == "quota_exceeded":
+            return 429, _error_body(429, "RESOURCE_EXHAUSTED", "Resource has been exhausted (e.g. check quota).")
+        if failure:
+            return 503, _error_body(503, "UNAVAILABLE", "The model is overloaded. Please try again later.")
+
+        prompt = " ".join(
+            part.get("text", "") for content in request.get("contents", []) for part in content.get("parts", [])
+        )
+        headline = prompt.rsplit("Headline:", 1)[-1].strip()
+        score = round(analyze_sentiment(headline) * 10, 1)
+
+        return 200, {
+            "candidates": [{
+                "content": {"parts": [{"text": json.dumps({"score": score})}], "role": "model"},
+                "finishReason": "STOP",
+                "index": 0
+            }],
+            "usageMetadata": {"promptTokenCount": len(prompt.split()), "candidatesTokenCount": 4}
+        }
+
+class _FakeGoogleHandler(BaseHTTPRequestHandler):
+    """
+    Routes HTTP requests to the FakeGoogleService attached to the server.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/customsearch/v1":
+            self._send(404, _error_body(404, "NOT_FOUND", f"Unknown path {url.path}"))
+            return
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        self._send(*self.server.service.search(params))
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b"{}"
+        if not _GENERATE_PATH.match(url.path):
+            self._send(404, _error_body(404, "NOT_FOUND", f"Unknown path {url.path}"))
+            return
+        self._send(*self.server.service.generate(json.loads(body or b"{}")))
+
+    def log_message(self, format, *args):
+        # Keep load tests quiet
+        pass
+
+@contextlib.contextmanager
+def use_fake_service(service):
+    """
+    Point the news clients at a running fake service for the duration of a block.
+
+    Args:
+        service (FakeGoogleService): Started service
+    """
+    environment = service.environment()
+    originals = {name: os.environ.get(name) for name in environment}
+    os.environ.update(environment)
+    try:
+        yield service
+    finally:
+        for name, value in originals.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve fake Custom Search and Gemini APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--corpus", help="JSON Lines file of Custom Search result items")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--cse-quota", type=int)
+    parser.add_argument("--gemini-quota", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    service = FakeGoogleService(
+        corpus=load_corpus(args.corpus) if args.corpus else None, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, cse_quota=args.cse_quota, gemini_quota=args.gemini_quota,
+        seed=args.seed, host=args.host, port=args.port
+    )
+    with service:
+        print(f"Serving {len(service.corpus)} fixture results at {service.url}")
+        for name, value in service.environment().items():
+            print(f"export {name}={value}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+        print(json.dumps(service.stats()))
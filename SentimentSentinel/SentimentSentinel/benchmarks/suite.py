@@ -0,0 +1,485 @@
+"""
+Reproducible benchmark suite for the Sentigrade pipeline.
+
+Times text cleaning, language detection, sentiment scoring and
+categorization, process_sentiment_data, the page aggregations, every
+visualization factory, a cached rerun of the News page charts and the
+news fetch pipeline (against stubbed
+search and Gemini services) on synthetic multilingual corpora. Results
+are written as JSON; compare flags cases that got slower than a
+threshold, by at least a millisecond and by more than the run-to-run
+noise of either run.
+
+Usage:
+    python -m benchmarks.suite run --sizes 1k 100k --output baseline.json
+    python -m benchmarks.suite run --sizes 1m --cases sentiment --repeats 1 --output big.json
+    python -m benchmarks.suite compare baseline.json candidate.json --threshold 0.1
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import numpy as np
+import pandas as pd
+import utils.news_api as news_api
+from utils.sentiment_analyzer import (
+    analyze_sentiment, categorize_sentiment, categorize_sentiment_array, clean_text, get_sentiment_color,
+    get_sentiment_color_array
+)
+from utils.language_detector import detect_language
+from utils.data_processor import process_sentiment_data, generate_forecast_data
+from utils.aggregation import compute_aggregates
+from utils.volatility import compute_volatility
+from utils.figure_cache import figure_cache_enabled, set_figure_cache_enabled
+from utils.terms import count_terms
+from utils import visualization
+from utils import instrumentation
+from data.sea_countries import filter_by_region
+from benchmarks.synthetic import CORPUS_SIZES, make_multilingual_posts, make_scored_frame
+from benchmarks.bench_figure_cache import NEWS_PAGE_GROUPINGS, build_news_page_figures
+
+# Default corpus sizes and timed repetitions per case
+DEFAULT_SIZES = ["1k", "100k"]
+DEFAULT_REPEATS = 5
+
+# Relative slowdown flagged as a regression by compare
+REGRESSION_THRESHOLD = 0.1
+
+# Smallest change in the median (ms) that compare reports; shorter ones are timer noise
+REGRESSION_MIN_DELTA_MS = 1.0
+
+# Change in the median must also exceed this many combined MADs (median absolute deviations)
+REGRESSION_NOISE_MADS = 3.0
+
+# Largest article count used for the stubbed fetch pipeline
+FETCH_MAX_ARTICLES = 1000
+
+# Search results returned per stubbed query
+STUB_RESULTS_PER_QUERY = 10
+
+# Registered cases: name -> (setup(size, seed) returning a zero-argument callable, max size, figure cache)
+CASES = {}
+
+def benchmark_case(name, max_size=None, figure_cache=False):
+    """
+    Register a benchmark case.
+
+    Args:
+        name (str): Case name, e.g. 'sentiment.analyze_sentiment'
+        max_size (int): Largest corpus size the case runs at (None for no limit)
+        figure_cache (bool): Run with the figure cache on, so the warm-up call
+            fills it and the timed calls measure cached reruns
+
+    Returns:
+        callable: Decorator for a setup function taking (size, seed) and
+            returning the zero-argument callable to time
+    """
+    def decorator(setup):
+        CASES[name] = (setup, max_size, figure_cache)
+        return setup
+    return decorator
+
+_corpora = {}
+
+def _posts(size, seed):
+    """
+    Get a cached multilingual corpus.
+
+    Args:
+        size (int): Number of posts
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: Unscored posts
+    """
+    key = ("posts", size, seed)
+    if key not in _corpora:
+        _corpora.clear()
+        _corpora[key] = make_multilingual_posts(size, seed)
+    return _corpora[key]
+
+@benchmark_case("text.clean_text")
+def _setup_clean_text(size, seed):
+    texts = _posts(size, seed)["text"].tolist()
+    return lambda: [clean_text(text) for text in texts]
+
+@benchmark_case("language.detect_language")
+def _setup_detect_language(size, seed):
+    texts = _posts(size, seed)["text"].tolist()
+    return lambda: [detect_language(text) for text in texts]
+
+@benchmark_case("sentiment.analyze_sentiment")
+def _setup_analyze_sentiment(size, seed):
+    posts = _posts(size, seed)
+    pairs = list(zip(posts["text"].tolist(), posts["language"].tolist()))
+    return lambda: [analyze_sentiment(text, language) for text, language in pairs]
+
+@benchmark_case("sentiment.categorize_sentiment")
+def _setup_categorize_sentiment(size, seed):
+    scores = np.random.default_rng(seed).uniform(-1, 1, size).tolist()
+    return lambda: [categorize_sentiment(score) for score in scores]
+
+@benchmark_case("sentiment.categorize_sentiment_array")
+def _setup_categorize_sentiment_array(size, seed):
+    scores = pd.Series(np.random.default_rng(seed).uniform(-1, 1, size))
+    return lambda: categorize_sentiment_array(scores)
+
+@benchmark_case("sentiment.get_sentiment_color")
+def _setup_sentiment_color(size, seed):
+    scores = np.random.default_rng(seed).uniform(-1, 1, size).tolist()
+    return lambda: [get_sentiment_color(score) for score in scores]
+
+@benchmark_case("sentiment.get_sentiment_color_array")
+def _setup_sentiment_color_array(size, seed):
+    scores = pd.Series(np.random.default_rng(seed).uniform(-1, 1, size))
+    return lambda: get_sentiment_color_array(scores)
+
+@benchmark_case("data.process_sentiment_data")
+def _setup_process_sentiment_data(size, seed):
+    posts = _posts(size, seed)
+    return lambda: process_sentiment_data(posts.copy())
+
+@benchmark_case("aggregation.news_page")
+def _setup_news_aggregation(size, seed):
+    news = make_scored_frame(size, seed=seed)
+    return lambda: compute_aggregates(news, "sentiment_score", NEWS_PAGE_GROUPINGS)
+
+@benchmark_case("countries.filter_by_region")
+def _setup_region_filter(size, seed):
+    news = make_scored_frame(size, seed=seed)
+    return lambda: filter_by_region(news, ["Mekong Region", "Maritime Southeast Asia"])
+
+@benchmark_case("terms.count_terms")
+def _setup_count_terms(size, seed):
+    posts = _posts(size, seed)
+    return lambda: count_terms(posts, text_columns=["text"])
+
+def _chart_inputs(size, seed):
+    """
+    Build the inputs every visualization factory needs.
+
+    Args:
+        size (int): Number of scored rows
+        seed (int): Random seed
+
+    Returns:
+        dict: Scored news, aggregates, daily history, forecast and volatility frames
+    """
+    news = make_scored_frame(size, seed=seed)
+    aggregates = compute_aggregates(news, "sentiment_score", NEWS_PAGE_GROUPINGS)
+    categories = aggregates[("sentiment_category",)]
+    history = news.groupby(news["date"].dt.normalize())["sentiment_score"].mean().reset_index()
+    return {
+        "news": news,
+        "aggregates": aggregates,
+        "category_counts": dict(zip(categories["sentiment_category"], categories["size"])),
+        "terms": {f"term{i}": float(size - i) for i in range(30)},
+        "history": history,
+        "forecast": generate_forecast_data(news, days=14, group_columns=[]),
+        "volatility": compute_volatility(news),
+        "countries": sorted(news["country"].unique().tolist())
+    }
+
+# Visualization factories and how each is called with the chart inputs
+CHART_CALLS = {
+    "create_sentiment_pie_chart": lambda i: visualization.create_sentiment_pie_chart(i["category_counts"]),
+    "create_sentiment_timeline": lambda i: visualization.create_sentiment_timeline(i["news"], "date", "sentiment_score"),
+    "create_word_cloud": lambda i: visualization.create_word_cloud(i["terms"]),
+    "create_sentiment_heatmap": lambda i: visualization.create_sentiment_heatmap(
+        i["news"], "country", "source", "sentiment_score", aggregates=i["aggregates"]),
+    "create_source_comparison": lambda i: visualization.create_source_comparison(
+        i["news"], "source", "sentiment_score", aggregates=i["aggregates"]),
+    "create_topic_sentiment_chart": lambda i: visualization.create_topic_sentiment_chart(
+        i["news"], "query", "sentiment_score", aggregates=i["aggregates"]),
+    "create_source_count_chart": lambda i: visualization.create_source_count_chart(
+        i["news"], "source", aggregates=i["aggregates"]),
+    "create_topic_coverage_chart": lambda i: visualization.create_topic_coverage_chart(
+        i["news"], "source", "query", aggregates=i["aggregates"]),
+    "create_trend_chart": lambda i: visualization.create_trend_chart(
+        i["volatility"], "date", "country", "sentiment_score", i["countries"]),
+    "create_forecast_chart": lambda i: visualization.create_forecast_chart(
+        i["history"], i["forecast"], "date", "sentiment_score")
+}
+
+def _register_chart_case(factory_name, call):
+    @benchmark_case(f"chart.{factory_name}")
+    def setup(size, seed):
+        inputs = _chart_inputs(size, seed)
+        return lambda: call(inputs)
+
+for _factory_name, _call in CHART_CALLS.items():
+    _register_chart_case(_factory_name, _call)
+
+@benchmark_case("chart.news_page_cached", figure_cache=True)
+def _setup_news_page_cached(size, seed):
+    news = make_scored_frame(size, seed=seed)
+    return lambda: build_news_page_figures(news)
+
+class _StubSearchService:
+    """
+    Stand-in for the Custom Search client returning canned news items.
+    """
+
+    def __init__(self, headlines):
+        self.headlines = headlines
+        self._calls = 0
+
+    def cse(self):
+        return self
+
+    def list(self, q, cx, num):
+        # Reuse the query words in titles so search_news's keyword filter keeps them
+        keyword = q.strip('"').split(" AND ")[0].split('"')[0]
+        start = self._calls * num
+        self._calls += 1
+        items = [
+            {
+                "title": f"{keyword}: {self.headlines[(start + i) % len(self.headlines)]}",
+                "link": f"https://example.com/{start + i}",
+                "snippet": self.headlines[(start + i + 1) % len(self.headlines)],
+                "displayLink": "www.example.com"
+            }
+            for i in range(num)
+        ]
+        return _StubRequest({"items": items})
+
+class _StubRequest:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return self.result
+
+class _StubGeminiModel:
+    """
+    Stand-in for a Gemini model that answers with a JSON score.
+    """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def generate_content(self, prompt, request_options=None):
+        score = (len(prompt) % 21) - 10
+        return type("Response", (), {"text": json.dumps({"score": score})})()
+
+@contextlib.contextmanager
+def stubbed_news_services(headlines):
+    """
+    Replace the search client, Gemini and API key lookup in utils.news_api.
+
+    Args:
+        headlines (list): Headlines returned by the stub search service
+    """
+    originals = (news_api._build_search_service, news_api._create_gemini_model, news_api.setup_api_keys)
+    service = _StubSearchService(headlines)
+    news_api._build_search_service = lambda api_key: service
+    news_api._create_gemini_model = _StubGeminiModel
+    news_api.setup_api_keys = lambda: ("stub-key", "stub-cse", "stub-gemini", True)
+    try:
+        yield
+    finally:
+        news_api._build_search_service, news_api._create_gemini_model, news_api.setup_api_keys = originals
+
+@benchmark_case("pipeline.fetch_and_analyze_news", max_size=FETCH_MAX_ARTICLES)
+def _setup_fetch_pipeline(size, seed):
+    posts = _posts(size, seed)
+    headlines = posts["text"].tolist()
+    queries = [f"Economy, {country}" for country in posts["country"].iloc[:max(1, size // STUB_RESULTS_PER_QUERY)]]
+
+    def run():
+        with stubbed_news_services(headlines):
+            return news_api.fetch_and_analyze_news(queries, STUB_RESULTS_PER_QUERY, with_progress=False,
+                                                  use_cache=False)
+    return run
+
+def parse_size(size):
+    """
+    Parse a corpus size name ('1k', '100k', '1m') or row count.
+
+    Args:
+        size (str): Size name or integer string
+
+    Returns:
+        int: Number of rows
+    """
+    return CORPUS_SIZES.get(str(size).lower()) or int(size)
+
+def _environment():
+    """
+    Describe the machine and code version the results came from.
+
+    Returns:
+        dict: Interpreter, library versions, platform, CPU count, git commit and time
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+    }
+
+def run_suite(sizes=DEFAULT_SIZES, repeats=DEFAULT_REPEATS, cases=None, seed=0, progress_stream=sys.stderr):
+    """
+    Run the registered cases at each corpus size.
+    The figure cache (except for cases registered with figure_cache) and
+    instrumentation are switched off so every repetition does the full
+    work; both settings are restored afterwards.
+
+    Args:
+        sizes (list): Corpus sizes (names such as '1k' or row counts)
+        repeats (int): Timed repetitions per case (after one warm-up call)
+        cases (list): Substrings selecting cases to run (None runs all)
+        seed (int): Random seed for the corpora
+        progress_stream (file): Where to print progress (None disables it)
+
+    Returns:
+        dict: 'environment' and 'results' (one entry per case and size)
+    """
+    selected = [name for name in CASES if not cases or any(pattern in name for pattern in cases)]
+    was_enabled = instrumentation.enabled()
+    was_cached = figure_cache_enabled()
+    instrumentation.set_enabled(False)
+
+    results = []
+    try:
+        for size in [parse_size(size) for size in sizes]:
+            for name in selected:
+                setup, max_size, figure_cache = CASES[name]
+                if max_size is not None and size > max_size:
+                    continue
+
+                set_figure_cache_enabled(figure_cache)
+                run = setup(size, seed)
+                run()
+                timings = []
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    run()
+                    timings.append(time.perf_counter() - start)
+
+                median = statistics.median(timings)
+                results.append({
+                    "case": name,
+                    "size": size,
+                    "repeats": repeats,
+                    "min_s": round(min(timings), 6),
+                    "median_s": round(median, 6),
+                    "mad_s": round(statistics.median(abs(t - median) for t in timings), 6),
+                    "docs_per_s": round(size / median, 1) if median > 0 else None
+                })
+                if progress_stream is not None:
+                    print(f"{name} [{size:,}]: {median * 1000:,.1f} ms", file=progress_stream, flush=True)
+    finally:
+        set_figure_cache_enabled(was_cached)
+        instrumentation.set_enabled(was_enabled)
+
+    return {"environment": _environment(), "results": results}
+
+def compare_results(baseline, candidate, threshold=REGRESSION_THRESHOLD, min_delta_ms=REGRESSION_MIN_DELTA_MS,
+                    noise_mads=REGRESSION_NOISE_MADS):
+    """
+    Compare two suite results case by case. A case is only a regression (or
+    faster) if the median changed by more than the threshold, by at least
+    min_delta_ms and by more than noise_mads times the runs' combined MAD,
+    so sub-millisecond cases and noisy timings don't fail the comparison.
+
+    Args:
+        baseline (dict): Earlier run_suite output
+        candidate (dict): Newer run_suite output
+        threshold (float): Relative slowdown of the median that counts as a regression
+        min_delta_ms (float): Smallest absolute change of the median that counts
+        noise_mads (float): Change needed in combined MADs (results without
+            'mad_s' count as noise-free)
+
+    Returns:
+        DataFrame: Case, size, both medians, ratio, change, noise and status
+            ('regression', 'faster', 'ok', or 'new'/'missing' for cases in only one run)
+    """
+    base = {(r["case"], r["size"]): r for r in baseline["results"]}
+    new = {(r["case"], r["size"]): r for r in candidate["results"]}
+
+    rows = []
+    for key in sorted(set(base) | set(new)):
+        before, after = base.get(key), new.get(key)
+        row = {"case": key[0], "size": key[1],
+               "baseline_ms": before and round(before["median_s"] * 1000, 2),
+               "candidate_ms": after and round(after["median_s"] * 1000, 2),
+               "ratio": None, "delta_ms": None, "noise_ms": None}
+        if before is None:
+            row["status"] = "new"
+        elif after is None:
+            row["status"] = "missing"
+        else:
+            ratio = after["median_s"] / before["median_s"] if before["median_s"] > 0 else float("inf")
+            delta_ms = (after["median_s"] - before["median_s"]) * 1000
+            noise_ms = noise_mads * math.hypot(before.get("mad_s", 0.0), after.get("mad_s", 0.0)) * 1000
+            row.update(ratio=round(ratio, 3), delta_ms=round(delta_ms, 2), noise_ms=round(noise_ms, 2))
+
+            significant = abs(delta_ms) >= min_delta_ms and abs(delta_ms) > noise_ms
+            if significant and ratio > 1 + threshold:
+                row["status"] = "regression"
+            elif significant and ratio < 1 / (1 + threshold):
+                row["status"] = "faster"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+
+    return pd.DataFrame(rows, columns=["case", "size", "baseline_ms", "candidate_ms", "ratio", "delta_ms", "noise_ms",
+                                       "status"])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentigrade benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the suite and write JSON results")
+    run_parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="Corpus sizes: 1k, 100k, 1m or row counts")
+    run_parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    run_parser.add_argument("--cases", nargs="+", default=None, help="Only run cases containing these substrings")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--output", default="benchmark_results.json")
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    compare_parser.add_argument("--min-delta-ms", type=float, default=REGRESSION_MIN_DELTA_MS)
+    compare_parser.add_argument("--noise-mads", type=float, default=REGRESSION_NOISE_MADS)
+
+    commands.add_parser("list", help="List the registered cases")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for name, (_, max_size, _) in CASES.items():
+            print(name if max_size is None else f"{name} (up to {max_size:,} docs)")
+    elif args.command == "run":
+        suite = run_suite(args.sizes, args.repeats, args.cases, args.seed)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(suite, f, indent=2)
+        print(f"Wrote {len(suite['results'])} results to {args.output}")
+    else:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.candidate, encoding="utf-8") as f:
+            candidate = json.load(f)
+
+        comparison = compare_results(baseline, candidate, args.threshold, args.min_delta_ms, args.noise_mads)
+        print(comparison.to_string(index=False))
+        regressions = comparison[comparison["status"] == "regression"]
+        if not regressions.empty:
+            raise SystemExit(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
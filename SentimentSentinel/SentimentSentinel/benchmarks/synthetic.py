@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+from data.sea_countries import sea_countries
+from utils.schema import apply_compact_schema
+from utils.sentiment_analyzer import categorize_sentiment_array
+
+# Sources and topics used for synthetic news rows
+SYNTHETIC_SOURCES = [
+    "www.straitstimes.com", "www.channelnewsasia.com", "www.thestar.com.my",
+    "www.malaymail.com", "www.thejakartapost.com", "www.bangkokpost.com",
+    "e.vnexpress.net", "www.rappler.com", "www.inquirer.net", "www.reuters.com"
+]
+SYNTHETIC_TOPICS = ["Politics", "Economy", "International Relations", "Health", "Technology", "Environment", "Culture"]
+
+def make_scored_frame(rows, seed=0, compact=True):
+    """
+    Build a synthetic scored news DataFrame shaped like fetch_and_analyze_news output.
+
+    Args:
+        rows (int): Number of rows
+        seed (int): Random seed
+        compact (bool): Whether to apply the compact schema
+
+    Returns:
+        DataFrame: Synthetic scored data
+    """
+    rng = np.random.default_rng(seed)
+    countries = list(sea_countries.keys())
+
+    country = rng.choice(countries, rows)
+    topic = rng.choice(SYNTHETIC_TOPICS, rows)
+    scores = np.clip(rng.normal(0.05, 0.4, rows), -1, 1)
+
+    df = pd.DataFrame({
+        "query": pd.Series(topic).str.cat(pd.Series(country), sep=", "),
+        "country": country,
+        "title": [f"Headline {i} about {t} in {c}" for i, (t, c) in enumerate(zip(topic, country))],
+        "link": [f"https://example.com/article/{i}" for i in range(rows)],
+        "snippet": [f"Snippet text for article {i}" for i in range(rows)],
+        "source": rng.choice(SYNTHETIC_SOURCES, rows),
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D"),
+        "sentiment_score": scores,
+        "sentiment_category": categorize_sentiment_array(scores)
+    })
+
+    return apply_compact_schema(df) if compact else df
+
+# Phrase pools per language: (neutral openers, positive phrases, negative phrases)
+MULTILINGUAL_PHRASES = {
+    "en": (
+        ["The government said", "Residents in the capital say", "Officials confirmed that", "Analysts note"],
+        ["the new policy is a great success", "tourism is booming and people are happy", "the recovery looks strong"],
+        ["prices are rising and families are worried", "the floods caused terrible damage", "the talks failed badly"]
+    ),
+    "id": (
+        ["Pemerintah mengatakan bahwa", "Warga di ibu kota dan", "Menurut pejabat yang", "Para analis di"],
+        ["kebijakan ini sangat baik untuk rakyat", "pariwisata dan ekonomi tumbuh dengan cepat", "ini adalah kabar gembira"],
+        ["harga naik dan warga tidak senang", "banjir itu merusak rumah di desa", "pembicaraan itu gagal dan mengecewakan"]
+    ),
+    "ms": (
+        ["Kerajaan berkata bahawa", "Penduduk di bandar dan", "Menurut pegawai yang", "Penganalisis di"],
+        ["dasar ini sangat bagus untuk rakyat", "pelancongan dan ekonomi meningkat dengan baik", "ini berita yang menggembirakan"],
+        ["harga naik dan rakyat tidak gembira", "banjir itu memusnahkan rumah di kampung", "rundingan itu gagal dengan teruk"]
+    ),
+    "tl": (
+        ["Sinabi ng gobyerno na", "Ayon sa mga residente sa lungsod", "Ayon sa mga opisyal ang", "Sinabi ng mga analista na"],
+        ["ang bagong patakaran ay napakahusay para sa mga tao", "masaya ang mga tao sa pag-unlad ng turismo", "maganda ang balita"],
+        ["tumaas ang mga presyo at nag-aalala ang mga pamilya", "malaki ang pinsala ng baha sa mga bahay", "nabigo ang usapan"]
+    ),
+    "vi": (
+        ["Chính phủ cho biết", "Người dân ở thủ đô nói rằng", "Các quan chức xác nhận", "Các nhà phân tích nhận định"],
+        ["chính sách mới rất thành công", "du lịch phát triển và người dân vui vẻ", "nền kinh tế phục hồi mạnh mẽ"],
+        ["giá cả tăng và các gia đình lo lắng", "lũ lụt gây thiệt hại nặng nề", "các cuộc đàm phán thất bại"]
+    ),
+    "th": (
+        ["รัฐบาลกล่าวว่า", "ประชาชนในเมืองหลวงกล่าวว่า", "เจ้าหน้าที่ยืนยันว่า", "นักวิเคราะห์ระบุว่า"],
+        ["นโยบายใหม่ประสบความสำเร็จอย่างมาก", "การท่องเที่ยวเติบโตและผู้คนมีความสุข", "เศรษฐกิจฟื้นตัวอย่างแข็งแกร่ง"],
+        ["ราคาสินค้าสูงขึ้นและครอบครัวกังวล", "น้ำท่วมสร้างความเสียหายอย่างหนัก", "การเจรจาล้มเหลว"]
+    )
+}
+
+# Share of posts per language in multilingual corpora
+LANGUAGE_WEIGHTS = {"en": 0.4, "id": 0.2, "ms": 0.1, "tl": 0.1, "vi": 0.1, "th": 0.1}
+
+# Hashtags and mentions appended to some posts
+SYNTHETIC_HASHTAGS = ["#ASEAN", "#Economy", "#Banjir", "#Travel", "#Election", "#Tech"]
+SYNTHETIC_MENTIONS = ["@newsdesk", "@gov_sg", "@kompas", "@vnexpress", "@rappler"]
+
+# Named corpus sizes for benchmark runs
+CORPUS_SIZES = {"1k": 1000, "100k": 100000, "1m": 1000000}
+
+def make_multilingual_posts(rows, seed=0):
+    """
+    Build unscored Southeast Asian social posts in several languages.
+    Each post is a neutral opener plus a positive, negative or no sentiment
+    phrase in one of LANGUAGE_WEIGHTS' languages, with occasional hashtags,
+    mentions and links.
+
+    Args:
+        rows (int): Number of posts
+        seed (int): Random seed
+
+    Returns:
+        DataFrame: 'text', 'language' (true language), 'country', 'platform' and 'date'
+    """
+    rng = np.random.default_rng(seed)
+    languages = np.array(list(LANGUAGE_WEIGHTS))
+    language = rng.choice(languages, rows, p=list(LANGUAGE_WEIGHTS.values()))
+    polarity = rng.integers(0, 3, rows)
+
+    # Build texts per language with vectorized choices
+    text = np.empty(rows, dtype=object)
+    for code in languages:
+        mask = language == code
+        n = int(mask.sum())
+        if not n:
+            continue
+        openers, positive, negative = MULTILINGUAL_PHRASES[code]
+        opener = rng.choice(openers, n)
+        phrase = np.where(
+            polarity[mask] == 0, rng.choice(positive, n),
+            np.where(polarity[mask] == 1, rng.choice(negative, n), "")
+        )
+        text[mask] = pd.Series(opener).str.cat(pd.Series(phrase), sep=" ").str.strip().to_numpy()
+
+    text = pd.Series(text)
+    extras = rng.random((rows, 3))
+    text = text.where(extras[:, 0] > 0.3, text + " " + pd.Series(rng.choice(SYNTHETIC_HASHTAGS, rows)))
+    text = text.where(extras[:, 1] > 0.2, text + " " + pd.Series(rng.choice(SYNTHETIC_MENTIONS, rows)))
+    text = text.where(extras[:, 2] > 0.1, text + " https://example.com/p/" + pd.Series(np.arange(rows)).astype(str))
+
+    return pd.DataFrame({
+        "text": text,
+        "language": language,
+        "country": rng.choice(list(sea_countries.keys()), rows),
+        "platform": rng.choice(["Twitter", "Facebook", "Instagram", "TikTok"], rows),
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24, rows), unit="h")
+    })
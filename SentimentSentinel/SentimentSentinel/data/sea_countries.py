@@ -1,4 +1,5 @@
 # Southeast Asian countries with metadata
+from types import MappingProxyType
 
 # Country names and their ISO codes
 sea_countries = {
@@ -101,6 +102,37 @@ country_internet_penetration = {
     "TL": 34.2
 }
 
+# Country codes in a fixed order; a country's position is its bit in region masks
+# and its code in country categoricals
+COUNTRY_ORDER = tuple(sea_countries.values())
+
+# Country name or ISO code -> ISO code (both spellings appear in stored data)
+COUNTRY_CODE_LOOKUP = MappingProxyType({**sea_countries, **{code: code for code in country_codes}})
+
+# ISO code -> position in COUNTRY_ORDER
+COUNTRY_INDEX = MappingProxyType({code: i for i, code in enumerate(COUNTRY_ORDER)})
+
+# Region name -> bitmask of member countries
+REGION_MASKS = MappingProxyType({
+    region: sum(1 << COUNTRY_INDEX[code] for code in codes)
+    for region, codes in country_regions.items()
+})
+
+# ISO code -> regions it belongs to
+COUNTRY_REGION_NAMES = MappingProxyType({
+    code: tuple(region for region, codes in country_regions.items() if code in codes)
+    for code in COUNTRY_ORDER
+})
+
+# ISO code -> set of primary language codes
+COUNTRY_LANGUAGE_SETS = MappingProxyType({code: frozenset(languages) for code, languages in country_languages.items()})
+
+# Language code -> set of ISO codes of countries speaking it
+LANGUAGE_COUNTRIES = MappingProxyType({
+    language: frozenset(code for code, languages in COUNTRY_LANGUAGE_SETS.items() if language in languages)
+    for language in dict.fromkeys(language for languages in country_languages.values() for language in languages)
+})
+
 def get_country_data(country_code):
     """
     Get comprehensive data for a specific country.
@@ -122,7 +154,7 @@ def get_country_data(country_code):
         "population": country_population.get(country_code, 0),
         "gdp_per_capita": country_gdp_per_capita.get(country_code, 0),
         "internet_penetration": country_internet_penetration.get(country_code, 0),
-        "regions": [region for region, countries in country_regions.items() if country_code in countries]
+        "regions": list(COUNTRY_REGION_NAMES[country_code])
     }
 
 def get_countries_by_region(region):
@@ -136,3 +168,77 @@ def get_countries_by_region(region):
         list: List of country codes in the region
     """
     return country_regions.get(region, [])
+
+def country_code_categorical(values):
+    """
+    Map a column of country names or ISO codes to a categorical of ISO codes.
+    Only the distinct values are looked up, so the cost is one factorize
+    over the column; unknown countries become NaN.
+
+    Args:
+        values (Series or array-like): Country names and/or ISO codes
+
+    Returns:
+        Categorical: ISO codes with categories in COUNTRY_ORDER
+    """
+    import numpy as np
+    import pandas as pd
+
+    values = pd.Series(values)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+
+    # One lookup per distinct value, plus a trailing -1 for missing values (code -1)
+    lookup = np.array([COUNTRY_INDEX.get(COUNTRY_CODE_LOOKUP.get(value), -1) for value in uniques] + [-1])
+    return pd.Categorical.from_codes(lookup[codes], COUNTRY_ORDER)
+
+def country_bits(values):
+    """
+    Get each row's country bit (1 << position in COUNTRY_ORDER).
+
+    Args:
+        values (Series or array-like): Country names and/or ISO codes
+
+    Returns:
+        ndarray: uint16 bit per row (0 for unknown countries)
+    """
+    import numpy as np
+
+    codes = country_code_categorical(values).codes
+    bits = np.append(np.left_shift(1, np.arange(len(COUNTRY_ORDER))), 0).astype(np.uint16)
+    return bits[codes]
+
+def region_mask(values, regions):
+    """
+    Flag rows whose country belongs to any of the given regions with a
+    single bitwise AND over the column.
+
+    Args:
+        values (Series or array-like): Country names and/or ISO codes
+        regions (str or list): Region name(s) from country_regions
+
+    Returns:
+        ndarray: Boolean mask, one entry per row
+    """
+    if isinstance(regions, str):
+        regions = [regions]
+    mask = 0
+    for region in regions:
+        mask |= REGION_MASKS.get(region, 0)
+    return (country_bits(values) & mask) != 0
+
+def filter_by_region(df, regions, country_column='country'):
+    """
+    Keep the rows of a DataFrame whose country is in the given region(s).
+
+    Args:
+        df (DataFrame): Data with a country column
+        regions (str or list): Region name(s) from country_regions
+        country_column (str): Column holding country names or ISO codes
+
+    Returns:
+        DataFrame: Rows in the region(s)
+    """
+    return df[region_mask(df[country_column], regions)]
@@ -1,12 +1,17 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from utils.sentiment_analyzer import analyze_sentiment, categorize_sentiment
-from utils.data_processor import fetch_news_data, export_data
-from utils.visualization import create_sentiment_heatmap, create_source_comparison, create_sentiment_timeline
+from utils.sentiment_analyzer import analyze_sentiment, categorize_sentiment, categorize_sentiment_array, get_category_color
+from utils.data_processor import fetch_news_data, export_to_buffer, get_export_file_info, available_compressions
+from utils.visualization import (
+    create_sentiment_heatmap, create_source_comparison, create_sentiment_timeline, create_sentiment_pie_chart,
+    create_topic_sentiment_chart, create_source_count_chart, create_topic_coverage_chart, create_word_cloud
+)
 from utils.news_api import fetch_and_analyze_news, setup_api_keys
+from utils.aggregation import compute_aggregates
+from utils.terms import count_terms
+from utils.search_index import SearchIndex
 from data.sea_countries import sea_countries
+from utils.instrumentation import start_page_run, show_debug_panel
 import os
 
 # Page configuration
@@ -17,6 +22,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Time this render for the sidebar timing breakdown
+start_page_run("News Analysis")
+
 # Page title
 st.title("News Media Sentiment Analysis")
 st.markdown("Analyze sentiment from news sources across Southeast Asia")
@@ -139,52 +147,57 @@ with tab1:
                     st.info("No news data found for the selected filters. Try different topics or countries.")
                 else:
                     # Add sentiment categorization
-                    news_df['sentiment_category'] = news_df['sentiment_score'].apply(categorize_sentiment)
+                    news_df['sentiment_category'] = categorize_sentiment_array(news_df['sentiment_score'])
                     
                     # Show some statistics
                     st.success(f"Found {len(news_df)} news articles for analysis.")
                     
+                    # Aggregate once for every chart in this tab
+                    news_aggregates = compute_aggregates(
+                        news_df, 'sentiment_score', ['sentiment_category', 'query', 'source']
+                    )
+                    
                     # Visualizations
                     # Sentiment distribution
-                    sentiment_counts = news_df['sentiment_category'].value_counts().to_dict()
+                    category_counts = news_aggregates[('sentiment_category',)]
+                    sentiment_counts = dict(zip(category_counts['sentiment_category'], category_counts['size']))
                     
                     col1, col2 = st.columns(2)
                     
                     with col1:
                         # Sentiment pie chart
-                        from utils.visualization import create_sentiment_pie_chart
                         fig = create_sentiment_pie_chart(sentiment_counts, "Sentiment Distribution")
                         st.plotly_chart(fig, use_container_width=True)
                     
                     with col2:
                         # Average sentiment by topic
-                        topic_sentiment = news_df.groupby('query')['sentiment_score'].mean().reset_index()
-                        topic_sentiment.columns = ['Topic', 'Average Sentiment']
-                        
-                        fig = px.bar(
-                            topic_sentiment, 
-                            x='Topic', 
-                            y='Average Sentiment',
-                            color='Average Sentiment',
-                            color_continuous_scale=["#F44336", "#FFC107", "#4CAF50"],
-                            title="Average Sentiment by Topic and Country"
-                        )
-                        fig.update_layout(height=400)
+                        fig = create_topic_sentiment_chart(news_df, 'query', 'sentiment_score', aggregates=news_aggregates)
                         st.plotly_chart(fig, use_container_width=True)
                     
                     # Source Analysis
                     st.subheader("News Source Analysis")
-                    source_counts = news_df['source'].value_counts().reset_index()
-                    source_counts.columns = ['Source', 'Count']
+                    fig = create_source_count_chart(news_df, 'source', aggregates=news_aggregates)
+                    st.plotly_chart(fig, use_container_width=True)
                     
-                    fig = px.bar(
-                        source_counts, 
-                        x='Source', 
-                        y='Count',
-                        title="Article Count by Source",
-                        color='Count',
-                        color_continuous_scale="Viridis"
+                    # Top terms in headlines and snippets
+                    st.subheader("Top Terms")
+                    term_ranking = st.radio(
+                        "Rank terms by",
+                        options=["Frequency", "TF-IDF", "Negative association"],
+                        horizontal=True
                     )
+                    term_counter = count_terms(news_df, ['title', 'snippet'])
+                    
+                    if term_ranking == "Frequency":
+                        top_terms = term_counter.top_terms(20, weighting='count')
+                        fig = create_word_cloud(top_terms, "Most Frequent Terms", value_label="Count")
+                    elif term_ranking == "TF-IDF":
+                        top_terms = term_counter.top_terms(20, weighting='tfidf')
+                        fig = create_word_cloud(top_terms, "Most Distinctive Terms", value_label="TF-IDF")
+                    else:
+                        top_terms = term_counter.associated_terms('negative', 20)
+                        fig = create_word_cloud(top_terms, "Terms Most Associated with Negative Sentiment",
+                                                value_label="Log-odds z-score")
                     st.plotly_chart(fig, use_container_width=True)
                 
             except Exception as e:
@@ -230,29 +243,21 @@ with tab2:
                     st.info("No news data found for the selected filters. Try different topics or countries.")
                 else:
                     # Add sentiment categorization
-                    news_df['sentiment_category'] = news_df['sentiment_score'].apply(categorize_sentiment)
+                    news_df['sentiment_category'] = categorize_sentiment_array(news_df['sentiment_score'])
+                    
+                    # Aggregate once; per-source results are derived from the (source, query) cells
+                    news_aggregates = compute_aggregates(
+                        news_df, 'sentiment_score', [('source', 'query'), 'source']
+                    )
                     
                     # Media outlet comparison
                     st.subheader("Media Outlet Sentiment Comparison")
                     
-                    # Group by source and calculate average sentiment
-                    source_sentiment = news_df.groupby('source')['sentiment_score'].agg(['mean', 'count']).reset_index()
-                    source_sentiment.columns = ['Source', 'Average Sentiment', 'Article Count']
-                    
-                    # Filter sources with at least 2 articles for more meaningful comparison
-                    source_sentiment_filtered = source_sentiment[source_sentiment['Article Count'] >= 1]
-                    
-                    if not source_sentiment_filtered.empty:
-                        fig = px.bar(
-                            source_sentiment_filtered,
-                            x='Source',
-                            y='Average Sentiment',
-                            color='Average Sentiment',
-                            color_continuous_scale=["#F44336", "#FFC107", "#4CAF50"],
-                            title="Media Outlet Sentiment Comparison",
-                            hover_data=['Article Count']
+                    if len(news_aggregates[('source',)]) > 0:
+                        fig = create_source_comparison(
+                            news_df, 'source', 'sentiment_score',
+                            title="Media Outlet Sentiment Comparison", aggregates=news_aggregates
                         )
-                        fig.add_hline(y=0, line_dash="dash", line_color="gray", annotation_text="Neutral")
                         st.plotly_chart(fig, use_container_width=True)
                     else:
                         st.info("Not enough data to compare media outlets. Try selecting more topics or countries.")
@@ -260,28 +265,8 @@ with tab2:
                     # Publication bias analysis
                     st.subheader("Topic Coverage Analysis")
                     
-                    # Calculate topic coverage by source
-                    topic_coverage = pd.crosstab(
-                        news_df['source'], 
-                        news_df['query']
-                    ).reset_index()
-                    
-                    if not topic_coverage.empty and len(topic_coverage.columns) > 1:
-                        # Melt for plotting
-                        topic_coverage_melted = topic_coverage.melt(
-                            id_vars=['source'],
-                            var_name='Topic',
-                            value_name='Count'
-                        )
-                        
-                        fig = px.bar(
-                            topic_coverage_melted,
-                            x='source',
-                            y='Count',
-                            color='Topic',
-                            title="Topic Coverage by Media Outlet",
-                            barmode='group'
-                        )
+                    if len(news_aggregates[('source', 'query')]) > 0:
+                        fig = create_topic_coverage_chart(news_df, 'source', 'query', aggregates=news_aggregates)
                         st.plotly_chart(fig, use_container_width=True)
                     else:
                         st.info("Not enough topic coverage data available.")
@@ -293,10 +278,80 @@ with tab2:
 with tab3:
     st.subheader("News Content Analysis")
     
+    # Keep the local search index in step with the articles loaded this session
+    if "search_index" not in st.session_state:
+        st.session_state.search_index = SearchIndex()
+    search_index = st.session_state.search_index
+    if "news_data" in st.session_state and st.session_state.news_data is not None:
+        search_index.index_frame(st.session_state.news_data)
+    
     # Search functionality
     search_query = st.text_input("Search for specific news topics or keywords")
+    search_scope = st.radio(
+        "Search in",
+        options=["Loaded articles", "Live news search"],
+        horizontal=True,
+        help="Loaded articles are searched locally; live search queries the news API"
+    )
     
-    if not api_configured:
+    if search_scope == "Loaded articles":
+        if len(search_index) == 0:
+            st.info("No articles loaded yet. Run the Overview tab or a live search to load articles.")
+        else:
+            with st.expander("Search Filters"):
+                search_mode = st.selectbox(
+                    "Match",
+                    options=["auto", "keyword", "phrase", "prefix"],
+                    help='auto: all words, "quoted phrases" and word* prefixes'
+                )
+                sentiment_range = st.slider("Sentiment Score", -1.0, 1.0, (-1.0, 1.0), 0.05)
+                filter_countries = st.multiselect("Countries", options=search_index.facet_values("country"))
+                filter_sources = st.multiselect("Sources", options=search_index.facet_values("source"))
+                first_date, last_date = search_index.date_range()
+                date_range = st.date_input(
+                    "Date Range",
+                    value=(first_date.date(), last_date.date()) if first_date is not None else (),
+                    key="search_date_range"
+                )
+            
+            if search_query:
+                # Filters left at their defaults add no predicate, so unscored and undated articles still match
+                start_date, end_date = date_range if len(date_range) == 2 else (None, None)
+                if first_date is not None and (start_date, end_date) == (first_date.date(), last_date.date()):
+                    start_date, end_date = None, None
+                hits = search_index.search(
+                    search_query,
+                    mode=search_mode,
+                    sentiment_range=None if sentiment_range == (-1.0, 1.0) else sentiment_range,
+                    countries=filter_countries,
+                    sources=filter_sources,
+                    start_date=start_date,
+                    end_date=end_date,
+                    limit=20
+                )
+                
+                if hits.empty:
+                    st.info(f"No loaded articles match '{search_query}'. Try live news search.")
+                else:
+                    st.success(f"Found {len(hits)} loaded articles matching '{search_query}'")
+                    for idx, row in hits.iterrows():
+                        with st.container():
+                            col1, col2 = st.columns([5, 1])
+                            with col1:
+                                st.markdown(f"#### [{row['title']}]({row['link']})")
+                                st.markdown(f"**Source:** {row['source']} | **Date:** {row['date'].date() if pd.notna(row['date']) else 'Unknown date'}")
+                                st.markdown(row['excerpt'])
+                            with col2:
+                                # Display sentiment with color
+                                score = row['sentiment_score']
+                                sentiment = categorize_sentiment(score) or "unscored"
+                                color = get_category_color(sentiment)
+                                score_label = f"{score:.2f}" if pd.notna(score) else "n/a"
+                                st.markdown(f"<div style='background-color:{color}; padding:10px; border-radius:5px; text-align:center; color:white;'><b>{sentiment.upper()}</b><br>{score_label}</div>", unsafe_allow_html=True)
+                            st.markdown("---")
+            else:
+                st.info(f"Enter a search term to search {len(search_index)} loaded articles.")
+    elif not api_configured:
         st.warning("API keys not configured. Please configure API keys to access live news data.")
         if st.button("Configure API Keys", key="tab3_config_button"):
             st.session_state.show_api_config = True
@@ -317,22 +372,27 @@ with tab3:
                 st.info(f"No news articles found matching '{search_query}'. Try a different search term.")
             else:
                 # Add sentiment categorization
-                search_results['sentiment_category'] = search_results['sentiment_score'].apply(categorize_sentiment)
+                search_results['sentiment_category'] = categorize_sentiment_array(search_results['sentiment_score'])
+                
+                # Make live results searchable locally too
+                search_index.index_frame(search_results)
                 
                 # Show the results in a nicely formatted way
                 st.success(f"Found {len(search_results)} articles matching '{search_query}'")
                 
                 # Sentiment distribution
-                sentiment_counts = search_results['sentiment_category'].value_counts().to_dict()
+                category_counts = compute_aggregates(
+                    search_results, 'sentiment_score', ['sentiment_category']
+                )[('sentiment_category',)]
+                sentiment_counts = dict(zip(category_counts['sentiment_category'], category_counts['size']))
                 
                 # Pie chart
                 col1, col2 = st.columns([1, 2])
                 
                 with col1:
                     # Sentiment distribution
-                    from utils.visualization import create_sentiment_pie_chart
                     fig = create_sentiment_pie_chart(sentiment_counts, "Sentiment Distribution")
-                    st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(fig, use_container_width=True, key="search_sentiment_pie")
                 
                 with col2:
                     # Articles table with formatted sentiment
@@ -344,27 +404,28 @@ with tab3:
                             col1, col2 = st.columns([5, 1])
                             with col1:
                                 st.markdown(f"#### [{row['title']}]({row['link']})")
-                                st.markdown(f"**Source:** {row['source']} | **Date:** {row['date']}")
+                                st.markdown(f"**Source:** {row['source']} | **Date:** {row['date'].date() if pd.notna(row['date']) else 'Unknown date'}")
                                 st.markdown(row['snippet'])
                             with col2:
                                 # Display sentiment with color
-                                sentiment = row['sentiment_category']
                                 score = row['sentiment_score']
-                                color = "#4CAF50" if sentiment == "positive" else "#F44336" if sentiment == "negative" else "#FFC107"
-                                st.markdown(f"<div style='background-color:{color}; padding:10px; border-radius:5px; text-align:center; color:white;'><b>{sentiment.upper()}</b><br>{score:.2f}</div>", unsafe_allow_html=True)
+                                sentiment = row['sentiment_category'] if pd.notna(score) else "unscored"
+                                color = get_category_color(sentiment)
+                                score_label = f"{score:.2f}" if pd.notna(score) else "n/a"
+                                st.markdown(f"<div style='background-color:{color}; padding:10px; border-radius:5px; text-align:center; color:white;'><b>{sentiment.upper()}</b><br>{score_label}</div>", unsafe_allow_html=True)
                             st.markdown("---")
     else:
         # If user hasn't searched yet
         if "news_data" in st.session_state and st.session_state.news_data is not None and not st.session_state.news_data.empty:
             # Show the most recent data we have
             news_df = st.session_state.news_data
-            news_df['sentiment_category'] = news_df['sentiment_score'].apply(categorize_sentiment)
+            news_df['sentiment_category'] = categorize_sentiment_array(news_df['sentiment_score'])
             
             # Show top articles
             st.subheader("Top News Articles")
             
             # Sort by absolute sentiment score to get the most opinionated articles
-            sorted_df = news_df.copy()
+            sorted_df = news_df.dropna(subset=['sentiment_score']).copy()
             sorted_df['abs_score'] = sorted_df['sentiment_score'].abs()
             sorted_df = sorted_df.sort_values('abs_score', ascending=False).head(5)
             
@@ -374,13 +435,13 @@ with tab3:
                     col1, col2 = st.columns([5, 1])
                     with col1:
                         st.markdown(f"#### [{row['title']}]({row['link']})")
-                        st.markdown(f"**Source:** {row['source']} | **Date:** {row['date']}")
+                        st.markdown(f"**Source:** {row['source']} | **Date:** {row['date'].date() if pd.notna(row['date']) else 'Unknown date'}")
                         st.markdown(row['snippet'])
                     with col2:
                         # Display sentiment with color
                         sentiment = row['sentiment_category']
                         score = row['sentiment_score']
-                        color = "#4CAF50" if sentiment == "positive" else "#F44336" if sentiment == "negative" else "#FFC107"
+                        color = get_category_color(sentiment)
                         st.markdown(f"<div style='background-color:{color}; padding:10px; border-radius:5px; text-align:center; color:white;'><b>{sentiment.upper()}</b><br>{score:.2f}</div>", unsafe_allow_html=True)
                     st.markdown("---")
         else:
@@ -411,37 +472,58 @@ st.sidebar.markdown("---")
 st.sidebar.subheader("Export Options")
 export_format = st.sidebar.selectbox(
     "Export Format",
-    options=["CSV", "Excel", "JSON", "PDF Report"],
+    options=["CSV", "Excel", "JSON", "JSON Lines", "Parquet", "Feather (Arrow IPC)", "PDF Report"],
     index=0
 )
 
+# Map menu labels to export format names
+export_format_names = {
+    "CSV": "csv",
+    "Excel": "excel",
+    "JSON": "json",
+    "JSON Lines": "jsonl",
+    "Parquet": "parquet",
+    "Feather (Arrow IPC)": "feather",
+    "PDF Report": "pdf"
+}
+
+# zstd is only offered when the selected format can actually use it
+export_compression = st.sidebar.selectbox(
+    "Compression",
+    options=["None"] + available_compressions(export_format_names[export_format]),
+    index=0,
+    help="Applies to CSV, JSON and JSON Lines; Parquet and Feather use it as their internal codec"
+)
+
 # Enable export if we have data
 if "news_data" in st.session_state and st.session_state.news_data is not None and not st.session_state.news_data.empty:
     if st.sidebar.button("Export Data"):
-        # Convert format string to lowercase for our function
-        format_str = export_format.lower().replace(" report", "")
+        format_str = export_format_names[export_format]
+        compression = None if export_compression == "None" else export_compression
         
-        # Use our export function from data_processor
-        export_path = export_data(st.session_state.news_data, format=format_str, filename="sentigrade_news_export")
+        # Stream the export into a buffer instead of writing to the working directory
+        export_file = export_to_buffer(st.session_state.news_data, format=format_str, compression=compression)
         
-        if export_path:
+        if export_file is not None:
             st.sidebar.success(f"Data exported successfully as {export_format}!")
             
-            # For formats other than PDF, provide download link
-            if format_str != "pdf":
-                with open(export_path, "rb") as file:
-                    st.sidebar.download_button(
-                        label=f"Download {export_format}",
-                        data=file,
-                        file_name=f"sentigrade_news_export.{format_str}",
-                        mime=f"application/{format_str}"
-                    )
+            file_name, mime = get_export_file_info(format_str, compression, "sentigrade_news_export")
+            with export_file:
+                st.sidebar.download_button(
+                    label=f"Download {export_format}",
+                    data=export_file,
+                    file_name=file_name,
+                    mime=mime
+                )
         else:
             st.sidebar.error(f"Failed to export data as {export_format}.")
 else:
     if st.sidebar.button("Export Data"):
         st.sidebar.info("No data available to export. Please fetch news data first.")
 
+# Per-stage timing of this render (when enabled)
+show_debug_panel()
+
 # Footer
 st.markdown("---")
 st.markdown("© 2023 Sentigrade. All rights reserved.")
@@ -1,12 +1,15 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from utils.sentiment_analyzer import analyze_sentiment
+from utils.scoring_client import score_texts
 from utils.data_processor import fetch_social_media_data, process_sentiment_data
 from utils.visualization import create_sentiment_pie_chart, create_sentiment_timeline, create_word_cloud
+from utils.sentiment_analyzer import CATEGORY_COLORS, categorize_sentiment
 from utils.language_detector import detect_language
+from utils.trending import TrendingTracker
+from utils.search_index import SearchIndex
 from data.sea_countries import sea_countries, country_flags
+from utils.instrumentation import start_page_run, show_debug_panel
 
 # Page configuration
 st.set_page_config(
@@ -16,6 +19,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Time this render for the sidebar timing breakdown
+start_page_run("Social Media Analysis")
+
 # Page title
 st.title("Social Media Sentiment Analysis")
 st.markdown("Analyze sentiment from social media platforms across Southeast Asia")
@@ -87,7 +93,7 @@ with tab1:
                         labels=["Positive", "Neutral", "Negative"],
                         values=[0, 0, 0],
                         hole=.4,
-                        marker_colors=["#4CAF50", "#FFC107", "#F44336"]
+                        marker_colors=[CATEGORY_COLORS["positive"], CATEGORY_COLORS["neutral"], CATEGORY_COLORS["negative"]]
                     ))
                     fig.update_layout(
                         title="Sentiment Distribution (No Data)",
@@ -172,6 +178,19 @@ with tab2:
 with tab3:
     st.subheader("Explore Social Media Content")
     
+    # Load the posts searched and tracked below
+    social_df = fetch_social_media_data(
+        selected_platforms, selected_topics, list(sea_countries.keys()), selected_languages, data_volume
+    )
+    if social_df is not None and not social_df.empty:
+        social_df = process_sentiment_data(social_df)
+    
+    # Social posts get their own index; st.session_state.search_index holds news articles
+    if "social_search_index" not in st.session_state:
+        st.session_state.social_search_index = SearchIndex()
+    search_index = st.session_state.social_search_index
+    search_index.index_frame(social_df)
+    
     # Search functionality
     search_query = st.text_input("Search for specific content or keywords")
     
@@ -179,15 +198,16 @@ with tab3:
     if search_query:
         try:
             detected_lang = detect_language(search_query)
-            sentiment_score = analyze_sentiment(search_query, "en")  # Default to English for demo
+            sentiment_score = score_texts([search_query], ["en"])[0]["score"]  # Default to English for demo
             
             st.write(f"Detected Language: {detected_lang}")
             st.write(f"Sentiment Score: {sentiment_score:.2f}")
             
             # Sentiment classification
-            if sentiment_score > 0.05:
+            sentiment = categorize_sentiment(sentiment_score)
+            if sentiment == "positive":
                 st.success("Positive sentiment detected")
-            elif sentiment_score < -0.05:
+            elif sentiment == "negative":
                 st.error("Negative sentiment detected")
             else:
                 st.info("Neutral sentiment detected")
@@ -195,18 +215,71 @@ with tab3:
         except Exception as e:
             st.error(f"Error analyzing text: {str(e)}")
     
-    # Content table placeholder
-    st.subheader("Top Posts")
-    st.info("Connect to a data source to view and analyze actual social media content.")
+    # Search the posts indexed this session
+    if search_query and len(search_index) > 0:
+        st.subheader("Matching Content")
+        hits = search_index.search(search_query, limit=50)
+        
+        if hits.empty:
+            st.info(f"No loaded posts match '{search_query}'.")
+        else:
+            st.dataframe(
+                hits[["platform", "country", "date", "snippet", "sentiment_score"]].rename(columns={
+                    "platform": "Platform",
+                    "country": "Country",
+                    "date": "Date",
+                    "snippet": "Content",
+                    "sentiment_score": "Sentiment"
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+    else:
+        # Content table placeholder
+        st.subheader("Top Posts")
+        st.info("Connect to a data source to view and analyze actual social media content.")
+        
+        # Example table structure
+        st.dataframe({
+            "Platform": [],
+            "Date": [],
+            "Content": [],
+            "Sentiment": [],
+            "Engagement": []
+        })
     
-    # Example table structure
-    st.dataframe({
-        "Platform": [],
-        "Date": [],
-        "Content": [],
-        "Sentiment": [],
-        "Engagement": []
-    })
+    # Trending hashtags and mentions
+    st.subheader("Trending Hashtags and Mentions")
+    if social_df is not None and not social_df.empty:
+        # Keep one tracker per session so new posts update the running counts
+        if "trending_tracker" not in st.session_state:
+            st.session_state.trending_tracker = TrendingTracker(bucket="1D", short_buckets=1, long_buckets=7)
+        tracker = st.session_state.trending_tracker
+        tracker.update_frame(social_df)
+        
+        trend_country = st.selectbox(
+            "Country",
+            options=["All countries"] + list(sea_countries.keys()),
+            key="trending_country"
+        )
+        country = None if trend_country == "All countries" else trend_country
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown("**Top Hashtags**")
+            st.dataframe(tracker.top_tags(country, k=10, kind='#'), use_container_width=True, hide_index=True)
+        with col2:
+            st.markdown("**Top Mentions**")
+            st.dataframe(tracker.top_tags(country, k=10, kind='@'), use_container_width=True, hide_index=True)
+        with col3:
+            st.markdown("**Bursting Now**")
+            bursts = tracker.bursts(country)
+            if bursts.empty:
+                st.info("No tags are bursting above their usual rate.")
+            else:
+                st.dataframe(bursts[['tag', 'short_count', 'ratio']].round(1), use_container_width=True, hide_index=True)
+    else:
+        st.info("Connect to a data source to track trending hashtags and mentions.")
     
     st.markdown("""
     ### Content Analysis Features
@@ -227,6 +300,9 @@ export_format = st.sidebar.selectbox(
 if st.sidebar.button("Export Data"):
     st.sidebar.info("Export functionality will be enabled when connected to data sources.")
 
+# Per-stage timing of this render (when enabled)
+show_debug_panel()
+
 # Footer
 st.markdown("---")
 st.markdown("© 2023 Sentigrade. All rights reserved.")
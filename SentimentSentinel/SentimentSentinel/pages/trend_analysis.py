@@ -1,11 +1,14 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from utils.data_processor import fetch_historical_data
-from utils.visualization import create_trend_chart, create_forecast_chart
+from utils.data_processor import fetch_historical_data, generate_forecast_data
+from utils.forecasting import build_series_matrix, backtest_forecast
+from utils.volatility import compute_volatility, detect_change_points
+from utils.visualization import create_trend_chart, create_forecast_chart, create_sentiment_heatmap
+from utils.regional import WEEKLY_BUCKET, regional_aggregates
 from data.sea_countries import sea_countries
+from utils.instrumentation import start_page_run, show_debug_panel
 
 # Page configuration
 st.set_page_config(
@@ -15,6 +18,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Time this render for the sidebar timing breakdown
+start_page_run("Trend Analysis")
+
 # Page title
 st.title("Sentiment Trend Analysis")
 st.markdown("Analyze historical sentiment trends and forecasts across Southeast Asia")
@@ -77,6 +83,15 @@ with st.sidebar:
             value=7,
             help="Select number of days to forecast"
         )
+        
+        # Forecast model selection
+        forecast_models = {"Holt-Winters": "holt_winters", "Autoregressive (AR)": "ar"}
+        selected_forecast_model = st.selectbox(
+            "Forecast Model",
+            options=list(forecast_models.keys()),
+            index=0,
+            help="Select the forecasting model"
+        )
 
 # Main content
 tab1, tab2, tab3 = st.tabs(["Historical Trends", "Comparative Analysis", "Forecast"])
@@ -92,39 +107,95 @@ with tab1:
         # Add loading state
         with st.spinner("Analyzing historical trends..."):
             try:
-                # Empty state message
-                st.info("No historical data available. Please connect to a data source or upload data for analysis.")
-                
-                # Historical trend chart (empty state)
-                fig = go.Figure()
-                fig.update_layout(
-                    title="Historical Sentiment Trends (No Data)",
-                    xaxis_title="Date",
-                    yaxis_title="Sentiment Score",
-                    height=500,
-                    margin=dict(l=20, r=20, t=40, b=20)
-                )
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Key events and annotations
-                st.subheader("Key Events")
-                st.info("Connect to a data source to view key events that influenced sentiment trends.")
+                historical_df = fetch_historical_data(selected_countries, selected_topic, selected_period, selected_data_source)
                 
-                # Volatility analysis
-                st.subheader("Sentiment Volatility")
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    # Volatility chart
+                if historical_df is None or historical_df.empty:
+                    # Empty state message
+                    st.info("No historical data available. Please connect to a data source or upload data for analysis.")
+                    
+                    # Historical trend chart (empty state)
                     fig = go.Figure()
                     fig.update_layout(
-                        title="Sentiment Volatility (No Data)",
+                        title="Historical Sentiment Trends (No Data)",
                         xaxis_title="Date",
-                        yaxis_title="Volatility",
-                        height=400,
+                        yaxis_title="Sentiment Score",
+                        height=500,
                         margin=dict(l=20, r=20, t=40, b=20)
                     )
                     st.plotly_chart(fig, use_container_width=True)
+                    
+                    # Key events and annotations
+                    st.subheader("Key Events")
+                    st.info("Connect to a data source to view key events that influenced sentiment trends.")
+                    
+                    # Volatility analysis
+                    st.subheader("Sentiment Volatility")
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        # Volatility chart
+                        fig = go.Figure()
+                        fig.update_layout(
+                            title="Sentiment Volatility (No Data)",
+                            xaxis_title="Date",
+                            yaxis_title="Volatility",
+                            height=400,
+                            margin=dict(l=20, r=20, t=40, b=20)
+                        )
+                        st.plotly_chart(fig, use_container_width=True)
+                else:
+                    # Daily sentiment and volatility per country
+                    volatility_df = compute_volatility(historical_df)
+                    key_events = detect_change_points(historical_df)
+                    
+                    fig = create_trend_chart(
+                        volatility_df,
+                        'date',
+                        'country',
+                        'sentiment_score',
+                        selected_countries,
+                        title="Historical Sentiment Trends",
+                        events=key_events
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+                    
+                    # Key events detected as change points
+                    st.subheader("Key Events")
+                    if key_events.empty:
+                        st.info("No significant sentiment shifts detected in the selected period.")
+                    else:
+                        events_table = key_events.copy()
+                        events_table['date'] = pd.to_datetime(events_table['date']).dt.date
+                        events_table.columns = ["Date", "Country", "Detector", "Direction", "Shift"]
+                        st.dataframe(events_table, use_container_width=True)
+                    
+                    # Volatility analysis
+                    st.subheader("Sentiment Volatility")
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        # Volatility chart
+                        volatility_measure = st.radio(
+                            "Volatility Measure",
+                            options=["EWMA", "Rolling Std"],
+                            horizontal=True
+                        )
+                        import plotly.express as px
+                        fig = px.line(
+                            volatility_df,
+                            x='date',
+                            y='ewma_volatility' if volatility_measure == "EWMA" else 'rolling_std',
+                            color='country',
+                            title="Sentiment Volatility"
+                        )
+                        fig.update_layout(
+                            xaxis_title="Date",
+                            yaxis_title="Volatility",
+                            height=400,
+                            margin=dict(l=20, r=20, t=40, b=20),
+                            legend_title="Country"
+                        )
+                        st.plotly_chart(fig, use_container_width=True)
                 
                 with col2:
                     # Volatility summary
@@ -168,13 +239,34 @@ with tab2:
                 
                 # Regional heatmap
                 st.subheader("Regional Sentiment Heatmap")
-                fig = go.Figure()
-                fig.update_layout(
-                    title="Regional Sentiment Heatmap (No Data)",
-                    height=500,
-                    margin=dict(l=20, r=20, t=40, b=20)
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                regional_source = fetch_historical_data(selected_countries, selected_topic, selected_period, selected_data_source)
+                
+                if regional_source is None or regional_source.empty:
+                    fig = go.Figure()
+                    fig.update_layout(
+                        title="Regional Sentiment Heatmap (No Data)",
+                        height=500,
+                        margin=dict(l=20, r=20, t=40, b=20)
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+                else:
+                    # Weekly regional sentiment, weighted by each country's online population
+                    regional_df = regional_aggregates(regional_source, bucket=WEEKLY_BUCKET)
+                    fig = create_sentiment_heatmap(
+                        regional_df,
+                        'date',
+                        'region',
+                        'weighted_mean',
+                        title="Regional Sentiment Heatmap (weighted by online users)"
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+                    
+                    regional_table = regional_df[['date', 'region', 'countries', 'posts', 'weighted_mean', 'lower', 'upper']].copy()
+                    regional_table['date'] = pd.to_datetime(regional_table['date']).dt.date
+                    regional_table.columns = ["Week", "Region", "Countries", "Posts", "Weighted Sentiment", "95% CI Low", "95% CI High"]
+                    st.dataframe(regional_table.round(3), use_container_width=True, hide_index=True)
+                    st.caption("Regional scores weight each country by population x internet penetration, "
+                               "using only the selected countries.")
                 
                 # Comparative insights
                 st.markdown("""
@@ -202,21 +294,63 @@ with tab3:
             try:
                 # Forecast chart
                 st.subheader(f"Sentiment Forecast for the Next {forecast_period} Days")
-                st.info("Connect to a data source to generate sentiment forecasts.")
                 
-                fig = go.Figure()
-                fig.update_layout(
-                    title="Sentiment Forecast (No Data)",
-                    xaxis_title="Date",
-                    yaxis_title="Sentiment Score",
-                    height=500,
-                    margin=dict(l=20, r=20, t=40, b=20)
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                historical_df = fetch_historical_data(selected_countries, selected_topic, selected_period, selected_data_source)
                 
-                # Forecast accuracy
-                st.subheader("Forecast Accuracy")
-                st.info("Forecast accuracy metrics will be available when connected to historical data.")
+                if historical_df is None or historical_df.empty:
+                    st.info("Connect to a data source to generate sentiment forecasts.")
+                    
+                    fig = go.Figure()
+                    fig.update_layout(
+                        title="Sentiment Forecast (No Data)",
+                        xaxis_title="Date",
+                        yaxis_title="Sentiment Score",
+                        height=500,
+                        margin=dict(l=20, r=20, t=40, b=20)
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+                    
+                    # Forecast accuracy
+                    st.subheader("Forecast Accuracy")
+                    st.info("Forecast accuracy metrics will be available when connected to historical data.")
+                else:
+                    forecast_method = forecast_models[selected_forecast_model]
+                    
+                    # Forecast every selected country in one pass
+                    forecast_df = generate_forecast_data(
+                        historical_df,
+                        days=forecast_period,
+                        group_columns=['country'],
+                        method=forecast_method
+                    )
+                    
+                    forecast_country = st.selectbox("Country", options=selected_countries, key="forecast_country")
+                    
+                    # Daily average history for the selected country
+                    country_history = historical_df[historical_df['country'] == forecast_country]
+                    country_history = country_history.groupby(
+                        pd.to_datetime(country_history['date']).dt.normalize()
+                    )['sentiment_score'].mean().reset_index()
+                    
+                    fig = create_forecast_chart(
+                        country_history,
+                        forecast_df[forecast_df['country'] == forecast_country],
+                        'date',
+                        'sentiment_score',
+                        title=f"Sentiment Forecast - {forecast_country}"
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+                    
+                    # Forecast accuracy from a holdout backtest
+                    st.subheader("Forecast Accuracy")
+                    _, _, series_matrix = build_series_matrix(historical_df, group_columns=['country'])
+                    
+                    if series_matrix.shape[1] > 2 * forecast_period:
+                        backtest = backtest_forecast(series_matrix, horizon=forecast_period)
+                        backtest.columns = ["Model", "MAE", "RMSE", "Interval Coverage", "Fit Time (s)", "Fit Time per 1,000 Series (s)"]
+                        st.dataframe(backtest, use_container_width=True)
+                    else:
+                        st.info("Not enough history to backtest the forecast. Select a longer time period.")
                 
                 # Scenario analysis
                 st.subheader("Scenario Analysis")
@@ -242,6 +376,9 @@ export_format = st.sidebar.selectbox(
 if st.sidebar.button("Export Trends"):
     st.sidebar.info("Export functionality will be enabled when connected to data sources.")
 
+# Per-stage timing of this render (when enabled)
+show_debug_panel()
+
 # Footer
 st.markdown("---")
 st.markdown("© 2023 Sentigrade. All rights reserved.")
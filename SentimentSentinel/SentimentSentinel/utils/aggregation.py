@@ -0,0 +1,219 @@
+import numpy as np
+import pandas as pd
+
+def _factorize(series):
+    """
+    Factorize a column into integer codes and sorted unique values.
+    Categorical columns reuse their existing codes.
+
+    Args:
+        series (Series): Column to factorize
+
+    Returns:
+        tuple: (int64 codes with -1 for missing, Index of unique values)
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy().astype(np.int64), series.cat.categories
+
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes.astype(np.int64), pd.Index(uniques)
+
+def _normalize_groupings(groupings):
+    """
+    Normalize groupings to tuples of column names.
+
+    Args:
+        groupings (list): Column names or sequences of column names
+
+    Returns:
+        list: Unique groupings as tuples, in order
+    """
+    normalized = []
+    for grouping in groupings:
+        grouping = (grouping,) if isinstance(grouping, str) else tuple(grouping)
+        if grouping not in normalized:
+            normalized.append(grouping)
+    return normalized
+
+def compute_aggregates(df, value_column, groupings):
+    """
+    Compute size, count, sum and mean of a value for several groupings at once.
+    Key columns are factorized once. The widest groupings are counted with
+    np.bincount over combined codes, and any grouping whose columns are a
+    subset of an already counted one is derived by summing its cells instead
+    of re-reading the rows (unless the extra columns have missing keys).
+
+    Args:
+        df (DataFrame): Data to aggregate
+        value_column (str): Numeric column to aggregate
+        groupings (list): Column names or tuples of column names, e.g.
+            ['query', 'source', ('source', 'query')]
+
+    Returns:
+        dict: Mapping from grouping tuple to a DataFrame with the key columns
+            and 'size' (rows), 'count' (non-missing values), 'sum' and 'mean',
+            one row per observed group
+    """
+    groupings = _normalize_groupings(groupings)
+    columns = list(dict.fromkeys(column for grouping in groupings for column in grouping))
+    factorized = {column: _factorize(df[column]) for column in columns}
+    has_missing = {column: bool((codes < 0).any()) for column, (codes, _) in factorized.items()}
+
+    values = df[value_column].to_numpy(dtype=np.float64)
+    has_value = ~np.isnan(values)
+    filled = np.where(has_value, values, 0.0)
+
+    # Dense (size, count, sum) cell arrays per grouping, one axis per key column
+    cells = {}
+    for grouping in sorted(groupings, key=len, reverse=True):
+        # A wider grouping can only be summed down if its extra columns dropped no rows
+        superset = next((
+            g for g in cells
+            if set(grouping) <= set(g) and not any(has_missing[c] for c in g if c not in grouping)
+        ), None)
+
+        if superset is not None:
+            # Marginalize the wider grouping's cells
+            axes = tuple(i for i, column in enumerate(superset) if column not in grouping)
+            order = [column for column in superset if column in grouping]
+            permutation = [order.index(column) for column in grouping]
+            cells[grouping] = tuple(
+                np.transpose(array.sum(axis=axes), permutation) for array in cells[superset]
+            )
+            continue
+
+        shape = tuple(len(factorized[column][1]) for column in grouping)
+        codes = [factorized[column][0] for column in grouping]
+
+        # Rows with a missing key are left out, as in groupby
+        valid = np.logical_and.reduce([c >= 0 for c in codes])
+        flat = np.ravel_multi_index([c[valid] for c in codes], shape)
+        length = int(np.prod(shape))
+
+        cells[grouping] = (
+            np.bincount(flat, minlength=length).reshape(shape),
+            np.bincount(flat, weights=has_value[valid], minlength=length).reshape(shape),
+            np.bincount(flat, weights=filled[valid], minlength=length).reshape(shape)
+        )
+
+    results = {}
+    for grouping in groupings:
+        size, count, total = cells[grouping]
+        observed = np.nonzero(size)
+
+        result = pd.DataFrame({
+            column: factorized[column][1].take(index).to_numpy()
+            for column, index in zip(grouping, observed)
+        })
+        result['size'] = size[observed].astype(np.int64)
+        result['count'] = count[observed].astype(np.int64)
+        result['sum'] = total[observed]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result['mean'] = total[observed] / count[observed]
+        results[grouping] = result
+
+    return results
+
+def get_aggregate(df, value_column, grouping, aggregates=None):
+    """
+    Get one grouping's aggregates, reusing precomputed results when available.
+
+    Args:
+        df (DataFrame): Data to aggregate
+        value_column (str): Numeric column to aggregate
+        grouping (str or tuple): Column name or tuple of column names
+        aggregates (dict): Optional results from compute_aggregates
+
+    Returns:
+        DataFrame: Aggregates for the grouping
+    """
+    grouping = _normalize_groupings([grouping])[0]
+    if aggregates is not None and grouping in aggregates:
+        return aggregates[grouping]
+    return compute_aggregates(df, value_column, [grouping])[grouping]
+
+def aggregate_matrix(aggregate, row_column, column_column, statistic='mean', fill_value=np.nan):
+    """
+    Pivot a two-column aggregate into a matrix.
+
+    Args:
+        aggregate (DataFrame): Aggregates for (row_column, column_column)
+        row_column (str): Key column used for rows
+        column_column (str): Key column used for columns
+        statistic (str): 'size', 'count', 'sum' or 'mean'
+        fill_value: Value for unobserved cells
+
+    Returns:
+        DataFrame: Matrix with sorted row and column labels
+    """
+    rows, row_codes = np.unique(aggregate[row_column].to_numpy(), return_inverse=True)
+    columns, column_codes = np.unique(aggregate[column_column].to_numpy(), return_inverse=True)
+
+    matrix = np.full((len(rows), len(columns)), fill_value, dtype=np.float64)
+    matrix[row_codes, column_codes] = aggregate[statistic].to_numpy()
+
+    return pd.DataFrame(
+        matrix,
+        index=pd.Index(rows, name=row_column),
+        columns=pd.Index(columns, name=column_column)
+    )
+
+def empty_aggregates(groupings):
+    """
+    Create aggregates with no groups, to be filled by update_aggregates.
+
+    Args:
+        groupings (list): Column names or tuples of column names
+
+    Returns:
+        dict: Mapping from grouping tuple to an empty aggregate DataFrame
+    """
+    return {
+        grouping: pd.DataFrame({
+            **{column: pd.Series(dtype=object) for column in grouping},
+            'size': pd.Series(dtype=np.int64),
+            'count': pd.Series(dtype=np.int64),
+            'sum': pd.Series(dtype=np.float64),
+            'mean': pd.Series(dtype=np.float64)
+        })
+        for grouping in _normalize_groupings(groupings)
+    }
+
+def update_aggregates(aggregates, value_column, removed=None, added=None):
+    """
+    Update precomputed aggregates for changed rows without re-reading the
+    unchanged ones: the old versions of the rows are subtracted and the new
+    versions added. Groups left with no rows are dropped.
+
+    Args:
+        aggregates (dict): Results from compute_aggregates, or empty_aggregates
+            to build them up from added rows
+        value_column (str): Numeric column that was aggregated
+        removed (DataFrame): Rows as they were counted before
+        added (DataFrame): Rows as they should be counted now
+
+    Returns:
+        dict: Updated aggregates, one DataFrame per grouping
+    """
+    groupings = list(aggregates)
+    updated = {}
+    for grouping in groupings:
+        keys = list(grouping)
+        parts = [aggregates[grouping][keys + ['size', 'count', 'sum']]]
+        for rows, sign in ((removed, -1), (added, 1)):
+            if rows is None or rows.empty:
+                continue
+            delta = compute_aggregates(rows, value_column, [grouping])[grouping]
+            delta[['size', 'count', 'sum']] = delta[['size', 'count', 'sum']] * sign
+            parts.append(delta[keys + ['size', 'count', 'sum']])
+
+        # Object keys so categorical and plain columns combine
+        combined = pd.concat([part.astype({key: object for key in keys}) for part in parts], ignore_index=True)
+        result = combined.groupby(keys, sort=True).sum().reset_index()
+        result = result[result['size'] > 0].reset_index(drop=True)
+        result[['size', 'count']] = result[['size', 'count']].astype(np.int64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result['mean'] = result['sum'] / result['count']
+        updated[grouping] = result
+
+    return updated
@@ -0,0 +1,543 @@
+"""
+Headless batch scorer for offline backfills.
+
+Reads CSV, JSONL or Parquet from a file or stdin, scores it in chunks over
+several processes and appends each scored chunk to the output as soon as
+it is ready. A checkpoint is written after every chunk so an interrupted
+run can continue with --resume. Progress (docs/sec and ETA) is printed to
+stderr.
+
+Usage:
+    python -m utils.batch_scorer archive.csv -o scored.csv --workers 8
+    python -m utils.batch_scorer archive.csv -o scored.csv --resume
+    cat posts.jsonl | python -m utils.batch_scorer - --input-format jsonl -o scored.jsonl
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from utils.scoring import score_batch, score_batch_gemini
+
+# Supported input and output formats
+BATCH_FORMATS = ["csv", "jsonl", "parquet"]
+
+# Rows scored per task; a checkpoint is written after each chunk
+BATCH_CHUNK_SIZE = 2000
+
+# Columns joined into the scored text when no 'text' column exists
+FALLBACK_TEXT_COLUMNS = ["title", "snippet", "content"]
+
+# Chunks queued per worker so workers stay busy while output is written in order
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+# Minimum seconds between progress lines
+PROGRESS_INTERVAL = 1.0
+
+def infer_format(path, format=None):
+    """
+    Work out a file's format from an explicit choice or its extension.
+
+    Args:
+        path (str): File path ('-' for stdin/stdout)
+        format (str): Explicit format, if given
+
+    Returns:
+        str: 'csv', 'jsonl' or 'parquet'
+    """
+    if format:
+        if format not in BATCH_FORMATS:
+            raise ValueError(f"Unsupported format: {format}")
+        return format
+
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    if extension in ("parquet", "pq"):
+        return "parquet"
+    if extension == "csv":
+        return "csv"
+    raise ValueError(f"Cannot infer the format of '{path}'; pass it explicitly")
+
+def iter_input_chunks(path, format, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Read an input file (or stdin) in row chunks.
+
+    Args:
+        path (str): Input path, or '-' for stdin
+        format (str): 'csv', 'jsonl' or 'parquet'
+        chunk_size (int): Rows per chunk
+
+    Yields:
+        DataFrame: Consecutive row chunks
+    """
+    source = sys.stdin.buffer if path == "-" else path
+
+    if format == "csv":
+        # Round-trip parsing so rewritten stores keep their scores bit for bit
+        yield from pd.read_csv(source, chunksize=chunk_size, float_precision="round_trip")
+    elif format == "jsonl":
+        # Leave values as they are; the scorer only adds columns
+        yield from pd.read_json(source, lines=True, chunksize=chunk_size, dtype=False, convert_dates=False)
+    else:
+        import pyarrow.parquet as pq
+
+        # Parquet needs a seekable file
+        if path == "-":
+            source = io.BytesIO(sys.stdin.buffer.read())
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+
+def count_input_rows(path, format):
+    """
+    Count input rows for the ETA.
+    Parquet counts come from the file metadata; CSV and JSONL counts are
+    line counts, so CSV fields containing newlines make them an overestimate.
+
+    Args:
+        path (str): Input path, or '-' for stdin
+        format (str): 'csv', 'jsonl' or 'parquet'
+
+    Returns:
+        int: Row count, or None if it can't be known up front (stdin)
+    """
+    if path == "-":
+        return None
+
+    if format == "parquet":
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows
+
+    lines = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    # Count a final line without a trailing newline
+    if last != b"\n":
+        lines += 1
+    return max(0, lines - 1) if format == "csv" else lines
+
+def resolve_text_columns(columns, text_columns=None):
+    """
+    Pick the columns that make up the scored text.
+
+    Args:
+        columns (list): Input column names
+        text_columns (list): Explicit columns, if given
+
+    Returns:
+        list: Columns joined (in order) into each row's text
+    """
+    if text_columns:
+        missing = [c for c in text_columns if c not in columns]
+        if missing:
+            raise ValueError(f"Text columns not found in input: {', '.join(missing)}")
+        return list(text_columns)
+
+    if "text" in columns:
+        return ["text"]
+
+    fallback = [c for c in FALLBACK_TEXT_COLUMNS if c in columns]
+    if not fallback:
+        raise ValueError("Input needs a 'text' column (or title/snippet/content); use --text-column")
+    return fallback
+
+def join_text_columns(df, text_columns):
+    """
+    Join each row's text columns into the text that gets scored.
+
+    Args:
+        df (DataFrame): Input rows
+        text_columns (list): Columns joined (in order), skipping missing values
+
+    Returns:
+        list: One text per row
+    """
+    parts = df[text_columns].astype(object).where(df[text_columns].notna(), "").astype(str)
+    texts = parts.iloc[:, 0]
+    for column in parts.columns[1:]:
+        part = parts[column]
+        # Add the separator only between two non-empty parts, so the texts' own periods stay
+        texts = texts.str.cat(part, sep=". ").where((texts != "") & (part != ""), texts + part)
+    return texts.tolist()
+
+def score_frame(df, text_columns, language_column="language", gemini_api_key=None):
+    """
+    Score one chunk: detect languages where missing, score and categorize.
+
+    Args:
+        df (DataFrame): Input rows
+        text_columns (list): Columns joined into each row's text
+        language_column (str): Column with language codes (detected when absent or empty)
+        gemini_api_key (str): Score with Gemini using this key instead of the local analyzer
+
+    Returns:
+        DataFrame: Input rows with language, 'sentiment_score', 'sentiment_category',
+            'scorer_version' and 'text_hash' columns
+    """
+    texts = join_text_columns(df, text_columns)
+
+    languages = None
+    if language_column in df.columns:
+        values = df[language_column].astype(object)
+        languages = values.where(values.notna() & (values != ""), None).tolist()
+
+    if gemini_api_key:
+        results = score_batch_gemini(texts, gemini_api_key)
+    else:
+        results = score_batch(texts, languages)
+
+    df = df.copy()
+    df[language_column] = [result["language"] for result in results]
+    df["sentiment_score"] = [result["score"] for result in results]
+    df["sentiment_category"] = [result["category"] for result in results]
+    df["scorer_version"] = [result["scorer_version"] for result in results]
+    df["text_hash"] = [result["text_hash"] for result in results]
+    return df
+
+def _score_chunk(task):
+    """
+    Worker entry point for score_frame.
+
+    Args:
+        task (tuple): (df, text_columns, language_column, gemini_api_key)
+
+    Returns:
+        DataFrame: Scored rows
+    """
+    return score_frame(*task)
+
+class _OutputWriter:
+    """
+    Append scored chunks to the output and report a resumable position.
+    CSV and JSONL are appended to one file (the position is its size in
+    bytes); Parquet is written as a directory of one part file per chunk,
+    all with the schema of the first part so the directory reads as one
+    dataset.
+    """
+
+    def __init__(self, path, format, position=0):
+        """
+        Args:
+            path (str): Output file (or directory for Parquet)
+            format (str): 'csv', 'jsonl' or 'parquet'
+            position (int): Checkpointed position to continue from (0 starts over)
+        """
+        self.path = path
+        self.format = format
+        self.position = position
+        self._schema = None
+
+        if format == "parquet":
+            os.makedirs(path, exist_ok=True)
+            if position == 0:
+                for name in os.listdir(path):
+                    if name.startswith("part-") and name.endswith(".parquet"):
+                        os.remove(os.path.join(path, name))
+            else:
+                import pyarrow.parquet as pq
+
+                # A resumed run keeps the schema of the parts already written
+                first_part = os.path.join(path, f"part-{0:06d}.parquet")
+                if os.path.exists(first_part):
+                    self._schema = pq.read_schema(first_part)
+            self._file = None
+        else:
+            # Drop anything written after the checkpoint (a partly written chunk)
+            mode = "r+b" if position and os.path.exists(path) else "wb"
+            self._file = open(path, mode)
+            self._file.truncate(position)
+            self._file.seek(position)
+
+    def _parquet_table(self, df, index):
+        """
+        Convert a scored chunk to an Arrow table with the output's schema.
+        The first chunk fixes the schema; later chunks are cast to it, since
+        pandas infers types per chunk (an integer column with a missing value
+        becomes float, an empty column becomes float or null).
+
+        Args:
+            df (DataFrame): Scored rows
+            index (int): Chunk number (for error messages)
+
+        Returns:
+            pyarrow.Table: Rows in the output schema
+        """
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._schema is None:
+            # Columns with no values in the first chunk have no real type yet; store them as strings
+            schema = table.schema
+            for i, column in enumerate(table.columns):
+                if len(column) and column.null_count == len(column):
+                    schema = schema.set(i, pa.field(schema.field(i).name, pa.large_string()))
+            self._schema = schema
+
+        extra = [name for name in table.column_names if name not in self._schema.names]
+        if extra:
+            raise ValueError(f"Chunk {index} has columns missing from the first chunk: {', '.join(extra)}")
+
+        columns = {
+            field.name: (table.column(field.name) if field.name in table.column_names
+                         else pa.nulls(len(table), field.type))
+            for field in self._schema
+        }
+        try:
+            return pa.table(columns).cast(self._schema)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            raise ValueError(f"Chunk {index} does not fit the Parquet schema of the first chunk: {e}") from e
+
+    def write(self, df, index):
+        """
+        Write one scored chunk and make it durable.
+
+        Args:
+            df (DataFrame): Scored rows
+            index (int): Chunk number (names the Parquet part file)
+
+        Returns:
+            int: New position
+        """
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+
+            part = os.path.join(self.path, f"part-{index:06d}.parquet")
+            pq.write_table(self._parquet_table(df, index), part + ".tmp")
+            os.replace(part + ".tmp", part)
+            self.position = index + 1
+            return self.position
+
+        if self.format == "csv":
+            data = df.to_csv(index=False, header=self.position == 0)
+        else:
+            data = df.to_json(orient="records", lines=True, date_format="iso", force_ascii=False)
+            if data and not data.endswith("\n"):
+                data += "\n"
+
+        self._file.write(data.encode("utf-8"))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.position = self._file.tell()
+        return self.position
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+def load_checkpoint(path):
+    """
+    Read a checkpoint file.
+
+    Args:
+        path (str): Checkpoint path
+
+    Returns:
+        dict: Checkpoint contents, or None if there is no checkpoint
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_checkpoint(path, checkpoint):
+    """
+    Write a checkpoint atomically so a crash never leaves a partial file.
+
+    Args:
+        path (str): Checkpoint path
+        checkpoint (dict): Checkpoint contents
+    """
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+def format_duration(seconds):
+    """
+    Format seconds as H:MM:SS.
+
+    Args:
+        seconds (float): Duration in seconds
+
+    Returns:
+        str: Formatted duration
+    """
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+def _print_progress(rows_done, rows_scored, total, elapsed, stream):
+    """
+    Print one progress line.
+
+    Args:
+        rows_done (int): Rows written so far, including earlier runs
+        rows_scored (int): Rows scored by this run
+        total (int): Expected total rows, or None
+        elapsed (float): Seconds since this run started
+        stream (file): Where to print
+    """
+    rate = rows_scored / elapsed if elapsed > 0 else 0.0
+    line = f"{rows_done:,} rows"
+    if total:
+        line = f"{rows_done:,}/{total:,} rows ({min(rows_done / total, 1.0):.1%})"
+    line += f"  {rate:,.0f} docs/s"
+    if total and rate > 0:
+        line += f"  ETA {format_duration(max(total - rows_done, 0) / rate)}"
+    print(line, file=stream, flush=True)
+
+def score_file(input_path, output_path, input_format=None, output_format=None, text_columns=None,
+               language_column="language", workers=None, chunk_size=BATCH_CHUNK_SIZE, resume=False,
+               checkpoint_path=None, gemini_api_key=None, total=None, progress_stream=sys.stderr):
+    """
+    Score an input file in parallel chunks, writing output and a checkpoint after each chunk.
+
+    Args:
+        input_path (str): Input path, or '-' for stdin
+        output_path (str): Output file (a directory for Parquet output)
+        input_format (str): Input format (inferred from the extension if None)
+        output_format (str): Output format (inferred from the extension if None)
+        text_columns (list): Columns joined into the scored text (default: 'text',
+            else title/snippet/content)
+        language_column (str): Column with language codes (detected when absent or empty)
+        workers (int): Scoring processes (default: CPU count; 1 scores in this process)
+        chunk_size (int): Rows per chunk
+        resume (bool): Continue from the checkpoint if one exists
+        checkpoint_path (str): Checkpoint path (default: output path + '.checkpoint.json')
+        gemini_api_key (str): Score with Gemini using this key instead of the local analyzer
+        total (int): Expected row count for the ETA (counted from the input if None)
+        progress_stream (file): Where to print progress (None disables it)
+
+    Returns:
+        dict: Rows written, rows scored by this run, chunks, elapsed seconds and docs/sec
+    """
+    input_format = infer_format(input_path, input_format)
+    output_format = infer_format(output_path, output_format)
+    checkpoint_path = checkpoint_path or output_path.rstrip("/\\") + ".checkpoint.json"
+    workers = max(1, workers or os.cpu_count() or 1)
+
+    checkpoint = load_checkpoint(checkpoint_path) if resume else None
+    if checkpoint is not None:
+        if checkpoint["output_format"] != output_format:
+            raise ValueError("Checkpoint was written for a different output format")
+        # Chunk boundaries must match the checkpoint to skip finished chunks
+        chunk_size = checkpoint["chunk_size"]
+    else:
+        checkpoint = {
+            "input": input_path, "output": output_path, "output_format": output_format,
+            "chunk_size": chunk_size, "chunks_done": 0, "rows_done": 0, "position": 0, "complete": False
+        }
+
+    if checkpoint["complete"]:
+        return {"rows": checkpoint["rows_done"], "rows_scored": 0, "chunks": checkpoint["chunks_done"],
+                "elapsed_s": 0.0, "docs_per_s": 0.0}
+
+    if total is None:
+        total = count_input_rows(input_path, input_format)
+
+    writer = _OutputWriter(output_path, output_format, checkpoint["position"])
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    pending = deque()
+    start = time.perf_counter()
+    last_progress = 0.0
+    rows_scored = 0
+    resolved_columns = None
+
+    def finish_chunk():
+        nonlocal rows_scored, last_progress
+        index, future = pending.popleft()
+        scored = future.result() if executor is not None else future
+        checkpoint["position"] = writer.write(scored, index)
+        checkpoint["chunks_done"] = index + 1
+        checkpoint["rows_done"] += len(scored)
+        save_checkpoint(checkpoint_path, checkpoint)
+        rows_scored += len(scored)
+
+        now = time.perf_counter()
+        if progress_stream is not None and now - last_progress >= PROGRESS_INTERVAL:
+            _print_progress(checkpoint["rows_done"], rows_scored, total, now - start, progress_stream)
+            last_progress = now
+
+    try:
+        for index, chunk in enumerate(iter_input_chunks(input_path, input_format, chunk_size)):
+            # Skip chunks finished by an earlier run
+            if index < checkpoint["chunks_done"]:
+                continue
+
+            if resolved_columns is None:
+                resolved_columns = resolve_text_columns(list(chunk.columns), text_columns)
+
+            task = (chunk, resolved_columns, language_column, gemini_api_key)
+            if executor is None:
+                pending.append((index, _score_chunk(task)))
+                finish_chunk()
+                continue
+
+            # Write finished chunks in order while keeping every worker busy
+            pending.append((index, executor.submit(_score_chunk, task)))
+            while len(pending) > workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                finish_chunk()
+
+        while pending:
+            finish_chunk()
+
+        checkpoint["complete"] = True
+        save_checkpoint(checkpoint_path, checkpoint)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    if progress_stream is not None:
+        _print_progress(checkpoint["rows_done"], rows_scored, total, elapsed, progress_stream)
+
+    return {
+        "rows": checkpoint["rows_done"],
+        "rows_scored": rows_scored,
+        "chunks": checkpoint["chunks_done"],
+        "elapsed_s": round(elapsed, 2),
+        "docs_per_s": round(rows_scored / elapsed, 1) if elapsed > 0 else 0.0
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score CSV, JSONL or Parquet data without the Streamlit UI")
+    parser.add_argument("input", help="Input file, or '-' for stdin")
+    parser.add_argument("-o", "--output", required=True, help="Output file (a directory for Parquet)")
+    parser.add_argument("--input-format", choices=BATCH_FORMATS, default=None)
+    parser.add_argument("--output-format", choices=BATCH_FORMATS, default=None)
+    parser.add_argument("--text-column", action="append", dest="text_columns", default=None,
+                        help="Column to score (repeat to join several)")
+    parser.add_argument("--language-column", default="language")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK_SIZE)
+    parser.add_argument("--resume", action="store_true", help="Continue from the checkpoint")
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--gemini", action="store_true", help="Score with Gemini (reads GEMINI_API_KEY)")
+    parser.add_argument("--total", type=int, default=None, help="Expected row count for the ETA")
+    args = parser.parse_args()
+
+    gemini_api_key = None
+    if args.gemini:
+        gemini_api_key = os.environ.get("GEMINI_API_KEY")
+        if not gemini_api_key:
+            parser.error("--gemini needs GEMINI_API_KEY to be set")
+
+    try:
+        summary = score_file(
+            args.input, args.output, args.input_format, args.output_format, args.text_columns,
+            args.language_column, args.workers, args.chunk_size, args.resume, args.checkpoint,
+            gemini_api_key, args.total
+        )
+    except KeyboardInterrupt:
+        print("Interrupted; rerun with --resume to continue", file=sys.stderr)
+        sys.exit(130)
+
+    print(json.dumps(summary), file=sys.stderr)
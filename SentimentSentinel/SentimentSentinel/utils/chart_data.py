@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+def is_time_sorted(df, date_column):
+    """
+    Check whether a DataFrame already has a datetime date column in ascending
+    order, with any undated (NaT) rows at the end.
+
+    Args:
+        df (DataFrame): Data to check
+        date_column (str): Column containing dates
+
+    Returns:
+        bool: True if the column is datetime and sorted
+    """
+    dates = df[date_column]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        return False
+    if dates.is_monotonic_increasing:
+        return True
+
+    missing = dates.isna().to_numpy()
+    dated = len(missing) - int(missing.sum())
+    return not missing[:dated].any() and dates.iloc[:dated].is_monotonic_increasing
+
+def sort_by_time(df, date_column):
+    """
+    Order rows by a datetime column, keeping undated rows at the end.
+    Used at ingest so prepare_time_frame finds frames already sorted.
+
+    Args:
+        df (DataFrame): Data with a datetime date column
+        date_column (str): Column containing dates
+
+    Returns:
+        DataFrame: The same frame if already sorted, otherwise a sorted copy
+    """
+    if df is None or df.empty or is_time_sorted(df, date_column):
+        return df
+
+    # numpy sorts NaT last; a stable sort keeps same-day rows in arrival order
+    order = np.argsort(df[date_column].to_numpy(), kind='stable')
+    return df.take(order)
+
+def prepare_time_frame(df, date_column):
+    """
+    Prepare data for time-based charts: datetime dates sorted ascending.
+    Frames that are already sorted (apply_compact_schema sorts at ingest)
+    are returned as-is, or as a row slice without their trailing undated
+    rows, so every chart call on ingested data is free. The caller's frame
+    is never modified.
+
+    Args:
+        df (DataFrame): Data to prepare
+        date_column (str): Column containing dates
+
+    Returns:
+        DataFrame: The same frame (or a slice of it) if already sorted, otherwise a sorted copy
+    """
+    if df is None or df.empty:
+        return df
+    if is_time_sorted(df, date_column):
+        dated = int(df[date_column].notna().sum())
+        return df if dated == len(df) else df.iloc[:dated]
+
+    dates = df[date_column]
+    converted = not pd.api.types.is_datetime64_any_dtype(dates)
+    if converted:
+        dates = pd.to_datetime(dates, errors='coerce')
+
+    # Undated rows sort last and are dropped since they can't be plotted
+    values = dates.to_numpy()
+    order = np.argsort(values, kind='stable')
+    order = order[:len(order) - int(np.isnat(values).sum())]
+
+    # One gather builds the sorted frame; a shallow copy detaches it for the date column swap
+    prepared = df.iloc[order].copy(deep=False)
+    if converted:
+        prepared[date_column] = values[order]
+    return prepared
+
+def slice_time_range(df, date_column, start=None, end=None):
+    """
+    Slice a prepared frame to a date range without a boolean-mask copy.
+
+    Args:
+        df (DataFrame): Frame prepared with prepare_time_frame
+        date_column (str): Column containing dates
+        start: Inclusive start date (None for no lower bound)
+        end: Inclusive end date (None for no upper bound)
+
+    Returns:
+        DataFrame: Positional slice of the frame
+    """
+    dates = df[date_column].to_numpy()
+    first = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side='left')
+    last = len(df) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), side='right')
+    return df.iloc[first:last]
+
+def group_positions(df, group_column, groups=None):
+    """
+    Get the row positions of each series, optionally limited to some groups.
+    Positions keep the frame's order, so series of a time-sorted frame stay sorted.
+
+    Args:
+        df (DataFrame): Data
+        group_column (str): Column identifying each series
+        groups (list): Groups to keep (None keeps all)
+
+    Returns:
+        dict: Mapping from group value to an array of row positions
+    """
+    positions = df.groupby(group_column, observed=True, sort=False).indices
+    if groups is not None:
+        wanted = set(groups)
+        positions = {name: rows for name, rows in positions.items() if name in wanted}
+    return positions
@@ -1,9 +1,18 @@
 import pandas as pd
 import datetime
+import io
+import importlib.util
 import os
 import json
 import random
-from utils.sentiment_analyzer import analyze_sentiment, categorize_sentiment
+import tempfile
+import zlib
+from utils.sentiment_analyzer import categorize_sentiment_array
+from utils.schema import apply_compact_schema
+from utils.forecasting import forecast_series
+from utils.trending import extract_tag_columns
+from utils.scoring_client import score_texts
+from utils.instrumentation import timed
 
 def fetch_social_media_data(platforms, topics, countries, languages, volume=1000):
     """
@@ -66,6 +75,7 @@ def fetch_historical_data(countries, topic, time_period, data_source):
     # A real implementation would return actual data
     return None
 
+@timed("data.process_sentiment")
 def process_sentiment_data(df, language_column='language'):
     """
     Process data and add sentiment scores.
@@ -89,46 +99,424 @@ def process_sentiment_data(df, language_column='language'):
         df['language'] = 'en'
         language_column = 'language'
         
-    # Apply sentiment analysis
-    df['sentiment_score'] = df.apply(
-        lambda row: analyze_sentiment(row['text'], row[language_column]), 
-        axis=1
-    )
+    # Keep hashtags and mentions before scoring cleans them out of the text
+    df['hashtags'], df['mentions'] = extract_tag_columns(df['text'])
+    
+    # Apply sentiment analysis (on the scoring server when one is configured)
+    results = score_texts(df['text'].astype(object).tolist(), df[language_column].astype(object).tolist())
+    df['sentiment_score'] = [result['score'] for result in results]
+    # Scorer version and text hash let a maintenance job re-score only stale rows
+    df['scorer_version'] = [result['scorer_version'] for result in results]
+    df['text_hash'] = [result['text_hash'] for result in results]
     
     # Add sentiment category
-    df['sentiment'] = df['sentiment_score'].apply(categorize_sentiment)
+    df['sentiment'] = categorize_sentiment_array(df['sentiment_score'])
     
-    return df
+    # Cast to the memory-compact schema
+    return apply_compact_schema(df)
 
-def generate_forecast_data(historical_df, days=7):
+def generate_forecast_data(historical_df, days=7, date_column='date', sentiment_column='sentiment_score',
+                           group_columns=None, method='holt_winters'):
     """
     Generate forecast data based on historical trends.
-    This is a placeholder - a real implementation would use actual forecasting models.
+    Every country/topic series is fitted at once; fitted models are cached
+    and advanced incrementally as new days arrive.
     
     Args:
         historical_df (DataFrame): DataFrame containing historical data
         days (int): Number of days to forecast
+        date_column (str): Column containing dates
+        sentiment_column (str): Column containing sentiment scores
+        group_columns (list): Columns identifying each series (defaults to
+            whichever of 'country' and 'topic' are present)
+        method (str): Forecasting method ('holt_winters' or 'ar')
         
     Returns:
-        DataFrame: DataFrame containing forecast data
+        DataFrame: DataFrame containing forecast data with 'lower' and 'upper'
+            prediction interval columns, or None if no history is available
     """
     if historical_df is None or historical_df.empty:
         return None
         
-    # In a real implementation, this would use time series forecasting models
-    # This is a placeholder that would be replaced with actual forecasting logic
+    if group_columns is None:
+        group_columns = [c for c in ['country', 'topic'] if c in historical_df.columns]
+        
+    return forecast_series(
+        historical_df,
+        days=days,
+        date_column=date_column,
+        value_column=sentiment_column,
+        group_columns=group_columns,
+        method=method
+    )
+
+# Export formats: file extension and MIME type
+EXPORT_FORMATS = {
+    'csv': ('.csv', 'text/csv'),
+    'json': ('.json', 'application/json'),
+    'jsonl': ('.jsonl', 'application/x-ndjson'),
+    'parquet': ('.parquet', 'application/vnd.apache.parquet'),
+    'feather': ('.feather', 'application/vnd.apache.arrow.file'),
+    'excel': ('.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'pdf': ('.pdf', 'application/pdf')
+}
+
+# Stream compression: file suffix and MIME type
+EXPORT_COMPRESSIONS = {
+    'gzip': ('.gz', 'application/gzip'),
+    'zstd': ('.zst', 'application/zstd')
+}
+
+# Formats that are compressed internally or not worth compressing as a stream
+NATIVELY_PACKED_FORMATS = {'parquet', 'feather', 'excel', 'pdf'}
+
+# Label columns dictionary-encoded in Parquet and Arrow exports
+DICTIONARY_COLUMNS = ['source', 'country', 'sentiment', 'sentiment_category', 'query', 'language']
+
+# Rows written per chunk when streaming
+EXPORT_CHUNK_SIZE = 50000
+
+# In-memory export buffers spill to a temporary file above this size
+EXPORT_SPOOL_LIMIT = 32 * 1024 * 1024
+
+class _ChunkSink:
+    """
+    Append-only file-like sink that hands written bytes back in chunks.
+    Used to stream writers (such as pyarrow's) that expect a file object.
+    """
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+def _iter_frame_chunks(data, chunk_size):
+    """
+    Iterate over row slices of a DataFrame.
+
+    Args:
+        data (DataFrame): Data to slice
+        chunk_size (int): Rows per slice
+
+    Yields:
+        DataFrame: Consecutive row slices
+    """
+    for start in range(0, len(data), chunk_size):
+        yield data.iloc[start:start + chunk_size]
+
+def _to_arrow_table(data):
+    """
+    Convert a DataFrame to a pyarrow Table in a single pass.
+    Numeric, categorical and pyarrow-backed string columns are wrapped
+    without copying; label columns are dictionary-encoded.
+
+    Args:
+        data (DataFrame): Data to convert
+
+    Returns:
+        pyarrow.Table: Converted table
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(data, preserve_index=False)
+
+    # Categoricals already arrive as dictionaries; encode any plain label columns
+    for column in DICTIONARY_COLUMNS:
+        if column in table.column_names:
+            index = table.schema.get_field_index(column)
+            if not pa.types.is_dictionary(table.schema.field(index).type):
+                table = table.set_column(index, column, table.column(index).dictionary_encode())
+
+    return table
+
+def _iter_parquet_chunks(data, chunk_size, compression=None):
+    """
+    Stream a DataFrame as Parquet, one row group per chunk.
+
+    Args:
+        data (DataFrame): Data to export
+        chunk_size (int): Rows per row group
+        compression (str): Parquet codec (gzip, zstd) or None for snappy
+
+    Yields:
+        bytes: Encoded Parquet bytes
+    """
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    table = _to_arrow_table(data)
+    dictionary_columns = [c for c in DICTIONARY_COLUMNS if c in table.column_names]
+
+    with pq.ParquetWriter(sink, table.schema, compression=compression or 'snappy',
+                          use_dictionary=dictionary_columns or False) as writer:
+        for batch in table.to_batches(max_chunksize=chunk_size):
+            writer.write_batch(batch)
+            yield sink.drain()
+
+    # Footer is written when the writer closes
+    yield sink.drain()
+
+def _iter_feather_chunks(data, chunk_size, compression=None):
+    """
+    Stream a DataFrame as an Arrow IPC file (Feather v2), one record batch per chunk.
+
+    Args:
+        data (DataFrame): Data to export
+        chunk_size (int): Rows per record batch
+        compression (str): IPC buffer codec (zstd) or None. gzip is not an
+            IPC codec and falls back to lz4.
+
+    Yields:
+        bytes: Encoded Arrow IPC bytes
+    """
+    import pyarrow as pa
+
+    sink = _ChunkSink()
+    table = _to_arrow_table(data)
+
+    codec = None
+    if compression:
+        codec = 'zstd' if compression == 'zstd' else 'lz4'
+    options = pa.ipc.IpcWriteOptions(compression=codec)
+
+    with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        for batch in table.to_batches(max_chunksize=chunk_size):
+            writer.write_batch(batch)
+            yield sink.drain()
+
+    # Footer is written when the writer closes
+    yield sink.drain()
+
+def _get_compressor(compression):
+    """
+    Get a streaming compressor object.
+
+    Args:
+        compression (str): Compression name (gzip, zstd) or None
+
+    Returns:
+        object: Object with compress() and flush() methods, or None
+    """
+    if not compression:
+        return None
+
+    if compression == 'gzip':
+        # wbits=31 writes a gzip header and trailer
+        return zlib.compressobj(wbits=31)
+
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+        return zstandard.ZstdCompressor().compressobj()
+
+    raise ValueError(f"Unsupported compression: {compression}")
+
+def available_compressions(format='csv'):
+    """
+    List the compressions that can be used for an export format.
+    zstd streams need the optional 'zstandard' package; Parquet and Feather
+    use pyarrow's own codecs, so zstd is always available for them.
+
+    Args:
+        format (str): Export format (csv, json, jsonl, parquet, feather, excel, pdf)
+
+    Returns:
+        list: Compression names usable with the format
+    """
+    compressions = ['gzip']
+    if format in NATIVELY_PACKED_FORMATS or importlib.util.find_spec('zstandard') is not None:
+        compressions.append('zstd')
+    return compressions
+
+def iter_export_chunks(data, format='csv', compression=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Stream data in an export format, chunk by chunk.
+    Only one chunk of rows is encoded at a time, so the full export is never
+    held in memory as a single string.
     
-    # Return None to indicate forecasting requires historical data
-    return None
+    Args:
+        data (DataFrame): Data to export
+        format (str): Export format (csv, json, jsonl, parquet, feather, excel, pdf)
+        compression (str): Stream compression (gzip, zstd) or None. Parquet
+            and Feather use it as their internal codec; Excel and PDF ignore it.
+        chunk_size (int): Rows encoded per chunk
+        
+    Yields:
+        bytes: Encoded (and optionally compressed) export bytes
+    """
+    format = format.lower()
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {format}")
+
+    if format == 'csv':
+        chunks = (
+            chunk.to_csv(index=False, header=(i == 0)).encode('utf-8')
+            for i, chunk in enumerate(_iter_frame_chunks(data, chunk_size))
+        )
+    elif format == 'json':
+        chunks = _iter_json_array_chunks(data, chunk_size)
+    elif format == 'jsonl':
+        chunks = _iter_jsonl_chunks(data, chunk_size)
+    elif format == 'parquet':
+        chunks = _iter_parquet_chunks(data, chunk_size, compression)
+    elif format == 'feather':
+        chunks = _iter_feather_chunks(data, chunk_size, compression)
+    elif format == 'excel':
+        # Excel workbooks can't be streamed; written in one pass
+        buffer = io.BytesIO()
+        data.to_excel(buffer, index=False)
+        chunks = [buffer.getvalue()]
+    else:
+        from utils.pdf_report import create_pdf_report
+        chunks = [create_pdf_report(data)]
+
+    compressor = None
+    if format not in NATIVELY_PACKED_FORMATS:
+        compressor = _get_compressor(compression)
+
+    for chunk in chunks:
+        if compressor is not None:
+            chunk = compressor.compress(chunk)
+        if chunk:
+            yield chunk
+
+    if compressor is not None:
+        yield compressor.flush()
+
+def _iter_json_array_chunks(data, chunk_size):
+    """
+    Stream data as a single JSON array of records.
+
+    Args:
+        data (DataFrame): Data to export
+        chunk_size (int): Rows per chunk
+
+    Yields:
+        bytes: Encoded JSON bytes
+    """
+    yield b"["
+    first = True
+    for chunk in _iter_frame_chunks(data, chunk_size):
+        # Strip the enclosing brackets so chunks join into one array
+        records = chunk.to_json(orient='records')[1:-1]
+        if not records:
+            continue
+        yield (records if first else "," + records).encode('utf-8')
+        first = False
+    yield b"]"
 
-def export_data(data, format='csv', filename='sentigrade_export'):
+def _iter_jsonl_chunks(data, chunk_size):
     """
-    Export data to various formats.
+    Stream data as JSON Lines, one record per line.
+
+    Args:
+        data (DataFrame): Data to export
+        chunk_size (int): Rows per chunk
+
+    Yields:
+        bytes: Encoded JSON Lines bytes
+    """
+    for chunk in _iter_frame_chunks(data, chunk_size):
+        lines = chunk.to_json(orient='records', lines=True)
+        if not lines.endswith("\n"):
+            lines += "\n"
+        yield lines.encode('utf-8')
+
+def get_export_file_info(format='csv', compression=None, filename='sentigrade_export'):
+    """
+    Get the download file name and MIME type for an export.
+
+    Args:
+        format (str): Export format
+        compression (str): Stream compression (gzip, zstd) or None
+        filename (str): Base filename
+
+    Returns:
+        tuple: (file_name, mime_type)
+    """
+    format = format.lower()
+    extension, mime = EXPORT_FORMATS[format]
+
+    if compression and format not in NATIVELY_PACKED_FORMATS:
+        suffix, mime = EXPORT_COMPRESSIONS[compression]
+        extension += suffix
+
+    return f"{filename}{extension}", mime
+
+def export_to_buffer(data, format='csv', compression=None, chunk_size=EXPORT_CHUNK_SIZE,
+                     spool_limit=EXPORT_SPOOL_LIMIT):
+    """
+    Export data into a rewound binary file handle.
+    Chunks are written to memory and spill to an anonymous temporary file
+    once the export grows past spool_limit. The handle can be passed
+    directly to st.download_button.
     
     Args:
         data (DataFrame): Data to export
-        format (str): Export format (csv, excel, json)
+        format (str): Export format (csv, json, jsonl, parquet, feather, excel, pdf)
+        compression (str): Stream compression (gzip, zstd) or None
+        chunk_size (int): Rows encoded per chunk
+        spool_limit (int): Bytes kept in memory before spilling to disk
+        
+    Returns:
+        file: Binary file handle positioned at the start, or None if export failed
+    """
+    if data is None or data.empty:
+        return None
+
+    try:
+        buffer = io.BytesIO()
+        for chunk in iter_export_chunks(data, format, compression, chunk_size):
+            buffer.write(chunk)
+
+            # Spill to disk once the export is too large to keep in memory
+            if isinstance(buffer, io.BytesIO) and buffer.tell() > spool_limit:
+                spooled = tempfile.TemporaryFile(buffering=0)
+                spooled = getattr(spooled, 'file', spooled)
+                spooled.write(buffer.getvalue())
+                buffer = spooled
+
+        buffer.seek(0)
+        if isinstance(buffer, io.BytesIO):
+            return buffer
+        return io.BufferedReader(buffer)
+    except Exception as e:
+        print(f"Export error: {str(e)}")
+        return None
+
+def export_data(data, format='csv', filename='sentigrade_export', compression=None,
+                chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Export data to a file in various formats.
+    
+    Args:
+        data (DataFrame): Data to export
+        format (str): Export format (csv, excel, json, jsonl, parquet, feather, pdf)
         filename (str): Base filename for export
+        compression (str): Stream compression (gzip, zstd) or None
+        chunk_size (int): Rows written per chunk
         
     Returns:
         str: Path to exported file or None if export failed
@@ -138,19 +526,11 @@ def export_data(data, format='csv', filename='sentigrade_export'):
         
     try:
         today = datetime.datetime.now().strftime('%Y%m%d')
-        export_path = f"{filename}_{today}"
-        
-        if format.lower() == 'csv':
-            export_path += '.csv'
-            data.to_csv(export_path, index=False)
-        elif format.lower() == 'excel':
-            export_path += '.xlsx'
-            data.to_excel(export_path, index=False)
-        elif format.lower() == 'json':
-            export_path += '.json'
-            data.to_json(export_path, orient='records')
-        else:
-            return None
+        export_path, _ = get_export_file_info(format, compression, f"{filename}_{today}")
+
+        with open(export_path, 'wb') as file:
+            for chunk in iter_export_chunks(data, format, compression, chunk_size):
+                file.write(chunk)
             
         return export_path
     except Exception as e:
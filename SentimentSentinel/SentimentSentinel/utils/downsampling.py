@@ -0,0 +1,233 @@
+import numpy as np
+import pandas as pd
+from utils.chart_data import group_positions
+
+# Target number of plotted points per series
+DEFAULT_MAX_POINTS = 2000
+
+# Charts with more points than this are drawn with WebGL (Scattergl)
+WEBGL_THRESHOLD = 5000
+
+# Downsampling methods
+DOWNSAMPLING_METHODS = ["lttb", "minmax", "bucket"]
+
+# DataFrame.attrs key marking bucket aggregates (mean, count, min, max) rather than raw rows
+AGGREGATED_ATTR = "bucket_aggregated"
+
+def _as_numeric(x):
+    """
+    Convert x values (numbers or datetimes) to float64 for distance math.
+
+    Args:
+        x (array-like): x values
+
+    Returns:
+        ndarray: Numeric x values
+    """
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+def lttb_indices(x, y, n_out):
+    """
+    Select points with Largest-Triangle-Three-Buckets downsampling.
+    LTTB keeps the visual shape of a line by choosing, in each bucket, the
+    point forming the largest triangle with its neighbours.
+
+    Points with a missing x or y can't form a triangle and are never selected.
+
+    Args:
+        x (array-like): Sorted x values (numbers or datetimes)
+        y (array-like): y values
+        n_out (int): Number of points to keep
+
+    Returns:
+        ndarray: Indices of the selected points
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+
+    # One NaN would turn every area it touches into NaN and poison argmax
+    missing = np.isnan(y) | (np.isnat(x) if np.issubdtype(x.dtype, np.datetime64) else np.isnan(_as_numeric(x)))
+    if missing.any():
+        present = np.flatnonzero(~missing)
+        return present[lttb_indices(x[present], y[present], n_out)]
+
+    x = _as_numeric(x)
+
+    # First and last points are always kept; the rest is split into buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Average of the next bucket (or the last point)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+
+        # Twice the triangle area for every candidate in the bucket
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+
+    return selected
+
+def minmax_indices(y, n_out):
+    """
+    Select the minimum and maximum point of each equal-count bucket.
+    Preserves spikes that averaging would hide.
+
+    Args:
+        y (array-like): y values in x order
+        n_out (int): Approximate number of points to keep
+
+    Returns:
+        ndarray: Sorted indices of the selected points
+    """
+    n = len(y)
+    n_buckets = n_out // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=np.float64)
+    size = -(-n // n_buckets)
+
+    # Pad to a whole number of buckets so argmin/argmax run in one pass
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, size)
+
+    # Buckets made only of padding are dropped
+    valid = ~np.isnan(buckets).all(axis=1)
+    filled_low = np.where(np.isnan(buckets), np.inf, buckets)
+    filled_high = np.where(np.isnan(buckets), -np.inf, buckets)
+    offsets = np.arange(n_buckets) * size
+
+    lows = offsets + filled_low.argmin(axis=1)
+    highs = offsets + filled_high.argmax(axis=1)
+
+    return np.unique(np.concatenate([lows[valid], highs[valid]]))
+
+def bucket_aggregate(df, x_column, y_column, n_buckets, group_column=None):
+    """
+    Aggregate points into equal-width x buckets with mean, count, min and max.
+
+    Args:
+        df (DataFrame): Data sorted by x
+        x_column (str): x column (numbers or datetimes)
+        y_column (str): y column
+        n_buckets (int): Buckets per series
+        group_column (str): Optional series column
+
+    Returns:
+        DataFrame: One row per non-empty bucket with x (bucket midpoint), mean y,
+            'count', 'min' and 'max'
+    """
+    x = df[x_column]
+    is_datetime = pd.api.types.is_datetime64_any_dtype(x)
+    numeric_x = _as_numeric(x)
+
+    low, high = numeric_x.min(), numeric_x.max()
+    width = (high - low) / n_buckets if high > low else 1.0
+    bucket = np.minimum(((numeric_x - low) // width).astype(np.int64), n_buckets - 1)
+
+    keys = [bucket] if group_column is None else [df[group_column].to_numpy(), bucket]
+    grouped = df[y_column].groupby(keys, observed=True).agg(['mean', 'count', 'min', 'max'])
+    grouped = grouped.reset_index()
+
+    bucket_ids = grouped.iloc[:, -5].to_numpy()
+    midpoints = low + (bucket_ids + 0.5) * width
+    if is_datetime:
+        midpoints = pd.to_datetime(midpoints.astype(np.int64))
+
+    result = pd.DataFrame({x_column: midpoints})
+    if group_column is not None:
+        result[group_column] = grouped.iloc[:, 0].to_numpy()
+    result[y_column] = grouped['mean'].to_numpy()
+    result['count'] = grouped['count'].to_numpy()
+    result['min'] = grouped['min'].to_numpy()
+    result['max'] = grouped['max'].to_numpy()
+    result.attrs[AGGREGATED_ATTR] = True
+    return result
+
+def is_aggregated(df):
+    """
+    Check whether a frame holds bucket aggregates from bucket_aggregate.
+
+    Args:
+        df (DataFrame): Frame returned by downsample_frame
+
+    Returns:
+        bool: True if rows are buckets with mean, 'count', 'min' and 'max'
+    """
+    return bool(df.attrs.get(AGGREGATED_ATTR, False))
+
+def downsample_frame(df, x_column, y_column, max_points=DEFAULT_MAX_POINTS, group_column=None, method='lttb',
+                     groups=None):
+    """
+    Downsample a sorted DataFrame to at most max_points rows per series.
+    Only the plotted rows are gathered; when nothing needs to be dropped the
+    input frame itself is returned.
+
+    Args:
+        df (DataFrame): Data sorted by x
+        x_column (str): x column
+        y_column (str): y column
+        max_points (int): Target points per series (None disables downsampling)
+        group_column (str): Optional series column (e.g. country)
+        method (str): 'lttb', 'minmax' or 'bucket'
+        groups (list): Series to keep (None keeps all)
+
+    Returns:
+        DataFrame: Downsampled rows; the 'bucket' method returns aggregates,
+            marked so is_aggregated is True
+    """
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError(f"Unsupported downsampling method: {method}")
+
+    if group_column is None:
+        positions = [np.arange(len(df))]
+    else:
+        positions = list(group_positions(df, group_column, groups).values())
+
+    total = sum(len(rows) for rows in positions)
+    needs_downsampling = max_points is not None and any(len(rows) > max_points for rows in positions)
+
+    if not needs_downsampling:
+        if total == len(df):
+            return df
+        return df.iloc[np.sort(np.concatenate(positions))] if positions else df.iloc[:0]
+
+    if method == 'bucket':
+        subset = df if total == len(df) else df.iloc[np.sort(np.concatenate(positions))]
+        return bucket_aggregate(subset, x_column, y_column, max_points, group_column)
+
+    x_values = df[x_column].to_numpy()
+    y_values = df[y_column].to_numpy()
+
+    selected = []
+    for rows in positions:
+        if len(rows) <= max_points:
+            selected.append(rows)
+        elif method == 'lttb':
+            selected.append(rows[lttb_indices(x_values[rows], y_values[rows], max_points)])
+        else:
+            selected.append(rows[minmax_indices(y_values[rows], max_points)])
+
+    return df.iloc[np.sort(np.concatenate(selected))]
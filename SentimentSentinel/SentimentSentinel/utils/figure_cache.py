@@ -0,0 +1,218 @@
+import functools
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from utils.instrumentation import increment, span
+
+# Total serialized size of cached figures before least-recently-used eviction
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Rows sampled per column when fingerprinting a DataFrame
+FINGERPRINT_SAMPLE_ROWS = 1024
+
+# DataFrame.attrs key holding a version counter for in-place edits
+FRAME_VERSION_ATTR = "sentigrade_version"
+
+_cache = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+_cache_enabled = True
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+def bump_frame_version(df):
+    """
+    Mark a DataFrame as changed after an in-place edit the sampled
+    fingerprint might miss.
+
+    Args:
+        df (DataFrame): Edited DataFrame
+    """
+    df.attrs[FRAME_VERSION_ATTR] = df.attrs.get(FRAME_VERSION_ATTR, 0) + 1
+
+def frame_fingerprint(df):
+    """
+    Compute a cheap fingerprint of a DataFrame.
+    Combines the row count, column names and dtypes, a version counter and a
+    hash per column over an evenly strided sample of rows (always including
+    the first and last row). Its cost does not grow with the frame, so it
+    can run on every chart call and rerun; frames edited in place should be
+    marked with bump_frame_version.
+
+    Args:
+        df (DataFrame): DataFrame to fingerprint
+
+    Returns:
+        tuple: Hashable fingerprint
+    """
+    n = len(df)
+    step = max(1, n // FINGERPRINT_SAMPLE_ROWS)
+    positions = np.unique(np.append(np.arange(0, n, step), n - 1)) if n else np.arange(0)
+    sample = df.iloc[positions]
+
+    column_hashes = []
+    for i in range(sample.shape[1]):
+        column = sample.iloc[:, i]
+        try:
+            column_hashes.append(int(pd.util.hash_pandas_object(column, index=False).sum()))
+        except TypeError:
+            # Unhashable elements such as lists are hashed by their text
+            column_hashes.append(int(pd.util.hash_pandas_object(column.astype(str), index=False).sum()))
+
+    return (
+        n,
+        tuple(map(str, df.columns)),
+        tuple(map(str, df.dtypes)),
+        df.attrs.get(FRAME_VERSION_ATTR, 0),
+        int(pd.util.hash_pandas_object(sample.index.to_series(), index=False).sum()),
+        tuple(column_hashes)
+    )
+
+def _fingerprint_arg(value):
+    """
+    Turn a chart argument into a hashable cache-key component.
+
+    Args:
+        value: Argument value
+
+    Returns:
+        object: Hashable representation
+    """
+    if isinstance(value, pd.DataFrame):
+        return ("frame", frame_fingerprint(value))
+    if isinstance(value, pd.Series):
+        return ("series", frame_fingerprint(value.to_frame()))
+    if isinstance(value, dict):
+        return ("dict", tuple((k, _fingerprint_arg(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return ("seq", tuple(_fingerprint_arg(v) for v in value))
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return ("repr", repr(value))
+
+def _figure_size(fig):
+    """
+    Get the serialized size of a figure in bytes.
+
+    Args:
+        fig (Figure): Plotly figure
+
+    Returns:
+        int: Size of the figure's JSON
+    """
+    return len(fig.to_json())
+
+def cached_figure(factory):
+    """
+    Cache a figure factory's results by a fingerprint of its arguments.
+    Cached figures are shared between reruns and sessions, so callers must
+    not modify returned figures in place.
+
+    Args:
+        factory (callable): Function returning a Plotly figure
+
+    Returns:
+        callable: Caching wrapper with the same signature
+    """
+    span_name = f"chart.{factory.__name__}"
+
+    @functools.wraps(factory)
+    def wrapper(*args, **kwargs):
+        with span(span_name):
+            return _cached_call(factory, args, kwargs)
+
+    return wrapper
+
+def _cached_call(factory, args, kwargs):
+    """
+    Return a cached figure for these arguments, building and caching it on a miss.
+
+    Args:
+        factory (callable): Function returning a Plotly figure
+        args (tuple): Positional arguments
+        kwargs (dict): Keyword arguments
+
+    Returns:
+        Figure: Cached or newly built figure
+    """
+    global _cache_bytes
+
+    if not _cache_enabled:
+        return factory(*args, **kwargs)
+
+    key = (
+        factory.__qualname__,
+        _fingerprint_arg(args),
+        _fingerprint_arg(tuple(sorted(kwargs.items())))
+    )
+
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            increment("figure_cache.hits")
+        else:
+            _stats["misses"] += 1
+            increment("figure_cache.misses")
+
+    if cached is not None:
+        return cached[0]
+
+    fig = factory(*args, **kwargs)
+    size = _figure_size(fig)
+
+    with _cache_lock:
+        if key not in _cache and size <= FIGURE_CACHE_MAX_BYTES:
+            _cache[key] = (fig, size)
+            _cache_bytes += size
+
+            # Evict least recently used figures until the cache fits
+            while _cache_bytes > FIGURE_CACHE_MAX_BYTES:
+                _, (_, evicted_size) = _cache.popitem(last=False)
+                _cache_bytes -= evicted_size
+                _stats["evictions"] += 1
+
+    return fig
+
+def set_figure_cache_enabled(enabled):
+    """
+    Enable or disable figure caching.
+
+    Args:
+        enabled (bool): Whether cached figures are used
+    """
+    global _cache_enabled
+    _cache_enabled = enabled
+
+def figure_cache_enabled():
+    """
+    Check whether figure caching is on.
+
+    Returns:
+        bool: True if cached figures are used
+    """
+    return _cache_enabled
+
+def clear_figure_cache():
+    """
+    Remove all cached figures and reset statistics.
+    """
+    global _cache_bytes
+    with _cache_lock:
+        _cache.clear()
+        _cache_bytes = 0
+        for name in _stats:
+            _stats[name] = 0
+
+def get_figure_cache_stats():
+    """
+    Get figure cache statistics.
+
+    Returns:
+        dict: Hits, misses, evictions, cached figure count and total bytes
+    """
+    with _cache_lock:
+        return dict(_stats, figures=len(_cache), bytes=_cache_bytes)
@@ -0,0 +1,582 @@
+import hashlib
+import threading
+import time
+from itertools import product
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+
+# Forecasting methods
+FORECAST_METHODS = ["holt_winters", "ar"]
+
+# Smoothing parameter grid searched per series for Holt-Winters
+HW_ALPHAS = [0.1, 0.2, 0.3, 0.5, 0.7, 0.9]
+HW_BETAS = [0.01, 0.05, 0.1, 0.2]
+HW_GAMMAS = [0.05, 0.1, 0.3]
+
+# Trend damping keeps long horizons from drifting outside the score range
+HW_DAMPING = 0.95
+
+# Weekly seasonality for daily series
+SEASON_LENGTH = 7
+
+# Maximum autoregressive order
+AR_MAX_ORDER = 7
+
+# Ridge term keeping AR normal equations solvable for flat series
+AR_RIDGE = 1e-6
+
+# Days of incremental updates before smoothing parameters are re-searched
+REFIT_INTERVAL = 30
+
+# Maximum number of fitted states kept in the cache
+FORECAST_CACHE_SIZE = 32
+
+# Fitted model states keyed by series layout
+_forecast_cache = {}
+_forecast_cache_lock = threading.Lock()
+
+def _history_digest(Y):
+    """
+    Digest the observations a model was fitted on.
+
+    Args:
+        Y (ndarray): Observations of shape (series, days)
+
+    Returns:
+        str: Hex digest of the values
+    """
+    return hashlib.blake2b(np.ascontiguousarray(Y, dtype=np.float64).tobytes(), digest_size=16).hexdigest()
+
+def build_series_matrix(df, date_column='date', value_column='sentiment_score', group_columns=None):
+    """
+    Build a daily series matrix with one row per group and one column per day.
+    Values are averaged per day; missing days are carried forward.
+
+    Args:
+        df (DataFrame): Historical data
+        date_column (str): Column containing dates
+        value_column (str): Column containing values to forecast
+        group_columns (list): Columns identifying each series (e.g. country, topic)
+
+    Returns:
+        tuple: (keys DataFrame, DatetimeIndex of days, float64 ndarray of shape (series, days))
+    """
+    group_columns = list(group_columns or [])
+
+    # Normalize dates without touching the caller's frame
+    days = pd.to_datetime(df[date_column]).dt.normalize().rename(date_column)
+
+    if group_columns:
+        daily = df.groupby(group_columns + [days], observed=True)[value_column].mean()
+        wide = daily.unstack(level=-1)
+    else:
+        wide = df.groupby(days)[value_column].mean().to_frame().T
+
+    all_days = pd.date_range(wide.columns.min(), wide.columns.max(), freq='D')
+    wide = wide.reindex(columns=all_days)
+
+    # Carry values across gaps; leading gaps take the first observation
+    wide = wide.ffill(axis=1).bfill(axis=1).fillna(0.0)
+
+    if group_columns:
+        keys = wide.index.to_frame(index=False)
+    else:
+        keys = pd.DataFrame(index=[0])
+
+    return keys, all_days, wide.to_numpy(dtype=np.float64)
+
+def _holt_winters_pass(Y, alpha, beta, gamma, level, trend, season, position, season_length):
+    """
+    Run the damped additive Holt-Winters recursion over new observations.
+    All arrays broadcast, so the same pass fits a parameter grid
+    (shape (grid, series)) or updates fitted series (shape (series,)).
+
+    Args:
+        Y (ndarray): Observations of shape (series, days)
+        alpha, beta, gamma (ndarray): Smoothing parameters
+        level, trend (ndarray): Current state
+        season (ndarray): Seasonal state with the season on the last axis
+        position (int): Seasonal index of the first observation
+        season_length (int): Season length (1 disables seasonality)
+
+    Returns:
+        tuple: (level, trend, season, sum of squared one-step errors)
+    """
+    sse = np.zeros(np.broadcast(level, alpha).shape)
+    season = season.copy()
+
+    for t in range(Y.shape[1]):
+        y = Y[:, t]
+        s = (position + t) % season_length
+        seasonal = season[..., s]
+
+        error = y - (level + HW_DAMPING * trend + seasonal)
+        sse += error ** 2
+
+        new_level = alpha * (y - seasonal) + (1 - alpha) * (level + HW_DAMPING * trend)
+        trend = beta * (new_level - level) + (1 - beta) * HW_DAMPING * trend
+        if season_length > 1:
+            season[..., s] = gamma * (y - new_level) + (1 - gamma) * seasonal
+        level = new_level
+
+    return level, trend, season, sse
+
+def fit_holt_winters(Y):
+    """
+    Fit damped additive Holt-Winters models to all series at once.
+    Every parameter combination in the grid is run over every series in one
+    vectorized pass and the best combination is kept per series.
+
+    Args:
+        Y (ndarray): Observations of shape (series, days)
+
+    Returns:
+        dict: Fitted state
+    """
+    n_series, n_days = Y.shape
+    season_length = SEASON_LENGTH if n_days >= 2 * SEASON_LENGTH else 1
+    gammas = HW_GAMMAS if season_length > 1 else [0.0]
+
+    grid = np.array(list(product(HW_ALPHAS, HW_BETAS, gammas)))
+    alpha, beta, gamma = (grid[:, i:i + 1] for i in range(3))
+
+    # Initial state from the first season
+    first = Y[:, :season_length]
+    level = first.mean(axis=1)
+    if n_days >= 2 * season_length:
+        trend = (Y[:, season_length:2 * season_length].mean(axis=1) - level) / season_length
+    elif n_days > 1:
+        trend = Y[:, 1] - Y[:, 0]
+    else:
+        trend = np.zeros(n_series)
+    season = first - level[:, None]
+
+    grid_level = np.broadcast_to(level, (len(grid), n_series))
+    grid_trend = np.broadcast_to(trend, (len(grid), n_series))
+    grid_season = np.broadcast_to(season, (len(grid), n_series, season_length))
+
+    level, trend, season, sse = _holt_winters_pass(
+        Y, alpha, beta, gamma, grid_level, grid_trend, grid_season, 0, season_length
+    )
+
+    # Keep the best parameter combination per series
+    best = sse.argmin(axis=0)
+    series = np.arange(n_series)
+
+    return {
+        "method": "holt_winters",
+        "alpha": grid[best, 0],
+        "beta": grid[best, 1],
+        "gamma": grid[best, 2],
+        "level": level[best, series],
+        "trend": trend[best, series],
+        "season": season[best, series],
+        "season_length": season_length,
+        "position": n_days % season_length,
+        "sse": sse[best, series],
+        "n_obs": n_days
+    }
+
+def update_holt_winters(state, Y_new):
+    """
+    Advance a fitted Holt-Winters state over new days without refitting.
+
+    Args:
+        state (dict): Fitted state from fit_holt_winters
+        Y_new (ndarray): New observations of shape (series, new days)
+
+    Returns:
+        dict: Updated state
+    """
+    level, trend, season, sse = _holt_winters_pass(
+        Y_new, state["alpha"], state["beta"], state["gamma"],
+        state["level"], state["trend"], state["season"],
+        state["position"], state["season_length"]
+    )
+
+    state = dict(state)
+    state.update({
+        "level": level,
+        "trend": trend,
+        "season": season,
+        "position": (state["position"] + Y_new.shape[1]) % state["season_length"],
+        "sse": state["sse"] + sse,
+        "n_obs": state["n_obs"] + Y_new.shape[1]
+    })
+    return state
+
+def forecast_holt_winters(state, days):
+    """
+    Forecast fitted Holt-Winters series.
+
+    Args:
+        state (dict): Fitted state
+        days (int): Forecast horizon
+
+    Returns:
+        tuple: (mean forecast, forecast standard deviation), each of shape (series, days)
+    """
+    steps = np.arange(1, days + 1)
+    damped = np.cumsum(HW_DAMPING ** steps)
+    season_index = (state["position"] + steps - 1) % state["season_length"]
+
+    mean = (state["level"][:, None]
+            + damped[None, :] * state["trend"][:, None]
+            + state["season"][:, season_index])
+
+    # Error variance grows with the accumulated smoothing weights
+    sigma = np.sqrt(state["sse"] / max(state["n_obs"], 1))
+    weights = state["alpha"][:, None] * (1 + state["beta"][:, None] * np.concatenate([[0.0], damped[:-1]])[None, :])
+    seasonal_hit = ((steps - 1) % state["season_length"] == 0) & (steps > 1)
+    weights = weights + state["gamma"][:, None] * seasonal_hit[None, :]
+    weights[:, 0] = 0.0
+    variance = 1 + np.cumsum(weights ** 2, axis=1)
+
+    return mean, sigma[:, None] * np.sqrt(variance)
+
+def _ar_design(Y, order):
+    """
+    Build lagged design matrices for all series.
+
+    Args:
+        Y (ndarray): Observations of shape (series, days)
+        order (int): Number of lags
+
+    Returns:
+        tuple: (X of shape (series, rows, order + 1), targets of shape (series, rows))
+    """
+    n_series, n_days = Y.shape
+    rows = n_days - order
+    X = np.ones((n_series, rows, order + 1))
+    for lag in range(1, order + 1):
+        X[:, :, lag] = Y[:, order - lag:n_days - lag]
+    return X, Y[:, order:]
+
+def _solve_ar(state):
+    """
+    Solve the batched AR normal equations stored in a state.
+
+    Args:
+        state (dict): AR state holding the sufficient statistics
+
+    Returns:
+        dict: State with updated coefficients and residual variance
+    """
+    xtx, xty = state["xtx"], state["xty"]
+    ridge = AR_RIDGE * np.eye(xtx.shape[-1])
+    coef = np.linalg.solve(xtx + ridge, xty[..., None])[..., 0]
+
+    # Residual sum of squares from the sufficient statistics
+    rss = state["yty"] - 2 * np.einsum('sk,sk->s', coef, xty) + np.einsum('sk,skl,sl->s', coef, xtx, coef)
+    dof = max(state["n_obs"] - state["order"] - (state["order"] + 1), 1)
+
+    state = dict(state)
+    state["coef"] = coef
+    state["sigma2"] = np.maximum(rss, 0.0) / dof
+    return state
+
+def fit_ar(Y, order=None):
+    """
+    Fit AR(p) models to all series at once with batched least squares.
+    Only the sufficient statistics (X'X, X'y, y'y) are kept, so new days
+    update the fit without revisiting history.
+
+    Args:
+        Y (ndarray): Observations of shape (series, days)
+        order (int): AR order (defaults to a quarter of the history, capped at AR_MAX_ORDER)
+
+    Returns:
+        dict: Fitted state
+    """
+    n_series, n_days = Y.shape
+    if order is None:
+        order = max(1, min(AR_MAX_ORDER, n_days // 4))
+    order = min(order, max(n_days - 1, 1))
+
+    X, target = _ar_design(Y, order)
+
+    state = {
+        "method": "ar",
+        "order": order,
+        "xtx": np.einsum('srk,srl->skl', X, X),
+        "xty": np.einsum('srk,sr->sk', X, target),
+        "yty": np.einsum('sr,sr->s', target, target),
+        "history": Y[:, -order:].copy(),
+        "n_obs": n_days
+    }
+    return _solve_ar(state)
+
+def update_ar(state, Y_new):
+    """
+    Add new days to fitted AR models by updating the sufficient statistics.
+
+    Args:
+        state (dict): Fitted state from fit_ar
+        Y_new (ndarray): New observations of shape (series, new days)
+
+    Returns:
+        dict: Updated state
+    """
+    order = state["order"]
+    Y = np.concatenate([state["history"], Y_new], axis=1)
+    X, target = _ar_design(Y, order)
+
+    state = dict(state)
+    state.update({
+        "xtx": state["xtx"] + np.einsum('srk,srl->skl', X, X),
+        "xty": state["xty"] + np.einsum('srk,sr->sk', X, target),
+        "yty": state["yty"] + np.einsum('sr,sr->s', target, target),
+        "history": Y[:, -order:].copy(),
+        "n_obs": state["n_obs"] + Y_new.shape[1]
+    })
+    return _solve_ar(state)
+
+def forecast_ar(state, days):
+    """
+    Forecast fitted AR series.
+
+    Args:
+        state (dict): Fitted state
+        days (int): Forecast horizon
+
+    Returns:
+        tuple: (mean forecast, forecast standard deviation), each of shape (series, days)
+    """
+    order = state["order"]
+    intercept = state["coef"][:, 0]
+    phi = state["coef"][:, 1:]
+    n_series = phi.shape[0]
+
+    # Most recent value first
+    lags = state["history"][:, ::-1].copy()
+    mean = np.empty((n_series, days))
+    psi = np.zeros((n_series, days))
+    psi[:, 0] = 1.0
+
+    for h in range(days):
+        mean[:, h] = intercept + np.einsum('sk,sk->s', phi, lags)
+        lags = np.concatenate([mean[:, h:h + 1], lags[:, :-1]], axis=1)
+
+        # Moving-average weights for the forecast error variance
+        if h > 0:
+            k = min(h, order)
+            psi[:, h] = np.einsum('sk,sk->s', phi[:, :k], psi[:, h - 1::-1][:, :k])
+
+    variance = np.cumsum(psi ** 2, axis=1)
+    return mean, np.sqrt(state["sigma2"])[:, None] * np.sqrt(variance)
+
+def fit_forecast_model(Y, method='holt_winters'):
+    """
+    Fit a forecasting model to all series.
+
+    Args:
+        Y (ndarray): Observations of shape (series, days)
+        method (str): Forecasting method ('holt_winters' or 'ar')
+
+    Returns:
+        dict: Fitted state
+    """
+    if method == 'holt_winters':
+        return fit_holt_winters(Y)
+    elif method == 'ar':
+        return fit_ar(Y)
+    raise ValueError(f"Unsupported forecasting method: {method}")
+
+def update_forecast_model(state, Y_new):
+    """
+    Advance a fitted model over new days.
+
+    Args:
+        state (dict): Fitted state
+        Y_new (ndarray): New observations of shape (series, new days)
+
+    Returns:
+        dict: Updated state
+    """
+    if Y_new.shape[1] == 0:
+        return state
+    if state["method"] == 'holt_winters':
+        return update_holt_winters(state, Y_new)
+    return update_ar(state, Y_new)
+
+def forecast_model(state, days, interval=0.95):
+    """
+    Forecast from a fitted model with prediction intervals.
+
+    Args:
+        state (dict): Fitted state
+        days (int): Forecast horizon
+        interval (float): Prediction interval coverage
+
+    Returns:
+        tuple: (mean, lower, upper), each of shape (series, days)
+    """
+    if state["method"] == 'holt_winters':
+        mean, std = forecast_holt_winters(state, days)
+    else:
+        mean, std = forecast_ar(state, days)
+
+    z = NormalDist().inv_cdf(0.5 + interval / 2)
+
+    # Sentiment scores are bounded
+    lower = np.clip(mean - z * std, -1, 1)
+    upper = np.clip(mean + z * std, -1, 1)
+    return np.clip(mean, -1, 1), lower, upper
+
+def _get_cached_state(cache_key, days_index, Y, method):
+    """
+    Get a fitted state for a series matrix, reusing the cached fit when the
+    matrix only extends the days it was fitted on. The fitted days must
+    match exactly (same start and values); any other data, or an edit to
+    a day already fitted, is refitted from scratch.
+
+    Args:
+        cache_key (tuple): Series layout key
+        days_index (DatetimeIndex): Days covered by the matrix
+        Y (ndarray): Observations of shape (series, days)
+        method (str): Forecasting method
+
+    Returns:
+        dict: Fitted state covering every day in the matrix
+    """
+    with _forecast_cache_lock:
+        entry = _forecast_cache.get(cache_key)
+
+    # Fits run outside the lock; states are never modified in place, so the
+    # entry read above stays valid while another session replaces it
+    fitted_days = entry["days"] if entry is not None else 0
+    if (entry is not None and entry["first_day"] == days_index[0] and fitted_days <= Y.shape[1]
+            and entry["digest"] == _history_digest(Y[:, :fitted_days])):
+        new_days = Y.shape[1] - fitted_days
+
+        # Re-search parameters once enough days have been appended
+        if entry["days_since_fit"] + new_days <= REFIT_INTERVAL:
+            state = update_forecast_model(entry["state"], Y[:, Y.shape[1] - new_days:])
+            _store_state(cache_key, state, days_index, Y, entry["days_since_fit"] + new_days)
+            return state
+
+    state = fit_forecast_model(Y, method)
+    _store_state(cache_key, state, days_index, Y, 0)
+    return state
+
+def _store_state(cache_key, state, days_index, Y, days_since_fit):
+    """
+    Cache a fitted state, evicting the oldest entry when the cache is full.
+
+    Args:
+        cache_key (tuple): Series layout key
+        state (dict): Fitted state
+        days_index (DatetimeIndex): Days covered by the matrix
+        Y (ndarray): Observations the state was fitted on
+        days_since_fit (int): Days appended since parameters were searched
+    """
+    entry = {
+        "state": state,
+        "first_day": days_index[0],
+        "days": Y.shape[1],
+        "digest": _history_digest(Y),
+        "days_since_fit": days_since_fit
+    }
+    # Sessions share the cache, so inserts and evictions take the lock
+    with _forecast_cache_lock:
+        _forecast_cache.pop(cache_key, None)
+        while len(_forecast_cache) >= FORECAST_CACHE_SIZE:
+            # Evict the oldest entry
+            _forecast_cache.pop(next(iter(_forecast_cache)))
+        _forecast_cache[cache_key] = entry
+
+def clear_forecast_cache():
+    """
+    Clear all cached fitted models.
+    """
+    with _forecast_cache_lock:
+        _forecast_cache.clear()
+
+def forecast_series(historical_df, days=7, date_column='date', value_column='sentiment_score',
+                    group_columns=None, method='holt_winters', interval=0.95, use_cache=True):
+    """
+    Forecast every series in a historical DataFrame.
+
+    Args:
+        historical_df (DataFrame): Historical data
+        days (int): Number of days to forecast
+        date_column (str): Column containing dates
+        value_column (str): Column containing values to forecast
+        group_columns (list): Columns identifying each series
+        method (str): Forecasting method ('holt_winters' or 'ar')
+        interval (float): Prediction interval coverage
+        use_cache (bool): Whether to reuse and update cached fits
+
+    Returns:
+        DataFrame: Forecast rows with date, group columns, value, lower and upper bound
+    """
+    group_columns = list(group_columns or [])
+    keys, days_index, Y = build_series_matrix(historical_df, date_column, value_column, group_columns)
+
+    if use_cache:
+        cache_key = (method, value_column, tuple(group_columns),
+                     tuple(keys.itertuples(index=False, name=None)))
+        state = _get_cached_state(cache_key, days_index, Y, method)
+    else:
+        state = fit_forecast_model(Y, method)
+
+    mean, lower, upper = forecast_model(state, days, interval)
+
+    # Flatten to one row per series and day
+    n_series = Y.shape[0]
+    forecast_days = pd.date_range(days_index[-1] + pd.Timedelta(days=1), periods=days, freq='D')
+
+    forecast_df = keys.loc[np.repeat(np.arange(n_series), days)].reset_index(drop=True)
+    forecast_df.insert(0, date_column, np.tile(forecast_days.to_numpy(), n_series))
+    forecast_df[value_column] = mean.ravel()
+    forecast_df['lower'] = lower.ravel()
+    forecast_df['upper'] = upper.ravel()
+
+    return forecast_df
+
+def backtest_forecast(Y, horizon=7, methods=None, interval=0.95):
+    """
+    Backtest forecasting methods by holding out the last days of every series.
+    A last-value naive forecast is included as a baseline.
+
+    Args:
+        Y (ndarray): Observations of shape (series, days)
+        horizon (int): Held-out days
+        methods (list): Methods to evaluate (defaults to all)
+        interval (float): Prediction interval coverage
+
+    Returns:
+        DataFrame: One row per method with MAE, RMSE, interval coverage and fit time
+    """
+    methods = methods or FORECAST_METHODS
+    train, test = Y[:, :-horizon], Y[:, -horizon:]
+    n_series = Y.shape[0]
+    results = []
+
+    naive = np.repeat(train[:, -1:], horizon, axis=1)
+    results.append({
+        "method": "naive",
+        "mae": np.abs(naive - test).mean(),
+        "rmse": np.sqrt(((naive - test) ** 2).mean()),
+        "coverage": np.nan,
+        "fit_seconds": 0.0,
+        "fit_seconds_per_1000_series": 0.0
+    })
+
+    for method in methods:
+        start = time.perf_counter()
+        state = fit_forecast_model(train, method)
+        fit_seconds = time.perf_counter() - start
+
+        mean, lower, upper = forecast_model(state, horizon, interval)
+        results.append({
+            "method": method,
+            "mae": np.abs(mean - test).mean(),
+            "rmse": np.sqrt(((mean - test) ** 2).mean()),
+            "coverage": ((test >= lower) & (test <= upper)).mean(),
+            "fit_seconds": fit_seconds,
+            "fit_seconds_per_1000_series": 1000 * fit_seconds / n_series
+        })
+
+    return pd.DataFrame(results)
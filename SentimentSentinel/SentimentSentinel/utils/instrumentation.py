@@ -0,0 +1,337 @@
+import functools
+import json
+import os
+import threading
+import time
+
+# Environment variable that turns instrumentation on at startup
+INSTRUMENTATION_ENV = "SENTIGRADE_INSTRUMENTATION"
+
+# Prefix for exported Prometheus metric names
+METRIC_PREFIX = "sentigrade"
+
+# Session state key of the sidebar toggle for the timing breakdown
+DEBUG_PANEL_KEY = "show_timing_breakdown"
+
+# Process-wide default; a page run overrides it for its own thread (see start_page_run)
+_enabled = os.environ.get(INSTRUMENTATION_ENV, "").lower() in ("1", "true", "yes", "on")
+_lock = threading.Lock()
+# Per-thread state: the span stack, the enabled override and the current run
+_local = threading.local()
+
+class _Metrics:
+    """
+    Span timings and counters accumulated since a reset.
+    """
+
+    def __init__(self, name=None):
+        self.name = name
+        self.started = time.time()
+        # span name -> [calls, total seconds, self seconds, max seconds]
+        self.spans = {}
+        self.counters = {}
+
+    def as_dict(self):
+        """
+        Returns:
+            dict: Spans (calls, total_s, self_s, max_s) and counters
+        """
+        return {
+            "name": self.name,
+            "started": self.started,
+            "elapsed_s": round(time.time() - self.started, 6),
+            "spans": {
+                name: {"calls": calls, "total_s": round(total, 6), "self_s": round(own, 6), "max_s": round(longest, 6)}
+                for name, (calls, total, own, longest) in self.spans.items()
+            },
+            "counters": dict(self.counters)
+        }
+
+_totals = _Metrics()
+
+def _current_run():
+    """
+    Get the run recorded by this thread (each Streamlit session renders in its own thread).
+
+    Returns:
+        _Metrics: Current run, or None if start_run was not called on this thread
+    """
+    return getattr(_local, "run", None)
+
+def _record(metrics, name, elapsed, own):
+    """
+    Add one span call to a set of metrics.
+
+    Args:
+        metrics (_Metrics): Totals or a run
+        name (str): Stage name
+        elapsed (float): Wall time including nested spans
+        own (float): Wall time excluding nested spans
+    """
+    entry = metrics.spans.get(name)
+    if entry is None:
+        metrics.spans[name] = [1, elapsed, own, elapsed]
+    else:
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] += own
+        if elapsed > entry[3]:
+            entry[3] = elapsed
+
+class _Span:
+    """
+    Timer for one stage. Time spent in nested spans is subtracted from
+    this span's self time so per-stage self times add up.
+    """
+    __slots__ = ("name", "start", "children")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.children = 0.0
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        stack = _local.stack
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+
+        own = elapsed - self.children
+        with _lock:
+            _record(_totals, self.name, elapsed, own)
+        run = _current_run()
+        if run is not None:
+            _record(run, self.name, elapsed, own)
+        return False
+
+class _NullSpan:
+    """
+    Span used while instrumentation is off.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+def enabled():
+    """
+    Check whether instrumentation is on.
+
+    Returns:
+        bool: True if spans and counters are being recorded on this thread
+    """
+    return getattr(_local, "enabled", _enabled)
+
+def set_enabled(value):
+    """
+    Turn instrumentation on or off for the whole process. Threads with
+    their own setting (Streamlit page runs) keep it.
+
+    Args:
+        value (bool): Whether to record spans and counters
+    """
+    global _enabled
+    _enabled = bool(value)
+
+def span(name):
+    """
+    Time a block of code as a named stage.
+
+    Args:
+        name (str): Stage name, e.g. 'news.search'
+
+    Returns:
+        context manager: Records the block's time when instrumentation is on
+    """
+    if not getattr(_local, "enabled", _enabled):
+        return _NULL_SPAN
+    return _Span(name)
+
+def timed(name):
+    """
+    Time every call of a function as a named stage.
+    When instrumentation is off the wrapper only checks a flag.
+
+    Args:
+        name (str): Stage name, e.g. 'sentiment.analyze'
+
+    Returns:
+        callable: Decorator
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not getattr(_local, "enabled", _enabled):
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def increment(name, value=1):
+    """
+    Add to a named counter (calls, bytes, cache hits, retries, ...).
+
+    Args:
+        name (str): Counter name, e.g. 'gemini.retries'
+        value (float): Amount to add
+    """
+    if not getattr(_local, "enabled", _enabled):
+        return
+    with _lock:
+        _totals.counters[name] = _totals.counters.get(name, 0) + value
+    run = _current_run()
+    if run is not None:
+        run.counters[name] = run.counters.get(name, 0) + value
+
+def start_run(name=None):
+    """
+    Start a new run (e.g. one page render) on this thread; its breakdown is
+    kept separately from the process-wide totals and from other sessions' runs.
+
+    Args:
+        name (str): Run label shown in the debug panel
+    """
+    _local.run = _Metrics(name)
+
+def reset():
+    """
+    Clear all recorded totals and this thread's current run.
+    """
+    global _totals
+    with _lock:
+        _totals = _Metrics()
+    _local.run = _Metrics()
+
+def snapshot(run=False):
+    """
+    Get recorded spans and counters.
+
+    Args:
+        run (bool): Return this thread's current run instead of the totals since the last reset
+
+    Returns:
+        dict: 'spans' (calls, total_s, self_s, max_s per stage) and 'counters'
+    """
+    if run:
+        return (_current_run() or _Metrics()).as_dict()
+    with _lock:
+        return _totals.as_dict()
+
+def to_json(run=False):
+    """
+    Export recorded metrics as JSON.
+
+    Args:
+        run (bool): Export the current run instead of the totals
+
+    Returns:
+        str: JSON document
+    """
+    return json.dumps(snapshot(run), indent=2)
+
+def _label(value):
+    """
+    Escape a Prometheus label value.
+
+    Args:
+        value (str): Raw value
+
+    Returns:
+        str: Escaped value
+    """
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def to_prometheus():
+    """
+    Export the totals in the Prometheus text exposition format.
+
+    Returns:
+        str: Metrics text
+    """
+    data = snapshot()
+    spans = sorted(data["spans"].items())
+    metrics = [
+        ("span_calls_total", "counter", "Calls per instrumented stage.", "calls"),
+        ("span_seconds_total", "counter", "Wall time per stage, including nested stages.", "total_s"),
+        ("span_self_seconds_total", "counter", "Wall time per stage, excluding nested stages.", "self_s"),
+        ("span_max_seconds", "gauge", "Longest single call per stage.", "max_s")
+    ]
+
+    lines = []
+    for metric, kind, help_text, field in metrics:
+        lines.append(f"# HELP {METRIC_PREFIX}_{metric} {help_text}")
+        lines.append(f"# TYPE {METRIC_PREFIX}_{metric} {kind}")
+        for name, values in spans:
+            lines.append(f"{METRIC_PREFIX}_{metric}{{span=\"{_label(name)}\"}} {values[field]}")
+
+    lines.append(f"# HELP {METRIC_PREFIX}_events_total Instrumentation counters (calls, bytes, cache hits, retries).")
+    lines.append(f"# TYPE {METRIC_PREFIX}_events_total counter")
+    for name, value in sorted(data["counters"].items()):
+        lines.append(f"{METRIC_PREFIX}_events_total{{name=\"{_label(name)}\"}} {value}")
+
+    return "\n".join(lines) + "\n"
+
+def start_page_run(name):
+    """
+    Start timing a Streamlit page render. Instrumentation follows this
+    session's sidebar toggle drawn by show_debug_panel (off until it is
+    ticked, unless SENTIGRADE_INSTRUMENTATION is set); the setting and the
+    run only apply to the thread rendering this session.
+
+    Args:
+        name (str): Page name shown in the debug panel
+    """
+    import streamlit as st
+
+    _local.enabled = bool(st.session_state.get(DEBUG_PANEL_KEY, _enabled))
+    start_run(name)
+
+def show_debug_panel():
+    """
+    Show the sidebar toggle and, when on, the current run's per-stage
+    breakdown. Call at the end of a page so the whole render is included.
+    """
+    import pandas as pd
+    import streamlit as st
+
+    st.sidebar.markdown("---")
+    st.sidebar.checkbox("Show timing breakdown", value=enabled(), key=DEBUG_PANEL_KEY)
+    if not enabled():
+        return
+
+    data = snapshot(run=True)
+    st.sidebar.subheader("Timing Breakdown")
+    st.sidebar.caption(f"{data['name'] or 'Last run'}: {data['elapsed_s'] * 1000:,.0f} ms")
+
+    if data["spans"]:
+        stages = pd.DataFrame([
+            {"stage": name, "calls": values["calls"], "self_ms": values["self_s"] * 1000,
+             "total_ms": values["total_s"] * 1000}
+            for name, values in data["spans"].items()
+        ]).sort_values("self_ms", ascending=False)
+        st.sidebar.dataframe(stages.round(1), hide_index=True, use_container_width=True)
+    else:
+        st.sidebar.info("No instrumented stages ran.")
+
+    if data["counters"]:
+        counters = pd.DataFrame(sorted(data["counters"].items()), columns=["counter", "value"])
+        st.sidebar.dataframe(counters, hide_index=True, use_container_width=True)
+
+    st.sidebar.download_button("Metrics (JSON)", to_json(run=True), "sentigrade_metrics.json", "application/json",
+                               key="metrics_json")
+    st.sidebar.download_button("Metrics (Prometheus)", to_prometheus(), "sentigrade_metrics.prom", "text/plain",
+                               key="metrics_prometheus")
@@ -1,7 +1,12 @@
 import re
 import string
 from utils.sentiment_analyzer import supported_languages
+from utils.instrumentation import timed
 
+# Language code -> language name, built once from supported_languages
+LANGUAGE_NAMES = {code: name for name, code in supported_languages.items()}
+
+@timed("language.detect")
 def detect_language(text):
     """
     Simple language detection for Southeast Asian languages.
@@ -72,7 +77,7 @@ def is_language_supported(language_code):
     Returns:
         bool: True if language is supported, False otherwise
     """
-    return language_code in supported_languages.values()
+    return language_code in LANGUAGE_NAMES
 
 def get_language_name(language_code):
     """
@@ -84,7 +89,4 @@ def get_language_name(language_code):
     Returns:
         str: Language name or None if not supported
     """
-    for name, code in supported_languages.items():
-        if code == language_code:
-            return name
-    return None
+    return LANGUAGE_NAMES.get(language_code)
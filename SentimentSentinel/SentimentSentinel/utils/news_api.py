@@ -1,11 +1,18 @@
 import streamlit as st
-from googleapiclient.discovery import build
 import pandas as pd
 import time
-import google.generativeai as genai
 import random
 import os
+import re
+import json
+import math
+import threading
 from typing import List, Dict, Any, Optional
+from utils.schema import apply_compact_schema
+from utils.scoring import CASCADE_MARGIN, score_cascade
+from utils.instrumentation import increment, span, timed
+from utils.result_cache import credential_scope, normalize_filters, shared_results
+from data.sea_countries import sea_countries
 
 def setup_api_keys():
     """
@@ -44,7 +51,52 @@ def setup_api_keys():
     
     return api_key, cse_id, gemini_api_key, api_configured
 
-def search_news(query: str, api_key: Optional[str], cse_id: Optional[str], max_results: int = 10) -> List[Dict[str, str]]:
+# Environment variables pointing the clients at another endpoint, such as the
+# offline stand-in in benchmarks.fake_google (unset for the real services)
+CSE_ENDPOINT_ENV = "GOOGLE_CSE_ENDPOINT"
+GEMINI_ENDPOINT_ENV = "GEMINI_ENDPOINT"
+
+def _build_search_service(api_key: str) -> Any:
+    """
+    Create a Custom Search client. The Google API client is imported here,
+    not at module load, so pages start without it.
+    
+    Args:
+        api_key (str): Google API Key
+        
+    Returns:
+        Any: Custom Search service
+    """
+    from googleapiclient.discovery import build
+    
+    endpoint = os.environ.get(CSE_ENDPOINT_ENV)
+    if endpoint:
+        return build("customsearch", "v1", developerKey=api_key, client_options={"api_endpoint": endpoint})
+    return build("customsearch", "v1", developerKey=api_key)
+
+# Southeast Asian country named in a query such as "Economy, Singapore"
+_COUNTRY_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(name) for name in sea_countries) + r")\b", re.IGNORECASE
+)
+
+def query_country(query: str) -> Optional[str]:
+    """
+    Get the country a news query is about, so articles can be faceted by country.
+    
+    Args:
+        query (str): Search query, e.g. "Economy, Singapore" or "Malaysia Politics"
+        
+    Returns:
+        Optional[str]: First Southeast Asian country named in the query, or None
+    """
+    match = _COUNTRY_PATTERN.search(query)
+    if match is None:
+        return None
+    return next(name for name in sea_countries if name.lower() == match.group(1).lower())
+
+@timed("news.search")
+def search_news(query: str, api_key: Optional[str], cse_id: Optional[str], max_results: int = 10,
+                raise_errors: bool = False) -> List[Dict[str, str]]:
     """
     Search for news articles related to a query using Google Custom Search API.
     
@@ -53,6 +105,8 @@ def search_news(query: str, api_key: Optional[str], cse_id: Optional[str], max_r
         api_key (Optional[str]): Google API Key
         cse_id (Optional[str]): Custom Search Engine ID
         max_results (int): Maximum number of results to return
+        raise_errors (bool): Raise API errors (quota, 5xx, network) instead of
+            showing them and returning no results
         
     Returns:
         List[Dict[str, str]]: List of news articles with title, link, and snippet
@@ -62,7 +116,7 @@ def search_news(query: str, api_key: Optional[str], cse_id: Optional[str], max_r
         return []
     
     try:
-        service = build("customsearch", "v1", developerKey=api_key)
+        service = _build_search_service(api_key)
         
         # Refine the query by replacing commas with 'AND' and adding quotes for exact phrase search
         keywords = [k.strip() for k in query.split(",")]
@@ -83,78 +137,269 @@ def search_news(query: str, api_key: Optional[str], cse_id: Optional[str], max_r
                         'source': item.get('displayLink', 'Unknown source'),
                         'date': item.get('publishedTime', 'Unknown date')  # This may not be available in all results
                     })
+            increment("news.search_results", len(news_articles))
             return news_articles
         else:
             return []
     except Exception as e:
+        if raise_errors:
+            raise
         st.error(f"Error searching news: {str(e)}")
         return []
 
-def gemini_analyze_sentiment(text: str, api_key: Optional[str]) -> float:
+# Gemini model used for headline scoring (must support JSON output)
+GEMINI_MODEL = "gemini-1.5-flash"
+
+# Attempts per headline, including the first call
+GEMINI_MAX_ATTEMPTS = 4
+
+# Exponential backoff: base delay and cap in seconds (full jitter is applied)
+GEMINI_BACKOFF_BASE = 0.5
+GEMINI_BACKOFF_MAX = 8.0
+
+# Retries shared by all headlines in one fetch, so a failing batch can't stall it
+GEMINI_RETRY_BUDGET = 20
+
+# HTTP status codes worth retrying (rate limits, timeouts and server errors)
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# First number in a response, allowing a Unicode minus sign
+_NUMBER_PATTERN = re.compile(r"[-+\u2212]?\d+(?:\.\d+)?")
+
+class RetryBudget:
+    """
+    Thread-safe pool of retries shared by the Gemini calls in one run.
+    """
+
+    def __init__(self, retries: int = GEMINI_RETRY_BUDGET):
+        """
+        Args:
+            retries (int): Retries available to the whole run
+        """
+        self.remaining = retries
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        """
+        Claim one retry.
+
+        Returns:
+            bool: True if a retry was available
+        """
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            self.used += 1
+            return True
+
+def parse_sentiment_response(text: Optional[str]) -> Optional[float]:
+    """
+    Extract a -10..10 sentiment score from a Gemini response.
+    Accepts the requested JSON ({"score": 3}) and falls back to the first
+    number in free text such as "Score: 3" or "-7/10".
+
+    Args:
+        text (Optional[str]): Response text
+
+    Returns:
+        Optional[float]: Score clamped to [-10, 10], or None if no number was found
+    """
+    if not text:
+        return None
+
+    value = None
+    try:
+        data = json.loads(text)
+        if isinstance(data, dict):
+            data = data.get("score", data.get("sentiment"))
+        if isinstance(data, (int, float)) and not isinstance(data, bool):
+            value = float(data)
+    except ValueError:
+        pass
+
+    if value is None:
+        match = _NUMBER_PATTERN.search(text)
+        if match is None:
+            return None
+        value = float(match.group().replace("\u2212", "-"))
+
+    if math.isnan(value):
+        return None
+    return max(-10.0, min(10.0, value))
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Decide whether a Gemini error is worth retrying.
+
+    Args:
+        error (Exception): Raised error
+
+    Returns:
+        bool: True for rate limits, timeouts, server errors and dropped connections
+    """
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    # google.api_core exceptions carry the HTTP status as 'code'
+    return getattr(error, "code", None) in TRANSIENT_STATUS_CODES
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Get the wait before a retry: exponential backoff with full jitter.
+
+    Args:
+        attempt (int): Number of attempts made so far (1 after the first call)
+
+    Returns:
+        float: Seconds to wait
+    """
+    return random.uniform(0, min(GEMINI_BACKOFF_MAX, GEMINI_BACKOFF_BASE * 2 ** (attempt - 1)))
+
+# Gemini clients kept per API key (oldest dropped beyond this many keys)
+GEMINI_CLIENT_CACHE_SIZE = 64
+
+_gemini_clients: Dict[Any, Any] = {}
+_gemini_clients_lock = threading.Lock()
+
+def _gemini_client(api_key: str) -> Any:
+    """
+    Get the Gemini client bound to one API key.
+    genai.configure sets a process-wide key that models pick up lazily, so
+    concurrent sessions (and scoring service threads) with different keys
+    could send requests under each other's key; each key gets its own
+    client instead.
+    
+    Args:
+        api_key (str): Gemini API Key
+        
+    Returns:
+        Any: GenerativeServiceClient that authenticates with this key
+    """
+    import google.ai.generativelanguage as glm
+    
+    endpoint = os.environ.get(GEMINI_ENDPOINT_ENV)
+    key = (api_key, endpoint)
+    with _gemini_clients_lock:
+        client = _gemini_clients.get(key)
+        if client is None:
+            if endpoint:
+                # The REST transport also accepts plain-HTTP endpoints
+                client = glm.GenerativeServiceClient(
+                    transport="rest", client_options={"api_key": api_key, "api_endpoint": endpoint}
+                )
+            else:
+                client = glm.GenerativeServiceClient(client_options={"api_key": api_key})
+            while len(_gemini_clients) >= GEMINI_CLIENT_CACHE_SIZE:
+                _gemini_clients.pop(next(iter(_gemini_clients)))
+            _gemini_clients[key] = client
+    return client
+
+def _create_gemini_model(api_key: str) -> Any:
+    """
+    Create the scoring model, bound to its own client for this API key
+    (see _gemini_client). The Gemini SDK is imported on first use, not at
+    module load.
+    
+    Args:
+        api_key (str): Gemini API Key
+        
+    Returns:
+        Any: Gemini model that answers in JSON
+    """
+    import google.generativeai as genai
+    
+    # Ask for JSON so the score can be read without guessing
+    model = genai.GenerativeModel(
+        GEMINI_MODEL,
+        generation_config={"response_mime_type": "application/json", "temperature": 0}
+    )
+    # Attach the key's client so the model never falls back to the global configuration
+    model._client = _gemini_client(api_key)
+    return model
+
+@timed("gemini.score")
+def gemini_analyze_sentiment(text: str, api_key: Optional[str], retry_budget: Optional[RetryBudget] = None,
+                             max_attempts: int = GEMINI_MAX_ATTEMPTS) -> float:
     """
     Analyze sentiment of text using Google Gemini API.
+    Transient errors and unparseable responses are retried with backoff
+    while the retry budget lasts; permanent errors are not retried.
     
     Args:
         text (str): Text to analyze sentiment for
         api_key (Optional[str]): Gemini API Key
+        retry_budget (Optional[RetryBudget]): Retries shared across a run (None allows
+            up to max_attempts for this call alone)
+        max_attempts (int): Maximum attempts for this text
         
     Returns:
-        float: Sentiment score between -10 (negative) and 10 (positive)
+        float: Sentiment score between -1 (negative) and 1 (positive), or NaN if
+            the text could not be scored
     """
     if not api_key:
-        st.error("Gemini API Key not configured.")
-        return 0.0
+        return float("nan")
     
-    try:
-        # Initialize the Gemini client
-        genai.configure(api_key=api_key)
-        
-        # Set up the model
-        model = genai.GenerativeModel('gemini-pro')
-        
-        # Request Gemini to return only a sentiment score
-        prompt = f"""Please analyze the sentiment of the following headline and return only a single number 
-        between -10 (very negative) and 10 (very positive). The number should reflect the sentiment score.
-        No explanation, just a number.
-        
-        Headline: {text}
-        """
-        
-        response = model.generate_content(prompt)
-        
-        # Extract the sentiment score and convert to float
+    if retry_budget is None:
+        retry_budget = RetryBudget(max_attempts - 1)
+    
+    # Initialize the Gemini client
+    model = _create_gemini_model(api_key)
+    prompt = f"""Rate the sentiment of the following headline from -10 (very negative) to 10 (very positive).
+    Respond with JSON of the form {{"score": <number>}} and nothing else.
+    
+    Headline: {text}
+    """
+    
+    for attempt in range(1, max_attempts + 1):
+        increment("gemini.calls")
+        increment("gemini.bytes_sent", len(prompt))
         try:
-            sentiment_score = float(response.text.strip())
-            
-            # Ensure the score is in the range [-10, 10]
-            sentiment_score = max(-10, min(10, sentiment_score))
-            
-            # Normalize to range [-1, 1] for consistency with our app
-            normalized_score = sentiment_score / 10
-            
-            return normalized_score
-            
-        except ValueError:
-            st.warning(f"Could not convert sentiment response to number: {response.text}")
-            return 0.0
-            
-    except Exception as e:
-        st.error(f"Error with Gemini API: {str(e)}")
-        return 0.0
+            # Disable the SDK's own retries so only this loop and the budget retry
+            response = model.generate_content(prompt, request_options={"retry": None})
+            increment("gemini.bytes_received", len(response.text or ""))
+            score = parse_sentiment_response(response.text)
+            if score is not None:
+                # Normalize to range [-1, 1] for consistency with our app
+                return score / 10
+        except Exception as e:
+            if not is_transient_error(e):
+                increment("gemini.failures")
+                return float("nan")
+        
+        # Unparseable responses and transient errors are retried
+        if attempt == max_attempts or not retry_budget.take():
+            break
+        increment("gemini.retries")
+        with span("gemini.backoff"):
+            time.sleep(backoff_delay(attempt))
+    
+    increment("gemini.failures")
+    return float("nan")
 
+@timed("news.fetch")
 def fetch_and_analyze_news(queries: List[str], 
                           max_results_per_query: int = 5,
-                          with_progress: bool = True) -> pd.DataFrame:
+                          with_progress: bool = True,
+                          escalation_margin: float = CASCADE_MARGIN,
+                          use_cache: bool = True) -> pd.DataFrame:
     """
     Fetch news for multiple queries and analyze sentiment.
+    Results are shared between sessions through the process-wide result
+    cache, keyed by the normalized queries and the session's API keys, so
+    identical requests from different users are fetched and scored once.
     
     Args:
         queries (List[str]): List of search queries
         max_results_per_query (int): Maximum results per query
         with_progress (bool): Whether to show a progress bar
+        escalation_margin (float): Local scores within this distance of a category
+            boundary (and all non-English headlines) are rescored with Gemini
+        use_cache (bool): Whether to use and fill the shared result cache
         
     Returns:
-        pd.DataFrame: DataFrame with news and sentiment data
+        pd.DataFrame: DataFrame with news and sentiment data; 'score_source' records
+            whether each score came from the local analyzer or Gemini
     """
     # Setup API keys
     api_key, cse_id, gemini_api_key, api_configured = setup_api_keys()
@@ -163,7 +408,55 @@ def fetch_and_analyze_news(queries: List[str],
         st.error("API keys not configured. Please set GOOGLE_API_KEY and GOOGLE_CSE_ID environment variables.")
         return pd.DataFrame()
     
+    def compute() -> pd.DataFrame:
+        return _fetch_and_score(queries, api_key, cse_id, gemini_api_key, max_results_per_query,
+                                with_progress, escalation_margin)
+    
+    if use_cache:
+        key = (
+            "news",
+            normalize_filters(queries=queries, max_results_per_query=max_results_per_query,
+                              escalation_margin=escalation_margin),
+            credential_scope(api_key, cse_id, gemini_api_key)
+        )
+        # Results missing a failed query's headlines are returned but not cached
+        df = shared_results.get_or_compute(key, compute,
+                                           cacheable=lambda result: not result.attrs.get("failed_queries"))
+    else:
+        df = compute()
+    
+    failed_queries = df.attrs.get("failed_queries")
+    if failed_queries:
+        st.warning(f"News search failed for {len(failed_queries)} of {len(queries)} queries; "
+                   f"results are incomplete and will be fetched again on the next request.")
+    escalated, scored = df.attrs.get("escalated"), df.attrs.get("scored")
+    if scored:
+        st.caption(f"Gemini rescored {escalated} of {scored} headlines ({escalated / scored:.0%}); "
+                   f"the rest were scored locally.")
+    return df
+
+def _fetch_and_score(queries: List[str], api_key: str, cse_id: str, gemini_api_key: Optional[str],
+                     max_results_per_query: int, with_progress: bool, escalation_margin: float) -> pd.DataFrame:
+    """
+    Search every query and score the headlines (uncached).
+    
+    Args:
+        queries (List[str]): List of search queries
+        api_key (str): Google API key
+        cse_id (str): Custom Search Engine ID
+        gemini_api_key (Optional[str]): Gemini API key
+        max_results_per_query (int): Maximum results per query
+        with_progress (bool): Whether to show a progress bar
+        escalation_margin (float): Margin passed to score_cascade
+        
+    Returns:
+        pd.DataFrame: News and sentiment data; attrs hold the number of
+            headlines scored and escalated to Gemini and the queries whose
+            search failed
+    """
     all_news = []
+    failed_queries = []
+    escalated = 0
     progress_bar = None
     progress_text = None
     
@@ -177,38 +470,52 @@ def fetch_and_analyze_news(queries: List[str],
         if with_progress and progress_text is not None:
             progress_text.text(f"Searching for news related to: {query}")
         
-        # Search for news
-        if api_key is not None and cse_id is not None:
-            news_articles = search_news(query, api_key, cse_id, max_results_per_query)
-            
-            # Process each article
-            for article in news_articles:
-                if with_progress and progress_text is not None:
-                    progress_text.text(f"Analyzing sentiment for: {article['title']}")
-                
-                # Analyze sentiment
-                sentiment_score = 0.0
-                if gemini_api_key is not None:
-                    sentiment_score = gemini_analyze_sentiment(article['title'], gemini_api_key)
-                
-                # Add to results
-                all_news.append({
-                    'query': query,
-                    'title': article['title'],
-                    'link': article['link'],
-                    'snippet': article['snippet'],
-                    'source': article['source'],
-                    'date': article['date'],
-                    'sentiment_score': sentiment_score
-                })
-                
-                # Add a small delay to avoid hitting API rate limits
-                time.sleep(random.uniform(0.5, 1.5))
+        # Search for news, remembering failed queries so the partial result isn't cached
+        try:
+            news_articles = search_news(query, api_key, cse_id, max_results_per_query, raise_errors=True)
+        except Exception as e:
+            st.error(f"Error searching news: {str(e)}")
+            increment("news.search_failures")
+            failed_queries.append(query)
+            news_articles = []
+        
+        # Add to results, tagged with the query's country for the search facets
+        country = query_country(query)
+        for article in news_articles:
+            all_news.append({
+                'query': query,
+                'country': country,
+                'title': article['title'],
+                'link': article['link'],
+                'snippet': article['snippet'],
+                'source': article['source'],
+                'date': article['date']
+            })
         
         # Update progress
         if with_progress and progress_bar is not None and len(queries) > 0:
             progress_bar.progress((i + 1) / len(queries))
     
+    # Score every headline locally, sending only uncertain ones to Gemini
+    if all_news:
+        if with_progress and progress_text is not None:
+            progress_text.text(f"Analyzing sentiment for {len(all_news)} headlines...")
+        
+        with span("news.score"):
+            results = score_cascade(
+                [article['title'] for article in all_news], gemini_api_key,
+                margin=escalation_margin, retry_budget=RetryBudget()
+            )
+        for article, result in zip(all_news, results):
+            article['sentiment_score'] = result['score']
+            article['language'] = result['language']
+            article['score_source'] = result['source']
+            article['scorer_version'] = result['scorer_version']
+            article['text_hash'] = result['text_hash']
+        
+        escalated = sum(result['escalated'] for result in results)
+        increment("news.escalated", escalated)
+    
     # Clear progress indicators
     if with_progress:
         if progress_bar is not None:
@@ -218,24 +525,12 @@ def fetch_and_analyze_news(queries: List[str],
     
     # Create DataFrame
     if all_news:
-        df = pd.DataFrame(all_news)
-        return df
-    else:
-        return pd.DataFrame()
-
-def categorize_sentiment(score: float) -> str:
-    """
-    Categorize sentiment score into positive, neutral, or negative.
-    
-    Args:
-        score (float): Sentiment score between -1 and 1
-        
-    Returns:
-        str: Sentiment category ('positive', 'neutral', or 'negative')
-    """
-    if score >= 0.05:
-        return "positive"
-    elif score <= -0.05:
-        return "negative"
+        with span("news.build_frame"):
+            df = pd.DataFrame(all_news)
+            # Cast to the memory-compact schema
+            df = apply_compact_schema(df)
+        df.attrs.update(scored=len(all_news), escalated=escalated)
     else:
-        return "neutral"
\ No newline at end of file
+        df = pd.DataFrame()
+    df.attrs["failed_queries"] = failed_queries
+    return df
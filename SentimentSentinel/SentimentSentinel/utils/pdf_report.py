@@ -0,0 +1,151 @@
+import datetime
+from utils.sentiment_analyzer import categorize_sentiment_array
+
+# A4 page size in points
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+
+# Text layout
+MARGIN = 50
+FONT_SIZE = 10
+LINE_HEIGHT = 14
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT
+
+def _escape_pdf_text(text):
+    """
+    Escape text for use inside a PDF string literal.
+    The built-in Helvetica font only covers Latin-1, so other characters
+    are replaced.
+
+    Args:
+        text (str): Text to escape
+
+    Returns:
+        str: Escaped text
+    """
+    text = str(text).encode('latin-1', errors='replace').decode('latin-1')
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+def _summarize(data, max_rows=10):
+    """
+    Build the text lines of the sentiment summary report.
+
+    Args:
+        data (DataFrame): Scored data
+        max_rows (int): Maximum rows listed per breakdown table
+
+    Returns:
+        list: Lines of report text
+    """
+    lines = [
+        f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}",
+        f"Total records: {len(data)}",
+        ""
+    ]
+
+    if 'sentiment_score' not in data.columns:
+        lines.append("No sentiment scores available.")
+        return lines
+
+    scores = data['sentiment_score']
+    lines.append(f"Average sentiment: {scores.mean():.3f}")
+    lines.append(f"Score range: {scores.min():.3f} to {scores.max():.3f}")
+    lines.append("")
+
+    # Sentiment distribution
+    if 'sentiment_category' in data.columns:
+        categories = data['sentiment_category'].astype(str)
+    elif 'sentiment' in data.columns:
+        categories = data['sentiment'].astype(str)
+    else:
+        categories = categorize_sentiment_array(scores)
+
+    lines.append("Sentiment Distribution")
+    counts = categories.value_counts()
+    for category in ["positive", "neutral", "negative"]:
+        count = int(counts.get(category, 0))
+        share = 100 * count / len(data)
+        lines.append(f"    {category.capitalize():<10} {count:>8}  ({share:.1f}%)")
+    lines.append("")
+
+    # Breakdowns by source and topic
+    for column, heading in [('source', "Top Sources"), ('query', "Top Topics")]:
+        if column not in data.columns:
+            continue
+
+        summary = data.groupby(column, observed=True)['sentiment_score'].agg(['count', 'mean'])
+        summary = summary.sort_values('count', ascending=False).head(max_rows)
+
+        lines.append(f"{heading} (articles, average sentiment)")
+        for name, row in summary.iterrows():
+            lines.append(f"    {str(name)[:60]:<60} {int(row['count']):>6}  {row['mean']:+.3f}")
+        lines.append("")
+
+    return lines
+
+def create_pdf_report(data, title="Sentigrade Sentiment Report"):
+    """
+    Create a PDF summary report for scored data.
+    The PDF is written directly using the built-in Helvetica font so no
+    extra dependency is required.
+
+    Args:
+        data (DataFrame): Scored data
+        title (str): Report title
+
+    Returns:
+        bytes: PDF document
+    """
+    lines = _summarize(data)
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+
+    # Objects 1-3 are the catalog, page tree and font; each page adds a page and a content stream
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{pid} 0 R' for pid in page_ids)}] /Count {len(pages)} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+    ]
+
+    for page_number, page_lines in enumerate(pages):
+        y = PAGE_HEIGHT - MARGIN
+        commands = ["BT"]
+        if page_number == 0:
+            commands.append(f"/F1 16 Tf 1 0 0 1 {MARGIN} {y} Tm ({_escape_pdf_text(title)}) Tj")
+            y -= 2 * LINE_HEIGHT
+        commands.append(f"/F1 {FONT_SIZE} Tf")
+        for line in page_lines:
+            commands.append(f"1 0 0 1 {MARGIN} {y} Tm ({_escape_pdf_text(line)}) Tj")
+            y -= LINE_HEIGHT
+        commands.append("ET")
+        stream = "\n".join(commands).encode('latin-1')
+
+        content_id = page_ids[page_number] + 1
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        objects.append(stream)
+
+    # Serialize objects and build the cross-reference table
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode('latin-1')
+        if isinstance(obj, bytes):
+            output += f"<< /Length {len(obj)} >>\nstream\n".encode('latin-1') + obj + b"\nendstream"
+        else:
+            output += obj.encode('latin-1')
+        output += b"\nendobj\n"
+
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode('latin-1')
+    output += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode('latin-1')
+
+    return bytes(output)
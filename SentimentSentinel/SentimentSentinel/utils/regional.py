@@ -0,0 +1,262 @@
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+from data.sea_countries import (
+    COUNTRY_ORDER, REGION_MASKS, country_code_categorical, country_internet_penetration, country_population
+)
+
+# Default time bucket (fixed pandas frequency, or a calendar period such as 'W')
+REGION_BUCKET = "1D"
+
+# Calendar-week bucket; weekly periods start on Monday (fixed '7D' buckets start on Thursdays)
+WEEKLY_BUCKET = "W"
+
+# Bootstrap replicates per bucket and confidence interval coverage
+BOOTSTRAP_SAMPLES = 1000
+REGION_INTERVAL = 0.95
+
+# Buckets bootstrapped together (bounds the replicate array to samples x chunk x countries)
+BOOTSTRAP_CHUNK_BUCKETS = 256
+
+# Maximum number of per-bucket results kept in the cache
+REGION_CACHE_SIZE = 4096
+
+# Regional results per bucket, keyed by the bucket's rollup contents
+_region_cache = {}
+_region_cache_lock = threading.Lock()
+
+def online_user_weights():
+    """
+    Get each country's online population (population x internet penetration).
+
+    Returns:
+        ndarray: Millions of internet users per country, in COUNTRY_ORDER
+    """
+    return np.array([
+        country_population[code] * country_internet_penetration[code] / 100 for code in COUNTRY_ORDER
+    ])
+
+def region_membership():
+    """
+    Expand the region bitmasks into a membership matrix.
+
+    Returns:
+        tuple: (region names, float array of shape (regions, countries) with 1
+            where the country belongs to the region)
+    """
+    regions = list(REGION_MASKS)
+    bits = np.arange(len(COUNTRY_ORDER))
+    membership = np.array([(mask >> bits) & 1 for mask in REGION_MASKS.values()], dtype=np.float64)
+    return regions, membership
+
+def bucket_starts(dates, bucket=REGION_BUCKET):
+    """
+    Map dates to the start of their time bucket.
+    Fixed frequencies ('1h', '1D') floor the dates; calendar frequencies
+    ('W', 'MS') use periods, so weeks start on Monday instead of on the
+    epoch's weekday as a '7D' floor would.
+
+    Args:
+        dates (Series): Datetime values
+        bucket (str): Bucket as a pandas frequency
+
+    Returns:
+        Series: Bucket start per date (NaT stays NaT)
+    """
+    if isinstance(pd.tseries.frequencies.to_offset(bucket), pd.offsets.Tick):
+        return dates.dt.floor(bucket)
+    return dates.dt.to_period(bucket).dt.start_time
+
+def country_rollups(df, date_column='date', value_column='sentiment_score', country_column='country',
+                    bucket=REGION_BUCKET):
+    """
+    Roll rows up to count, sum and sum of squares per time bucket and country.
+    Rows with a missing value or date, or an unknown country, are left out.
+
+    Args:
+        df (DataFrame): Scored rows
+        date_column (str): Column containing dates
+        value_column (str): Numeric column to aggregate
+        country_column (str): Column holding country names or ISO codes
+        bucket (str): Bucket as a pandas frequency (e.g. '1h', '1D', or 'W' for Monday-based weeks)
+
+    Returns:
+        tuple: (DatetimeIndex of bucket starts, count, sum and sum of squares
+            arrays of shape (buckets, countries) in COUNTRY_ORDER)
+    """
+    dates = bucket_starts(pd.to_datetime(df[date_column]), bucket)
+    bucket_codes, buckets = pd.factorize(dates, sort=True)
+    country_codes = country_code_categorical(df[country_column]).codes.astype(np.int64)
+    values = df[value_column].to_numpy(dtype=np.float64)
+
+    valid = (bucket_codes >= 0) & (country_codes >= 0) & ~np.isnan(values)
+    shape = (len(buckets), len(COUNTRY_ORDER))
+    flat = bucket_codes[valid] * shape[1] + country_codes[valid]
+    length = shape[0] * shape[1]
+    values = values[valid]
+
+    count = np.bincount(flat, minlength=length).reshape(shape).astype(np.float64)
+    total = np.bincount(flat, weights=values, minlength=length).reshape(shape)
+    total_sq = np.bincount(flat, weights=values * values, minlength=length).reshape(shape)
+    return pd.DatetimeIndex(buckets), count, total, total_sq
+
+def _bootstrap_regions(count, total, total_sq, weights, membership, samples, interval, seed):
+    """
+    Compute weighted regional means and bootstrap intervals for a block of
+    buckets, every region at once.
+    Each replicate redraws every country's mean from its sampling
+    distribution (normal, with the country's standard error) and
+    re-weights the draws; countries with a single post borrow the bucket's
+    pooled variance. The same draws are reused for every bucket, so a
+    bucket's result does not depend on which other buckets it is computed
+    with.
+
+    Args:
+        count (ndarray): Posts per (bucket, country)
+        total (ndarray): Score sum per (bucket, country)
+        total_sq (ndarray): Sum of squared scores per (bucket, country)
+        weights (ndarray): Weight per country
+        membership (ndarray): Region membership matrix (regions, countries)
+        samples (int): Bootstrap replicates
+        interval (float): Confidence interval coverage
+        seed (int): Random seed
+
+    Returns:
+        dict: Arrays of shape (buckets, regions): 'posts', 'countries',
+            'online_users', 'mean' (post-weighted), 'weighted_mean', 'lower', 'upper'
+    """
+    observed = count > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(observed, total / count, 0.0)
+        variance = np.where(count > 1, (total_sq - count * mean * mean) / (count - 1), np.nan)
+
+        # Pooled within-bucket variance for countries with a single post
+        posts = count.sum(axis=1, keepdims=True)
+        pooled = (total_sq.sum(axis=1, keepdims=True) - total.sum(axis=1, keepdims=True) ** 2 / posts) / (posts - 1)
+        pooled = np.where(posts > 1, pooled, 0.0)
+        variance = np.where(np.isnan(variance), pooled, variance)
+        std_error = np.where(observed, np.sqrt(np.maximum(variance, 0.0) / count), 0.0)
+
+    # Weights of the countries observed in each bucket
+    bucket_weights = weights * observed
+    region_weight = bucket_weights @ membership.T
+
+    draws = np.random.default_rng(seed).standard_normal((samples, 1, count.shape[1]))
+    replicates = np.clip(mean + draws * std_error, -1, 1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weighted_mean = (mean * bucket_weights) @ membership.T / region_weight
+        replicate_means = (replicates * bucket_weights) @ membership.T / region_weight
+        post_mean = total @ membership.T / (count @ membership.T)
+
+    tail = (1 - interval) / 2
+    lower, upper = np.quantile(replicate_means, [tail, 1 - tail], axis=0)
+
+    return {
+        'posts': (count @ membership.T).astype(np.int64),
+        'countries': (observed @ membership.T).astype(np.int64),
+        'online_users': region_weight,
+        'mean': post_mean,
+        'weighted_mean': weighted_mean,
+        'lower': lower,
+        'upper': upper
+    }
+
+def _bucket_key(count, total, total_sq, weights, samples, interval, seed):
+    """
+    Build the cache key for one bucket's rollups.
+
+    Args:
+        count (ndarray): Posts per country in the bucket
+        total (ndarray): Score sum per country in the bucket
+        total_sq (ndarray): Sum of squared scores per country in the bucket
+        weights (ndarray): Weight per country
+        samples (int): Bootstrap replicates
+        interval (float): Confidence interval coverage
+        seed (int): Random seed
+
+    Returns:
+        tuple: Hashable key
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for array in (count, total, total_sq, weights):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return (digest.hexdigest(), samples, interval, seed)
+
+def clear_regional_cache():
+    """
+    Clear all cached regional results.
+    """
+    with _region_cache_lock:
+        _region_cache.clear()
+
+def regional_aggregates(df, date_column='date', value_column='sentiment_score', country_column='country',
+                        bucket=REGION_BUCKET, samples=BOOTSTRAP_SAMPLES, interval=REGION_INTERVAL, seed=0,
+                        use_cache=True):
+    """
+    Compute sentiment for every region in country_regions per time bucket,
+    weighting each country's mean score by its online population rather
+    than by its post count, with bootstrap confidence intervals.
+    Rows are rolled up per bucket and country once; all regions are then
+    derived from the rollups with one matrix product. Results are cached
+    per bucket, so appending new data only bootstraps the buckets whose
+    rollups changed.
+
+    Args:
+        df (DataFrame): Scored rows
+        date_column (str): Column containing dates
+        value_column (str): Numeric column to aggregate
+        country_column (str): Column holding country names or ISO codes
+        bucket (str): Bucket as a pandas frequency (e.g. '1h', '1D', or 'W' for Monday-based weeks)
+        samples (int): Bootstrap replicates per bucket
+        interval (float): Confidence interval coverage
+        seed (int): Random seed
+        use_cache (bool): Whether to reuse and update cached bucket results
+
+    Returns:
+        DataFrame: One row per bucket and region with at least one observed
+            country: date, 'region', 'posts', 'countries', 'online_users'
+            (millions), 'mean' (post-weighted), 'weighted_mean', 'lower', 'upper'
+    """
+    regions, membership = region_membership()
+    columns = [date_column, 'region', 'posts', 'countries', 'online_users', 'mean', 'weighted_mean', 'lower', 'upper']
+    if df is None or df.empty:
+        return pd.DataFrame(columns=columns)
+
+    buckets, count, total, total_sq = country_rollups(df, date_column, value_column, country_column, bucket)
+    weights = online_user_weights()
+    keys = [_bucket_key(count[i], total[i], total_sq[i], weights, samples, interval, seed) for i in range(len(buckets))]
+    if use_cache:
+        with _region_cache_lock:
+            results = [_region_cache.get(key) for key in keys]
+    else:
+        results = [None] * len(keys)
+
+    # Bootstrap the buckets that are not cached, in blocks
+    missing = np.array([i for i, result in enumerate(results) if result is None], dtype=np.int64)
+    for start in range(0, len(missing), BOOTSTRAP_CHUNK_BUCKETS):
+        block = missing[start:start + BOOTSTRAP_CHUNK_BUCKETS]
+        computed = _bootstrap_regions(count[block], total[block], total_sq[block], weights, membership,
+                                      samples, interval, seed)
+        for offset, i in enumerate(block):
+            results[i] = {name: array[offset] for name, array in computed.items()}
+        if use_cache:
+            # Sessions share the cache, so lookups, inserts and evictions take the lock
+            with _region_cache_lock:
+                for i in block:
+                    while len(_region_cache) >= REGION_CACHE_SIZE:
+                        # Evict the oldest entry
+                        _region_cache.pop(next(iter(_region_cache)))
+                    _region_cache[keys[i]] = results[i]
+
+    if not results:
+        return pd.DataFrame(columns=columns)
+
+    stacked = {name: np.stack([result[name] for result in results]) for name in results[0]}
+    regional = pd.DataFrame({
+        date_column: np.repeat(buckets.to_numpy(), len(regions)),
+        'region': np.tile(regions, len(buckets)),
+        **{name: array.ravel() for name, array in stacked.items()}
+    })
+    return regional[regional['countries'] > 0].reset_index(drop=True)[columns]
@@ -0,0 +1,454 @@
+"""
+Incremental re-scoring of a scored store after a scorer or threshold change.
+
+The store is the output of utils.batch_scorer: a CSV or JSONL file, or a
+Parquet file or directory of part files. Every scored row carries a
+'scorer_version' and a 'text_hash' of its cleaned text. A row is stale
+when its version is not the current one for its language and source, or
+its text no longer matches its hash (rows scored before versioning are
+all stale). The job:
+
+1. scans the store and collects the distinct texts of stale rows,
+2. scores each of those texts once, in parallel batches,
+3. rewrites only the files that changed, recomputing every category from
+   the stored scores with the current thresholds,
+4. updates the rollups (per-grouping score aggregates kept next to the
+   store) by subtracting the old version of each changed row and adding
+   the new one.
+
+A threshold-only change makes no model calls: no row is stale and step 3
+recategorizes from the stored scores. Rows scored by Gemini are re-scored
+with Gemini only when --gemini is given; otherwise they are left as they
+are and reported as skipped. Each file is replaced atomically, so an
+interrupted run can simply be started again.
+
+Usage:
+    python -m utils.rescoring scored.csv --workers 8
+    python -m utils.rescoring scored_parquet/ --rollup country --rollup country,sentiment_category
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from utils.aggregation import empty_aggregates, update_aggregates
+from utils.batch_scorer import (
+    BATCH_CHUNK_SIZE, BATCH_FORMATS, infer_format, iter_input_chunks, join_text_columns, resolve_text_columns
+)
+from utils.scoring import score_batch, score_batch_gemini, scorer_version, text_hash
+from utils.sentiment_analyzer import categorize_sentiment_array
+
+# Rollups are kept next to the store in a directory with this suffix, one CSV per grouping
+ROLLUP_SUFFIX = ".rollups"
+
+# Score column aggregated by the rollups
+ROLLUP_VALUE_COLUMN = "sentiment_score"
+
+def store_files(path, format):
+    """
+    List the files that make up a store.
+
+    Args:
+        path (str): Store file, or directory of Parquet part files
+        format (str): 'csv', 'jsonl' or 'parquet'
+
+    Returns:
+        list: File paths in order
+    """
+    if format == "parquet" and os.path.isdir(path):
+        return sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.startswith("part-") and name.endswith(".parquet")
+        )
+    return [path]
+
+def _column(df, name):
+    """
+    Get a column as objects, or all None if the store doesn't have it yet.
+
+    Args:
+        df (DataFrame): Store rows
+        name (str): Column name
+
+    Returns:
+        Series: Column values
+    """
+    if name in df.columns:
+        values = df[name].astype(object)
+        return values.where(values.notna(), None)
+    # A list of Nones; pd.Series(None, dtype=object) would hold NaN, which scoring treats as a language
+    return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+def find_stale(df, text_columns, language_column="language"):
+    """
+    Find rows whose score is out of date.
+
+    Args:
+        df (DataFrame): Store rows
+        text_columns (list): Columns joined into each row's text
+        language_column (str): Column with language codes
+
+    Returns:
+        tuple: (texts, current text hashes, stale mask, mask of rows last scored by Gemini)
+    """
+    texts = join_text_columns(df, text_columns)
+    hashes = np.array([text_hash(text) for text in texts], dtype=object)
+
+    versions = _column(df, "scorer_version")
+    languages = _column(df, language_column)
+    gemini = versions.str.startswith("gemini:", na=False).to_numpy()
+
+    local_versions = {language: scorer_version(language) for language in languages.dropna().unique()}
+    expected = np.where(gemini, scorer_version(None, "gemini"), languages.map(local_versions).to_numpy())
+
+    stale = (
+        (versions.to_numpy() != expected)
+        | (_column(df, "text_hash").to_numpy() != hashes)
+        | languages.isna().to_numpy()
+    )
+    return texts, hashes, stale, gemini
+
+def _categories_differ(df):
+    """
+    Check which rows' stored categories disagree with their stored scores.
+
+    Args:
+        df (DataFrame): Store rows
+
+    Returns:
+        ndarray: Boolean mask
+    """
+    current = np.asarray(categorize_sentiment_array(df["sentiment_score"]), dtype=object)
+    stored = _column(df, "sentiment_category").to_numpy()
+    return ~((current == stored) | (pd.isna(current) & pd.isna(stored)))
+
+def _score_task(task):
+    """
+    Worker entry point: score one batch of distinct texts.
+
+    Args:
+        task (tuple): (texts, languages, gemini_api_key or None)
+
+    Returns:
+        list: (score, scorer version, language) per text; the version is None if the
+            text couldn't be scored
+    """
+    texts, languages, gemini_api_key = task
+    if gemini_api_key:
+        results = score_batch_gemini(texts, gemini_api_key)
+    else:
+        results = score_batch(texts, languages)
+    return [(result["score"], result["scorer_version"], result["language"]) for result in results]
+
+def _row_keys(df, stale, gemini, hashes, language_column, gemini_api_key):
+    """
+    Get the scoring key of each stale row. Rows with the same key share one score.
+
+    Args:
+        df (DataFrame): Store rows
+        stale (ndarray): Stale mask
+        gemini (ndarray): Rows last scored by Gemini
+        hashes (ndarray): Current text hashes
+        language_column (str): Column with language codes
+        gemini_api_key (str): Gemini key (None skips stale Gemini rows)
+
+    Returns:
+        dict: Row position -> (source, text hash, language) for every stale row that will be re-scored
+    """
+    languages = _column(df, language_column).to_numpy()
+    keys = {}
+    for position in np.flatnonzero(stale):
+        if gemini[position] and not gemini_api_key:
+            continue
+        source = "gemini" if gemini[position] else "local"
+        keys[position] = (source, hashes[position], languages[position])
+    return keys
+
+def load_rollups(directory, groupings):
+    """
+    Read stored rollups.
+
+    Args:
+        directory (str): Rollup directory
+        groupings (list): Groupings (tuples of column names) to read
+
+    Returns:
+        tuple: (dict of stored rollups, list of groupings with no stored rollup)
+    """
+    rollups, missing = {}, []
+    for grouping in groupings:
+        path = os.path.join(directory, "+".join(grouping) + ".csv")
+        if os.path.exists(path):
+            rollups[grouping] = pd.read_csv(path, dtype={column: str for column in grouping},
+                                            float_precision="round_trip")
+        else:
+            missing.append(grouping)
+    return rollups, missing
+
+def save_rollups(directory, rollups):
+    """
+    Write rollups atomically, one CSV per grouping.
+
+    Args:
+        directory (str): Rollup directory
+        rollups (dict): Grouping tuple -> aggregate DataFrame
+    """
+    os.makedirs(directory, exist_ok=True)
+    for grouping, aggregate in rollups.items():
+        path = os.path.join(directory, "+".join(grouping) + ".csv")
+        aggregate.to_csv(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+
+def _rollup_rows(df, columns):
+    """
+    Select the rollup columns with keys as strings, matching stored rollups.
+
+    Args:
+        df (DataFrame): Store rows
+        columns (list): Key columns used by any rollup
+
+    Returns:
+        DataFrame: Key columns and the score
+    """
+    rows = pd.DataFrame({column: df[column].astype(object).map(str, na_action="ignore") for column in columns})
+    rows[ROLLUP_VALUE_COLUMN] = df[ROLLUP_VALUE_COLUMN].to_numpy(dtype=np.float64)
+    return rows
+
+def _write_store_file(path, format, chunks):
+    """
+    Write a store file from chunks and atomically replace the old one.
+
+    Args:
+        path (str): File to replace
+        format (str): 'csv', 'jsonl' or 'parquet'
+        chunks (iterable): DataFrames to write, in order
+    """
+    temporary = path + ".tmp"
+    if format == "parquet":
+        pd.concat(list(chunks), ignore_index=True).to_parquet(temporary, index=False)
+    else:
+        with open(temporary, "w", encoding="utf-8", newline="") as f:
+            for index, chunk in enumerate(chunks):
+                if format == "csv":
+                    chunk.to_csv(f, index=False, header=index == 0)
+                else:
+                    data = chunk.to_json(orient="records", lines=True, date_format="iso", force_ascii=False)
+                    f.write(data if data.endswith("\n") else data + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+def _update_chunk(chunk, keys, scores, language_column="language"):
+    """
+    Apply new scores to one chunk's stale rows and recategorize every row.
+    Rescored rows also get the language they were scored in, so rows stored
+    without one aren't found stale again on the next run.
+
+    Args:
+        chunk (DataFrame): Store rows as read
+        keys (dict): Row position -> scoring key, from _row_keys
+        scores (dict): (source, text hash, language) -> (score, scorer version, language)
+        language_column (str): Column with language codes
+
+    Returns:
+        tuple: (updated rows, mask of rows whose score or category changed, rows that failed to score)
+    """
+    new_scores = chunk["sentiment_score"].to_numpy(dtype=np.float64, copy=True)
+    versions = _column(chunk, "scorer_version").to_numpy(copy=True)
+    stored_hashes = _column(chunk, "text_hash").to_numpy(copy=True)
+    languages = _column(chunk, language_column).to_numpy(dtype=object, copy=True)
+    failed = 0
+    for position, key in keys.items():
+        score, version, language = scores[key]
+        if version is None:
+            # Keep the old score; the row stays stale and is retried next run
+            failed += 1
+            continue
+        new_scores[position] = score
+        versions[position] = version
+        stored_hashes[position] = key[1]
+        languages[position] = language
+
+    updated = chunk.copy()
+    updated["sentiment_score"] = new_scores
+    updated["sentiment_category"] = np.asarray(categorize_sentiment_array(new_scores), dtype=object)
+    updated["scorer_version"] = versions
+    updated["text_hash"] = stored_hashes
+    updated[language_column] = languages
+
+    old_scores = chunk["sentiment_score"].to_numpy(dtype=np.float64)
+    changed = (
+        ~((old_scores == new_scores) | (np.isnan(old_scores) & np.isnan(new_scores)))
+        | (_column(chunk, "sentiment_category").to_numpy() != updated["sentiment_category"].to_numpy())
+    )
+    return updated, changed, failed
+
+def _score_pending(pending, batch_size, workers, gemini_api_key, progress_stream):
+    """
+    Score distinct stale texts in parallel batches.
+
+    Args:
+        pending (dict): (source, text hash, language) -> text
+        batch_size (int): Texts per batch
+        workers (int): Scoring processes
+        gemini_api_key (str): Gemini key for 'gemini' keys
+        progress_stream (file): Where to print progress (None disables it)
+
+    Returns:
+        dict: Key -> (score, scorer version, language)
+    """
+    batches = []
+    for source in ("local", "gemini"):
+        items = [(key, text) for key, text in pending.items() if key[0] == source]
+        for offset in range(0, len(items), batch_size):
+            batches.append(items[offset:offset + batch_size])
+    tasks = [
+        ([text for _, text in batch], [key[2] for key, _ in batch],
+         gemini_api_key if batch[0][0][0] == "gemini" else None)
+        for batch in batches
+    ]
+
+    scores = {}
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(tasks) > 1 else None
+    try:
+        results = executor.map(_score_task, tasks) if executor is not None else map(_score_task, tasks)
+        for batch, batch_results in zip(batches, results):
+            scores.update(zip([key for key, _ in batch], batch_results))
+            if progress_stream is not None:
+                print(f"{len(scores):,}/{len(pending):,} distinct texts scored", file=progress_stream, flush=True)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+    return scores
+
+def rescore_store(path, format=None, text_columns=None, language_column="language", workers=None,
+                  batch_size=BATCH_CHUNK_SIZE, gemini_api_key=None, rollup_groupings=None, rollup_path=None,
+                  progress_stream=sys.stderr):
+    """
+    Re-score stale rows of a store in place and recompute categories and rollups.
+
+    Args:
+        path (str): Store file, or directory of Parquet part files
+        format (str): Store format (inferred from the extension if None)
+        text_columns (list): Columns joined into the scored text (default: 'text',
+            else title/snippet/content)
+        language_column (str): Column with language codes
+        workers (int): Scoring processes (default: CPU count; 1 scores in this process)
+        batch_size (int): Rows read, and distinct texts scored, per batch
+        gemini_api_key (str): Re-score stale Gemini rows with this key (None skips them)
+        rollup_groupings (list): Groupings to keep rollups for, as column names or
+            tuples of column names (None leaves rollups alone)
+        rollup_path (str): Rollup directory (default: store path + '.rollups')
+        progress_stream (file): Where to print progress (None disables it)
+
+    Returns:
+        dict: Rows, stale rows, distinct texts scored, skipped and failed rows,
+            changed rows, files rewritten and elapsed seconds
+    """
+    start = time.perf_counter()
+    path = path.rstrip("/\\")
+    format = infer_format(path, format or ("parquet" if os.path.isdir(path) else None))
+    files = store_files(path, format)
+    workers = max(1, workers or os.cpu_count() or 1)
+    summary = {"rows": 0, "stale": 0, "texts_scored": 0, "skipped": 0, "failed": 0,
+               "rows_changed": 0, "files_rewritten": 0}
+
+    # Pass 1: find stale rows and the distinct texts to score
+    pending = {}
+    dirty = set()
+    # (file, chunk number) -> scoring keys of the chunk's stale rows
+    chunk_keys = {}
+    for file in files:
+        for index, chunk in enumerate(iter_input_chunks(file, format, batch_size)):
+            text_columns = resolve_text_columns(list(chunk.columns), text_columns)
+            texts, hashes, stale, gemini = find_stale(chunk, text_columns, language_column)
+            keys = _row_keys(chunk, stale, gemini, hashes, language_column, gemini_api_key)
+            for position, key in keys.items():
+                pending.setdefault(key, texts[position])
+            chunk_keys[file, index] = keys
+
+            summary["rows"] += len(chunk)
+            summary["stale"] += int(stale.sum())
+            summary["skipped"] += int(stale.sum()) - len(keys)
+            if keys or _categories_differ(chunk).any():
+                dirty.add(file)
+
+    # Pass 2: score each distinct stale text once
+    scores = _score_pending(pending, batch_size, workers, gemini_api_key, progress_stream)
+    summary["texts_scored"] = len(scores)
+
+    # Stored rollups only take the changed rows; missing ones are built from every row
+    rollups, building, rollup_columns = {}, {}, []
+    if rollup_groupings:
+        groupings = [(grouping,) if isinstance(grouping, str) else tuple(grouping) for grouping in rollup_groupings]
+        rollup_path = rollup_path or path + ROLLUP_SUFFIX
+        rollups, missing = load_rollups(rollup_path, groupings)
+        building = empty_aggregates(missing)
+        rollup_columns = list(dict.fromkeys(column for grouping in groupings for column in grouping))
+
+    # Pass 3: rewrite changed files, collecting the rows the rollups need
+    removed, added, all_rows = [], [], []
+
+    def updated_chunks(file):
+        for index, chunk in enumerate(iter_input_chunks(file, format, batch_size)):
+            if file in dirty:
+                updated, changed, failed = _update_chunk(chunk, chunk_keys[file, index], scores, language_column)
+                summary["failed"] += failed
+                summary["rows_changed"] += int(changed.sum())
+                if rollups and changed.any():
+                    removed.append(_rollup_rows(chunk[changed], rollup_columns))
+                    added.append(_rollup_rows(updated[changed], rollup_columns))
+            else:
+                updated = chunk
+            if building:
+                all_rows.append(_rollup_rows(updated, rollup_columns))
+            yield updated
+
+    for file in files:
+        if file in dirty:
+            _write_store_file(file, format, updated_chunks(file))
+            summary["files_rewritten"] += 1
+        elif building:
+            for _ in updated_chunks(file):
+                pass
+
+    if rollup_groupings:
+        if removed:
+            rollups = update_aggregates(rollups, ROLLUP_VALUE_COLUMN, removed=pd.concat(removed), added=pd.concat(added))
+        if all_rows:
+            building = update_aggregates(building, ROLLUP_VALUE_COLUMN, added=pd.concat(all_rows))
+        save_rollups(rollup_path, {**rollups, **building})
+
+    summary["elapsed_s"] = round(time.perf_counter() - start, 2)
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-score stale rows of a scored store in place")
+    parser.add_argument("store", help="Scored CSV/JSONL/Parquet file, or a directory of Parquet parts")
+    parser.add_argument("--format", choices=BATCH_FORMATS, default=None)
+    parser.add_argument("--text-column", action="append", dest="text_columns", default=None,
+                        help="Column that was scored (repeat to join several)")
+    parser.add_argument("--language-column", default="language")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=BATCH_CHUNK_SIZE)
+    parser.add_argument("--gemini", action="store_true", help="Re-score stale Gemini rows (reads GEMINI_API_KEY)")
+    parser.add_argument("--rollup", action="append", default=None,
+                        help="Comma-separated key columns of a rollup to keep up to date (repeatable)")
+    parser.add_argument("--rollup-path", default=None)
+    args = parser.parse_args()
+
+    gemini_api_key = None
+    if args.gemini:
+        gemini_api_key = os.environ.get("GEMINI_API_KEY")
+        if not gemini_api_key:
+            parser.error("--gemini needs GEMINI_API_KEY to be set")
+
+    rollup_groupings = [tuple(part.strip() for part in rollup.split(",")) for rollup in args.rollup or []]
+    summary = rescore_store(
+        args.store, args.format, args.text_columns, args.language_column, args.workers, args.batch_size,
+        gemini_api_key, rollup_groupings or None, args.rollup_path
+    )
+    print(json.dumps(summary), file=sys.stderr)
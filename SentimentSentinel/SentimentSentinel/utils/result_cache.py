@@ -0,0 +1,286 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+import pandas as pd
+from utils.instrumentation import increment
+
+# Seconds a cached result stays fresh
+RESULT_CACHE_TTL_SECONDS = 15 * 60
+
+# Total estimated size of cached results before least-recently-used eviction
+RESULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Per-process salt for credential scopes, so cache keys never reveal API keys
+_SCOPE_SALT = os.urandom(16)
+
+def normalize_filters(**filters):
+    """
+    Build an order-insensitive cache key from a filter set.
+    Strings are stripped and case-folded; lists, tuples and sets are
+    de-duplicated and sorted, so the same selection made in a different
+    order maps to the same key.
+
+    Args:
+        **filters: Filter values by name
+
+    Returns:
+        tuple: Hashable, normalized filter set
+    """
+    def normalize(value):
+        if isinstance(value, str):
+            return value.strip().casefold()
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return tuple(sorted({normalize(item) for item in value}, key=repr))
+        if isinstance(value, dict):
+            return tuple(sorted((key, normalize(item)) for key, item in value.items()))
+        return value
+
+    return tuple(sorted((name, normalize(value)) for name, value in filters.items()))
+
+def credential_scope(*credentials):
+    """
+    Hash API credentials into a cache scope.
+    Results fetched with one set of keys are only shared with sessions using
+    the same keys, and the keys themselves are never stored in the cache.
+
+    Args:
+        *credentials (str): API keys and IDs (None allowed)
+
+    Returns:
+        str: Salted digest identifying the credentials
+    """
+    digest = hashlib.blake2b(key=_SCOPE_SALT, digest_size=16)
+    for credential in credentials:
+        digest.update(b"\0" if credential is None else credential.encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+def estimate_size(value):
+    """
+    Estimate the memory held by a cached result.
+
+    Args:
+        value: Cached result
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    return sys.getsizeof(value)
+
+def _share(value):
+    """
+    Get a copy of a cached result that callers may modify.
+    DataFrames are copied deeply: copy-on-write is off by default in the
+    pinned pandas, so a shallow copy would let callers edit the cached original.
+
+    Args:
+        value: Cached result
+
+    Returns:
+        object: Value handed to the caller
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=True)
+    return value
+
+class _Flight:
+    """
+    One in-progress computation that concurrent identical requests wait on.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.abandoned = False
+
+class ResultCache:
+    """
+    Process-wide, thread-safe result cache shared by every Streamlit session.
+    Entries expire after a TTL and the least recently used ones are evicted
+    once their estimated size exceeds a byte budget. Requests for a key that
+    is already being computed wait for that computation (single flight)
+    instead of starting their own.
+    """
+
+    def __init__(self, ttl=RESULT_CACHE_TTL_SECONDS, max_bytes=RESULT_CACHE_MAX_BYTES, clock=time.monotonic):
+        """
+        Args:
+            ttl (float): Seconds an entry stays fresh
+            max_bytes (int): Total estimated size of cached entries
+            clock (callable): Monotonic time source in seconds
+        """
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0, "expirations": 0}
+
+    def _remove(self, key):
+        """
+        Drop an entry and its size (the lock must be held).
+
+        Args:
+            key (tuple): Cache key
+        """
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _lookup(self, key):
+        """
+        Get a fresh entry's value (the lock must be held).
+
+        Args:
+            key (tuple): Cache key
+
+        Returns:
+            tuple: (found, value)
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        value, expires, _ = entry
+        if self.clock() >= expires:
+            self._remove(key)
+            self._stats["expirations"] += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key, value, ttl):
+        """
+        Cache a value and evict entries until the cache fits (the lock must be held).
+
+        Args:
+            key (tuple): Cache key
+            value: Result to cache
+            ttl (float): Seconds the result stays fresh
+        """
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, self.clock() + ttl, size)
+        self._bytes += size
+
+        # Expired entries go first, then the least recently used
+        now = self.clock()
+        for expired in [k for k, (_, expires, _) in self._entries.items() if expires <= now]:
+            self._remove(expired)
+            self._stats["expirations"] += 1
+        while self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self._stats["evictions"] += 1
+
+    def get_or_compute(self, key, compute, ttl=None, cacheable=None):
+        """
+        Get a cached result, computing it once if it is missing or stale.
+        If another thread is already computing the same key, wait for its
+        result. Errors are passed to every waiting caller and not cached; if
+        the computing thread is interrupted (e.g. by a Streamlit rerun), a
+        waiting caller takes over the computation.
+
+        Args:
+            key (tuple): Hashable cache key (see normalize_filters and credential_scope)
+            compute (callable): Zero-argument function producing the result
+            ttl (float): Seconds the result stays fresh (None for the cache default)
+            cacheable (callable): Takes the computed result and returns False if it must
+                not be cached (e.g. a partial result after an upstream failure); it is
+                still returned to the callers waiting on it
+
+        Returns:
+            object: Cached or newly computed result (DataFrames are copies)
+        """
+        ttl = self.ttl if ttl is None else ttl
+
+        while True:
+            with self._lock:
+                found, value = self._lookup(key)
+                if found:
+                    self._stats["hits"] += 1
+                    increment("result_cache.hits")
+                    return _share(value)
+
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+                    self._stats["misses"] += 1
+                    increment("result_cache.misses")
+                else:
+                    self._stats["coalesced"] += 1
+                    increment("result_cache.coalesced")
+
+            if not leader:
+                flight.done.wait()
+                if flight.abandoned:
+                    continue
+                if flight.error is not None:
+                    raise flight.error
+                return _share(flight.value)
+
+            try:
+                flight.value = compute()
+            except Exception as e:
+                flight.error = e
+                raise
+            except BaseException:
+                flight.abandoned = True
+                raise
+            else:
+                if cacheable is None or cacheable(flight.value):
+                    with self._lock:
+                        self._store(key, flight.value, ttl)
+                else:
+                    increment("result_cache.uncacheable")
+                return _share(flight.value)
+            finally:
+                with self._lock:
+                    self._flights.pop(key, None)
+                flight.done.set()
+
+    def invalidate(self, key):
+        """
+        Drop one cached result.
+
+        Args:
+            key (tuple): Cache key
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        """
+        Remove all cached results and reset statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Hits, misses, coalesced waits, evictions, expirations,
+                cached entry count, in-flight computations and total bytes
+        """
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), in_flight=len(self._flights), bytes=self._bytes)
+
+# Cache shared by every session in this process
+shared_results = ResultCache()
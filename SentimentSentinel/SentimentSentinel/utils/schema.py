@@ -0,0 +1,158 @@
+import pandas as pd
+from utils.chart_data import is_time_sorted, sort_by_time
+
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Low-cardinality label columns stored as categoricals
+CATEGORICAL_COLUMNS = [
+    "source",
+    "query",
+    "language",
+    "sentiment",
+    "sentiment_category",
+    "country",
+    "platform",
+    "topic",
+    "score_source",
+    "scorer_version"
+]
+
+# Numeric score columns stored as float32
+FLOAT32_COLUMNS = [
+    "sentiment_score"
+]
+
+# Date columns converted to datetime64 once at ingest
+DATETIME_COLUMNS = [
+    "date"
+]
+
+# Column rows are ordered by at ingest, so time-based charts never need a sorted copy
+SORT_COLUMN = "date"
+
+# Free-text columns stored as pyarrow-backed strings (when pyarrow is installed)
+TEXT_COLUMNS = [
+    "title",
+    "snippet",
+    "link",
+    "text",
+    "content",
+    "hashtags",
+    "mentions"
+]
+
+def get_compact_dtypes(df):
+    """
+    Get the canonical compact dtype for each known column present in a DataFrame.
+
+    Args:
+        df (DataFrame): DataFrame to inspect
+
+    Returns:
+        dict: Dictionary mapping column names to target dtypes
+    """
+    dtypes = {}
+
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            dtypes[column] = "category"
+
+    for column in FLOAT32_COLUMNS:
+        if column in df.columns:
+            dtypes[column] = "float32"
+
+    if PYARROW_AVAILABLE:
+        for column in TEXT_COLUMNS:
+            if column in df.columns:
+                dtypes[column] = "string[pyarrow]"
+
+    return dtypes
+
+def apply_compact_schema(df):
+    """
+    Cast a scored DataFrame to the canonical memory-compact schema.
+    Label columns become categoricals, scores become float32, dates become
+    datetime64 (unparseable dates become NaT) and free text becomes
+    pyarrow-backed strings. Unknown columns are left untouched. Rows are
+    sorted by date once here (undated rows last), so prepare_time_frame
+    returns ingested frames without copying them.
+
+    Args:
+        df (DataFrame): DataFrame to cast
+
+    Returns:
+        DataFrame: DataFrame using the compact schema
+    """
+    if df is None or df.empty:
+        return df
+
+    dtypes = {}
+    for column, dtype in get_compact_dtypes(df).items():
+        # Skip columns that already have the target dtype
+        if str(df[column].dtype) != dtype:
+            dtypes[column] = dtype
+
+    date_columns = [
+        c for c in DATETIME_COLUMNS
+        if c in df.columns and not pd.api.types.is_datetime64_any_dtype(df[c])
+    ]
+
+    sorted_already = SORT_COLUMN not in df.columns or (
+        SORT_COLUMN not in date_columns and is_time_sorted(df, SORT_COLUMN)
+    )
+    if not dtypes and not date_columns and sorted_already:
+        return df
+
+    df = df.astype(dtypes) if dtypes else df.copy(deep=False)
+    for column in date_columns:
+        df[column] = pd.to_datetime(df[column], errors='coerce', utc=True, format='mixed').dt.tz_localize(None)
+
+    if SORT_COLUMN in df.columns and pd.api.types.is_datetime64_any_dtype(df[SORT_COLUMN]):
+        df = sort_by_time(df, SORT_COLUMN)
+    return df
+
+def memory_report(df):
+    """
+    Report memory usage per row before and after applying the compact schema.
+
+    Args:
+        df (DataFrame): DataFrame to measure
+
+    Returns:
+        DataFrame: One row per column plus a 'TOTAL' row, with dtypes and
+            bytes per row before and after compaction
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=[
+            "column", "dtype_before", "dtype_after",
+            "bytes_per_row_before", "bytes_per_row_after"
+        ])
+
+    compact_df = apply_compact_schema(df)
+    rows = len(df)
+
+    # Deep memory usage counts the Python string objects behind object columns
+    before = df.memory_usage(deep=True, index=False)
+    after = compact_df.memory_usage(deep=True, index=False)
+
+    report = pd.DataFrame({
+        "column": df.columns,
+        "dtype_before": [str(df[c].dtype) for c in df.columns],
+        "dtype_after": [str(compact_df[c].dtype) for c in df.columns],
+        "bytes_per_row_before": [before[c] / rows for c in df.columns],
+        "bytes_per_row_after": [after[c] / rows for c in df.columns]
+    })
+
+    total = pd.DataFrame([{
+        "column": "TOTAL",
+        "dtype_before": "",
+        "dtype_after": "",
+        "bytes_per_row_before": before.sum() / rows,
+        "bytes_per_row_after": after.sum() / rows
+    }])
+
+    return pd.concat([report, total], ignore_index=True)
@@ -0,0 +1,181 @@
+import hashlib
+from utils.sentiment_analyzer import CATEGORY_BOUNDARY, analyze_sentiment, categorize_sentiment, clean_text
+from utils.language_detector import detect_language
+from utils.instrumentation import increment, timed
+
+# Local scorer version per language code ('*' covers languages without their own entry).
+# Bump a language's version when its scores change so stored rows get re-scored;
+# threshold changes need no bump (categories are recomputed from stored scores)
+LOCAL_SCORER_VERSIONS = {
+    "en": "vader-1",
+    "*": "vader-scaled-1"
+}
+
+# Gemini scorer version; bump when the model or prompt in utils.news_api changes
+GEMINI_SCORER_VERSION = "gemini-1.5-flash-json-1"
+
+# Local scores this close to a category boundary are escalated to Gemini
+CASCADE_MARGIN = 0.1
+
+# Languages the local analyzer handles well enough not to escalate
+LOCAL_LANGUAGES = ("en",)
+
+def scorer_version(language, source="local"):
+    """
+    Get the version tag stored with a score.
+
+    Args:
+        language (str): Language code of the text
+        source (str): 'local' or 'gemini'
+
+    Returns:
+        str: Version tag, e.g. 'local:vader-1' or 'gemini:gemini-1.5-flash-json-1'
+    """
+    if source == "gemini":
+        return f"gemini:{GEMINI_SCORER_VERSION}"
+    return f"local:{LOCAL_SCORER_VERSIONS.get(language, LOCAL_SCORER_VERSIONS['*'])}"
+
+def text_hash(text):
+    """
+    Hash a text after cleaning, so rows can be matched to their scored text
+    and cosmetic changes (case, URLs, extra spaces) don't count as edits.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: 16 hex characters
+    """
+    return hashlib.blake2b(clean_text(text).encode("utf-8"), digest_size=8).hexdigest()
+
+@timed("scoring.batch")
+def score_batch(texts, languages=None):
+    """
+    Score a batch of texts with the local analyzer.
+    Languages are detected for texts without one.
+
+    Args:
+        texts (list): Texts to score
+        languages (list): Optional language code per text (None entries are detected)
+
+    Returns:
+        list: One dict per text with 'score', 'language', 'category',
+            'scorer_version' and 'text_hash'
+    """
+    if languages is None:
+        languages = [None] * len(texts)
+
+    results = []
+    for text, language in zip(texts, languages):
+        text = text if isinstance(text, str) else ""
+        language = language or detect_language(text)
+        score = analyze_sentiment(text, language)
+        results.append({
+            "score": score,
+            "language": language,
+            "category": categorize_sentiment(score),
+            "scorer_version": scorer_version(language),
+            "text_hash": text_hash(text)
+        })
+    return results
+
+def score_batch_gemini(texts, api_key):
+    """
+    Score a batch of texts with Gemini, one call per text.
+
+    Args:
+        texts (list): Texts to score
+        api_key (str): Gemini API key
+
+    Returns:
+        list: One dict per text with 'score', 'language', 'category',
+            'scorer_version' and 'text_hash' (NaN score and None category and
+            version for texts Gemini couldn't score, so they are retried later)
+    """
+    # Imported here so local scoring doesn't load the Google client libraries
+    from utils.news_api import RetryBudget, gemini_analyze_sentiment
+
+    # One retry budget per batch so a failing batch can't stall the caller
+    retry_budget = RetryBudget()
+    results = []
+    for text in texts:
+        text = text if isinstance(text, str) else ""
+        score = gemini_analyze_sentiment(text, api_key, retry_budget)
+        results.append({
+            "score": score,
+            "language": detect_language(text),
+            "category": categorize_sentiment(score),
+            "scorer_version": scorer_version(None, "gemini") if score == score else None,
+            "text_hash": text_hash(text)
+        })
+    return results
+
+def needs_escalation(score, language, margin=CASCADE_MARGIN, local_languages=LOCAL_LANGUAGES):
+    """
+    Decide whether a local score is too uncertain to keep.
+
+    Args:
+        score (float): Local sentiment score
+        language (str): Language code of the text
+        margin (float): Distance from a category boundary that counts as uncertain
+        local_languages (tuple): Languages trusted to the local analyzer
+
+    Returns:
+        bool: True if the text should be rescored with Gemini
+    """
+    if language not in local_languages:
+        return True
+    return abs(abs(score) - CATEGORY_BOUNDARY) < margin
+
+@timed("scoring.cascade")
+def score_cascade(texts, api_key, languages=None, margin=CASCADE_MARGIN, local_languages=LOCAL_LANGUAGES,
+                  retry_budget=None, gemini_function=None):
+    """
+    Score texts locally in one batch and rescore only uncertain ones with Gemini.
+    A text is escalated when its local score is within margin of a category
+    boundary or its language isn't in local_languages. If Gemini fails for
+    an escalated text, its local score is kept.
+
+    Args:
+        texts (list): Texts to score
+        api_key (str): Gemini API key (None keeps every local score)
+        languages (list): Optional language code per text (None entries are detected)
+        margin (float): Distance from a category boundary that counts as uncertain
+        local_languages (tuple): Languages trusted to the local analyzer
+        retry_budget (RetryBudget): Gemini retries shared across the batch
+        gemini_function (callable): Takes (text, api_key, retry_budget) and returns a
+            score or NaN (default: gemini_analyze_sentiment)
+
+    Returns:
+        list: One dict per text with the score_batch fields plus 'escalated'
+            (sent to Gemini) and 'source' ('local' or 'gemini', where the score came from)
+    """
+    results = score_batch(texts, languages)
+    for result in results:
+        result["escalated"] = False
+        result["source"] = "local"
+
+    if not api_key:
+        return results
+
+    if gemini_function is None:
+        from utils.news_api import RetryBudget, gemini_analyze_sentiment
+        gemini_function = gemini_analyze_sentiment
+        retry_budget = retry_budget or RetryBudget()
+
+    escalated = 0
+    for text, result in zip(texts, results):
+        if not needs_escalation(result["score"], result["language"], margin, local_languages):
+            continue
+
+        result["escalated"] = True
+        escalated += 1
+        score = gemini_function(text if isinstance(text, str) else "", api_key, retry_budget)
+        if score == score:
+            result["score"] = score
+            result["category"] = categorize_sentiment(score)
+            result["source"] = "gemini"
+            result["scorer_version"] = scorer_version(result["language"], "gemini")
+
+    increment("scoring.escalated", escalated)
+    return results
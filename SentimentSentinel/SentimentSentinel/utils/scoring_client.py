@@ -0,0 +1,180 @@
+import http.client
+import json
+import os
+import threading
+from urllib.parse import urlsplit
+from utils.scoring import score_batch
+
+# Environment variable pointing the app at a scoring server (unset scores in-process)
+SCORING_URL_ENV = "SENTIGRADE_SCORING_URL"
+
+# Texts sent per request; larger inputs are split
+CLIENT_BATCH_SIZE = 500
+
+class ScoringClient:
+    """
+    Client for the scoring server that reuses one keep-alive connection per thread.
+    """
+
+    def __init__(self, base_url, timeout=30, gemini_api_key=None):
+        """
+        Args:
+            base_url (str): Server URL, e.g. 'http://127.0.0.1:8765'
+            timeout (float): Socket timeout in seconds
+            gemini_api_key (str): Optional Gemini key sent with Gemini requests
+        """
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported scoring server URL: {base_url}")
+
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self.gemini_api_key = gemini_api_key
+        self._local = threading.local()
+
+    def _connection(self):
+        """
+        Get this thread's connection, opening it if needed.
+
+        Returns:
+            HTTPConnection: Persistent connection
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            connection = connection_class(self.host, self.port, timeout=self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def _reset(self):
+        """
+        Close this thread's connection so the next request reconnects.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _request(self, method, path, payload=None, headers=None):
+        """
+        Send a request, reconnecting once if the kept-alive connection went stale.
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path
+            payload (dict): Optional JSON body
+            headers (dict): Optional extra headers
+
+        Returns:
+            dict: Decoded JSON response
+        """
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request_headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        request_headers.update(headers or {})
+
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request(method, path, body=body, headers=request_headers)
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest, ConnectionError):
+                self._reset()
+                if attempt == 1:
+                    raise
+
+        if response.getheader("Connection", "").lower() == "close":
+            self._reset()
+
+        result = json.loads(data or b"{}")
+        if response.status != 200:
+            raise RuntimeError(f"Scoring server error {response.status}: {result.get('error', '')}")
+        return result
+
+    def score(self, texts, languages=None, use_gemini=False):
+        """
+        Score texts on the server.
+
+        Args:
+            texts (list): Texts to score
+            languages (list): Optional language code (or None) per text
+            use_gemini (bool): Score with Gemini instead of the local analyzer
+
+        Returns:
+            list: One dict per text with 'score', 'language' and 'category'
+        """
+        texts = list(texts)
+        languages = list(languages) if languages is not None else [None] * len(texts)
+        headers = {"X-Gemini-Api-Key": self.gemini_api_key} if use_gemini and self.gemini_api_key else None
+
+        results = []
+        for start in range(0, len(texts), CLIENT_BATCH_SIZE):
+            payload = {
+                "texts": texts[start:start + CLIENT_BATCH_SIZE],
+                "languages": languages[start:start + CLIENT_BATCH_SIZE],
+                "use_gemini": use_gemini
+            }
+            results.extend(self._request("POST", "/score", payload, headers)["results"])
+        return results
+
+    def health(self):
+        """
+        Check the server.
+
+        Returns:
+            dict: Health payload
+        """
+        return self._request("GET", "/health")
+
+    def stats(self):
+        """
+        Get the server's micro-batching statistics.
+
+        Returns:
+            dict: Requests, texts, batches and mean batch size
+        """
+        return self._request("GET", "/stats")
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_scoring_client(base_url=None):
+    """
+    Get a shared client for the configured scoring server.
+
+    Args:
+        base_url (str): Server URL (None reads SENTIGRADE_SCORING_URL)
+
+    Returns:
+        ScoringClient: Shared client, or None if no server is configured
+    """
+    base_url = base_url or os.environ.get(SCORING_URL_ENV)
+    if not base_url:
+        return None
+
+    with _clients_lock:
+        if base_url not in _clients:
+            _clients[base_url] = ScoringClient(base_url)
+        return _clients[base_url]
+
+def score_texts(texts, languages=None):
+    """
+    Score texts on the configured scoring server, or in-process if none is configured.
+
+    Args:
+        texts (list): Texts to score
+        languages (list): Optional language code (or None) per text
+
+    Returns:
+        list: One dict per text with 'score', 'language' and 'category'
+    """
+    texts = list(texts)
+    languages = list(languages) if languages is not None else None
+
+    client = get_scoring_client()
+    if client is None:
+        return score_batch(texts, languages)
+    return client.score(texts, languages)
@@ -0,0 +1,304 @@
+"""
+Standalone sentiment scoring server.
+
+Serves POST /score over HTTP/1.1 with keep-alive. Concurrent requests are
+coalesced by a micro-batcher into one local model call. Also serves
+GET /health, GET /stats and GET /metrics (Prometheus text; stage timings
+are recorded when SENTIGRADE_INSTRUMENTATION=1).
+
+Usage:
+    python -m utils.scoring_service --host 127.0.0.1 --port 8765
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.scoring import score_batch, score_batch_gemini
+from utils.instrumentation import to_prometheus
+
+# Micro-batching: flush after this many texts or this long after the first queued request
+MAX_BATCH_SIZE = 256
+MAX_WAIT_MS = 2
+
+# Request limits
+MAX_REQUEST_BYTES = 8 * 1024 * 1024
+MAX_TEXTS_PER_REQUEST = 1000
+
+# Threads used for Gemini calls, which are network-bound and scored one by one
+GEMINI_WORKERS = 8
+
+# Header carrying a caller's own Gemini key (falls back to GEMINI_API_KEY)
+GEMINI_KEY_HEADER = "x-gemini-api-key"
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+            500: "Internal Server Error"}
+
+class MicroBatcher:
+    """
+    Coalesce concurrent scoring requests into batched model calls.
+    The first queued request opens a batch; requests arriving within
+    max_wait_ms (up to max_batch_size texts) join it, and the batch is
+    scored in one call on a worker thread.
+    """
+
+    def __init__(self, score_function=score_batch, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        """
+        Args:
+            score_function (callable): Takes (texts, languages) and returns one result per text
+            max_batch_size (int): Maximum texts per model call
+            max_wait_ms (float): Longest time a request waits for others to join its batch
+        """
+        self.score_function = score_function
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.stats = {"requests": 0, "texts": 0, "batches": 0}
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def submit(self, texts, languages):
+        """
+        Queue texts for scoring and wait for their results.
+
+        Args:
+            texts (list): Texts to score
+            languages (list): Language code (or None) per text
+
+        Returns:
+            list: One result per text
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, languages, future))
+        return await future
+
+    async def _collect(self):
+        """
+        Wait for a request, then gather others until the batch is full or the wait expires.
+
+        Returns:
+            list: Queued (texts, languages, future) items
+        """
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        size = len(batch[0][0])
+        deadline = loop.time() + self.max_wait
+
+        while size < self.max_batch_size:
+            remaining = deadline - loop.time()
+            try:
+                item = self._queue.get_nowait() if remaining <= 0 else await asyncio.wait_for(self._queue.get(), remaining)
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+            batch.append(item)
+            size += len(item[0])
+
+        return batch
+
+    async def run(self):
+        """
+        Score batches until cancelled.
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await self._collect()
+            texts = [text for item in batch for text in item[0]]
+            languages = [language for item in batch for language in item[1]]
+
+            try:
+                results = await loop.run_in_executor(self._executor, self.score_function, texts, languages)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.stats["requests"] += len(batch)
+            self.stats["texts"] += len(texts)
+            self.stats["batches"] += 1
+
+            # Hand each request its slice of the batch results
+            offset = 0
+            for item_texts, _, future in batch:
+                if not future.done():
+                    future.set_result(results[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+class ScoringServer:
+    """
+    Minimal asyncio HTTP/1.1 server for the scoring endpoints.
+    """
+
+    def __init__(self, batcher=None, gemini_api_key=None):
+        """
+        Args:
+            batcher (MicroBatcher): Batcher for local scoring (a default one is created if None)
+            gemini_api_key (str): Default Gemini key (None reads GEMINI_API_KEY)
+        """
+        self.batcher = batcher or MicroBatcher()
+        self.gemini_api_key = gemini_api_key or os.environ.get("GEMINI_API_KEY")
+        self._gemini_executor = ThreadPoolExecutor(max_workers=GEMINI_WORKERS)
+        self._started = time.time()
+        self._connections = {}
+
+    async def _score(self, payload, headers):
+        """
+        Handle a /score request body.
+
+        Args:
+            payload (dict): {'texts': [...], 'languages': [...] (optional), 'use_gemini': bool (optional)}
+            headers (dict): Lowercased request headers
+
+        Returns:
+            tuple: (HTTP status, response payload)
+        """
+        texts = payload.get("texts") if isinstance(payload, dict) else None
+        if not isinstance(texts, list) or not all(isinstance(t, str) or t is None for t in texts):
+            return 400, {"error": "'texts' must be a list of strings"}
+        if len(texts) > MAX_TEXTS_PER_REQUEST:
+            return 413, {"error": f"At most {MAX_TEXTS_PER_REQUEST} texts per request"}
+
+        languages = payload.get("languages") or [None] * len(texts)
+        if not isinstance(languages, list) or len(languages) != len(texts):
+            return 400, {"error": "'languages' must match 'texts' in length"}
+
+        if payload.get("use_gemini"):
+            api_key = headers.get(GEMINI_KEY_HEADER) or self.gemini_api_key
+            if not api_key:
+                return 400, {"error": "Gemini scoring requested but no API key configured"}
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(self._gemini_executor, score_batch_gemini, texts, api_key)
+        else:
+            results = await self.batcher.submit(texts, languages)
+
+        return 200, {"results": results}
+
+    async def _route(self, method, path, headers, body):
+        """
+        Dispatch a request.
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path
+            headers (dict): Lowercased request headers
+            body (bytes): Request body
+
+        Returns:
+            tuple: (HTTP status, response payload); a str payload is sent as plain text
+        """
+        path = path.split("?", 1)[0]
+
+        if path == "/health":
+            return 200, {"status": "ok", "uptime_s": round(time.time() - self._started, 1)}
+        if path == "/stats":
+            stats = dict(self.batcher.stats)
+            stats["mean_batch_texts"] = round(stats["texts"] / stats["batches"], 2) if stats["batches"] else 0.0
+            return 200, stats
+        if path == "/metrics":
+            return 200, to_prometheus()
+        if path != "/score":
+            return 404, {"error": f"Unknown path: {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST for /score"}
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "Body must be JSON"}
+        return await self._score(payload, headers)
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serve requests on one connection until the client closes it.
+
+        Args:
+            reader (StreamReader): Connection reader
+            writer (StreamWriter): Connection writer
+        """
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode("latin-1").split()
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > MAX_REQUEST_BYTES:
+                    status, payload = 413, {"error": "Request body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    try:
+                        status, payload = await self._route(method, path, headers, body)
+                    except Exception as e:
+                        status, payload = 500, {"error": str(e)}
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                if isinstance(payload, str):
+                    data, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+                else:
+                    data, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+                writer.write((
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                ).encode("latin-1") + data)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, ready=None):
+        """
+        Run the server until cancelled.
+
+        Args:
+            host (str): Bind address
+            port (int): Bind port (0 picks a free port)
+            ready (callable): Optional callback receiving the bound port once listening
+        """
+        batcher_task = asyncio.create_task(self.batcher.run())
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[1])
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            # Close kept-alive connections so their handlers finish before the loop stops
+            handlers = list(self._connections)
+            for writer in list(self._connections.values()):
+                writer.close()
+            batcher_task.cancel()
+            await asyncio.gather(batcher_task, *handlers, return_exceptions=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Sentigrade scoring server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    server = ScoringServer(MicroBatcher(max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms))
+    print(f"Scoring server listening on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
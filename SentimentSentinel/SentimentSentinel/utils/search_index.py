@@ -0,0 +1,318 @@
+import re
+import sqlite3
+import threading
+import pandas as pd
+from utils.figure_cache import frame_fingerprint
+from utils.instrumentation import timed
+
+# Search modes understood by build_match_query
+SEARCH_MODES = ["auto", "keyword", "phrase", "prefix"]
+
+# Rows inserted per executemany batch
+INDEX_BATCH_SIZE = 50000
+
+# Columns searched as body text, in order of preference
+BODY_COLUMNS = ["snippet", "content", "text"]
+
+# BM25 weights for the indexed (title, body) columns
+BM25_WEIGHTS = (2.0, 1.0)
+
+# Columns stored alongside the text for filtering and display
+_STORED_COLUMNS = [
+    "doc_key", "title", "body", "link", "source", "country", "platform",
+    "date", "sentiment_score", "sentiment_category"
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    doc_key TEXT UNIQUE,
+    title TEXT,
+    body TEXT,
+    link TEXT,
+    source TEXT,
+    country TEXT,
+    platform TEXT,
+    date TEXT,
+    sentiment_score REAL,
+    sentiment_category TEXT
+);
+CREATE INDEX IF NOT EXISTS documents_country ON documents(country);
+CREATE INDEX IF NOT EXISTS documents_source ON documents(source);
+CREATE INDEX IF NOT EXISTS documents_date ON documents(date);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, body,
+    content='documents', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+"""
+
+# Quoted phrases, then single words with an optional trailing '*'
+_QUERY_PATTERN = re.compile(r'"([^"]*)"|(\w+)(\*?)')
+_WORD_PATTERN = re.compile(r"\w+")
+
+def build_match_query(query, mode="auto"):
+    """
+    Turn user input into a safe FTS5 MATCH expression.
+    Every word is quoted so punctuation and FTS operators in the input can't
+    cause syntax errors.
+
+    Args:
+        query (str): User search text
+        mode (str): 'keyword' (all words), 'phrase' (exact word sequence),
+            'prefix' (all words as prefixes) or 'auto' ("quoted phrases" and
+            word* prefixes inside keyword search)
+
+    Returns:
+        str: MATCH expression, or None if the query has no words
+    """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unsupported search mode: {mode}")
+
+    query = query or ""
+    words = _WORD_PATTERN.findall(query)
+    if not words:
+        return None
+
+    if mode == "keyword":
+        return " ".join(f'"{word}"' for word in words)
+    if mode == "phrase":
+        return '"' + " ".join(words) + '"'
+    if mode == "prefix":
+        return " ".join(f'"{word}"*' for word in words)
+
+    parts = []
+    for phrase, word, star in _QUERY_PATTERN.findall(query):
+        if phrase:
+            phrase_words = _WORD_PATTERN.findall(phrase)
+            if phrase_words:
+                parts.append('"' + " ".join(phrase_words) + '"')
+        elif word:
+            parts.append(f'"{word}"' + star)
+    return " ".join(parts) if parts else None
+
+def _column_values(df, column):
+    """
+    Get a column as Python values with missing entries as None.
+
+    Args:
+        df (DataFrame): Source data
+        column (str): Column name
+
+    Returns:
+        list: Values (all None if the column is absent)
+    """
+    if column not in df.columns:
+        return [None] * len(df)
+
+    values = df[column]
+    if pd.api.types.is_datetime64_any_dtype(values):
+        values = values.dt.strftime("%Y-%m-%d %H:%M:%S")
+    values = values.astype(object)
+    return values.where(values.notna(), None).tolist()
+
+class SearchIndex:
+    """
+    Full-text index over scored documents backed by SQLite FTS5.
+    Documents are deduplicated by link (or by title and body when there is
+    no link), ranked with BM25 and filtered by sentiment, country, source
+    and date.
+    """
+
+    def __init__(self, path=":memory:"):
+        """
+        Args:
+            path (str): SQLite database path (':memory:' keeps the index in memory)
+        """
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._indexed_frames = set()
+
+        with self._lock:
+            if path == ":memory:":
+                self._connection.execute("PRAGMA synchronous = OFF")
+                self._connection.execute("PRAGMA journal_mode = OFF")
+            self._connection.executescript(_SCHEMA)
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def add_documents(self, df):
+        """
+        Add scored documents to the index. Documents already indexed are skipped.
+
+        Args:
+            df (DataFrame): Scored documents with 'title' and a body column
+                ('snippet', 'content' or 'text'); 'link', 'source', 'country',
+                'platform', 'date', 'sentiment_score' and 'sentiment_category'
+                are stored when present
+
+        Returns:
+            int: Number of new documents
+        """
+        if df is None or df.empty:
+            return 0
+
+        body_column = next((c for c in BODY_COLUMNS if c in df.columns), None)
+        titles = _column_values(df, "title")
+        bodies = _column_values(df, body_column) if body_column else [None] * len(df)
+        links = _column_values(df, "link")
+        keys = [link if link else f"{title}\n{body}" for link, title, body in zip(links, titles, bodies)]
+
+        rows = list(zip(
+            keys, titles, bodies, links,
+            _column_values(df, "source"),
+            _column_values(df, "country"),
+            _column_values(df, "platform"),
+            _column_values(df, "date"),
+            _column_values(df, "sentiment_score"),
+            _column_values(df, "sentiment_category")
+        ))
+
+        placeholders = ", ".join("?" * len(_STORED_COLUMNS))
+        insert = f"INSERT OR IGNORE INTO documents ({', '.join(_STORED_COLUMNS)}) VALUES ({placeholders})"
+
+        with self._lock, self._connection:
+            last_id = self._connection.execute("SELECT COALESCE(MAX(id), 0) FROM documents").fetchone()[0]
+            for start in range(0, len(rows), INDEX_BATCH_SIZE):
+                self._connection.executemany(insert, rows[start:start + INDEX_BATCH_SIZE])
+
+            # Index only the rows that were actually inserted
+            added = self._connection.execute(
+                "INSERT INTO documents_fts(rowid, title, body) SELECT id, title, body FROM documents WHERE id > ?",
+                (last_id,)
+            ).rowcount
+
+        return added
+
+    def index_frame(self, df):
+        """
+        Add a DataFrame's documents unless the same frame was indexed before.
+        Cheap to call on every Streamlit rerun.
+
+        Args:
+            df (DataFrame): Scored documents
+
+        Returns:
+            int: Number of new documents
+        """
+        if df is None or df.empty:
+            return 0
+
+        fingerprint = frame_fingerprint(df)
+        if fingerprint in self._indexed_frames:
+            return 0
+
+        added = self.add_documents(df)
+        self._indexed_frames.add(fingerprint)
+        return added
+
+    def optimize(self):
+        """
+        Merge the full-text index segments after large loads.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("INSERT INTO documents_fts(documents_fts) VALUES('optimize')")
+
+    @timed("search_index.query")
+    def search(self, query, mode="auto", sentiment_range=None, countries=None, sources=None,
+               start_date=None, end_date=None, limit=50):
+        """
+        Search the index and return ranked hits. Documents without a score
+        or date never match a sentiment or date filter; pass None to keep them.
+
+        Args:
+            query (str): User search text
+            mode (str): 'auto', 'keyword', 'phrase' or 'prefix' (see build_match_query)
+            sentiment_range (tuple): Optional inclusive (min, max) sentiment score
+            countries (list): Optional countries to keep
+            sources (list): Optional sources to keep
+            start_date: Optional inclusive start date
+            end_date: Optional inclusive end date (the whole day is included)
+            limit (int): Maximum number of hits
+
+        Returns:
+            DataFrame: Hits ordered by relevance, with stored columns (body as
+                'snippet'), an 'excerpt' with matches in bold and a 'rank'
+                (lower is better)
+        """
+        columns = ["title", "snippet", "excerpt", "link", "source", "country", "platform",
+                   "date", "sentiment_score", "sentiment_category", "rank"]
+
+        match = build_match_query(query, mode)
+        if match is None:
+            return pd.DataFrame(columns=columns)
+
+        conditions = ["documents_fts MATCH ?"]
+        params = [match]
+
+        if sentiment_range is not None:
+            conditions.append("d.sentiment_score BETWEEN ? AND ?")
+            params.extend(float(bound) for bound in sentiment_range)
+        if countries:
+            conditions.append(f"d.country IN ({', '.join('?' * len(countries))})")
+            params.extend(countries)
+        if sources:
+            conditions.append(f"d.source IN ({', '.join('?' * len(sources))})")
+            params.extend(sources)
+        if start_date is not None:
+            conditions.append("d.date >= ?")
+            params.append(pd.Timestamp(start_date).strftime("%Y-%m-%d %H:%M:%S"))
+        if end_date is not None:
+            conditions.append("d.date < ?")
+            params.append((pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S"))
+
+        title_weight, body_weight = BM25_WEIGHTS
+        sql = f"""
+            SELECT d.title, d.body, snippet(documents_fts, 1, '**', '**', '…', 16),
+                   d.link, d.source, d.country, d.platform, d.date,
+                   d.sentiment_score, d.sentiment_category,
+                   bm25(documents_fts, {title_weight}, {body_weight}) AS rank
+            FROM documents_fts
+            JOIN documents AS d ON d.id = documents_fts.rowid
+            WHERE {' AND '.join(conditions)}
+            ORDER BY rank
+            LIMIT ?
+        """
+        params.append(int(limit))
+
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+
+        hits = pd.DataFrame(rows, columns=columns)
+        hits["date"] = pd.to_datetime(hits["date"], errors="coerce")
+        return hits
+
+    def facet_values(self, column):
+        """
+        Get the distinct values of a filter column.
+
+        Args:
+            column (str): 'country', 'source', 'platform' or 'sentiment_category'
+
+        Returns:
+            list: Sorted distinct non-missing values
+        """
+        if column not in ("country", "source", "platform", "sentiment_category"):
+            raise ValueError(f"Unsupported facet column: {column}")
+
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT DISTINCT {column} FROM documents WHERE {column} IS NOT NULL ORDER BY {column}"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def date_range(self):
+        """
+        Get the earliest and latest indexed dates.
+
+        Returns:
+            tuple: (min Timestamp, max Timestamp), or (None, None) if no dates
+        """
+        with self._lock:
+            low, high = self._connection.execute("SELECT MIN(date), MAX(date) FROM documents").fetchone()
+        if low is None:
+            return None, None
+        return pd.Timestamp(low), pd.Timestamp(high)
@@ -1,7 +1,7 @@
-import nltk
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
 import os
 import re
+import threading
+from utils.instrumentation import timed
 
 # Dictionary of supported languages with their codes
 supported_languages = {
@@ -16,15 +16,58 @@ supported_languages = {
     "Lao": "lo"
 }
 
-# Initialize NLTK resources
-try:
-    nltk.data.find('vader_lexicon')
-except LookupError:
-    nltk.download('vader_lexicon')
+# Score at or beyond which a text is positive (or, negated, negative)
+CATEGORY_BOUNDARY = 0.05
 
-# Initialize sentiment analyzer
-sia = SentimentIntensityAnalyzer()
+# Sentiment categories in score order (categorical codes 0, 1, 2)
+SENTIMENT_CATEGORIES = ["negative", "neutral", "positive"]
 
+# Badge colors per category, and for texts that could not be scored
+CATEGORY_COLORS = {
+    "negative": "#F44336",
+    "neutral": "#FFC107",
+    "positive": "#4CAF50"
+}
+UNSCORED_COLOR = "#9E9E9E"
+
+# Entries in the score -> gradient color lookup table (scores -1..1)
+COLOR_LUT_SIZE = 256
+
+# VADER analyzer, created on first use so importing this module stays cheap
+_sia = None
+_sia_lock = threading.Lock()
+
+def get_analyzer():
+    """
+    Get the shared VADER analyzer, importing NLTK and fetching the
+    lexicon the first time it is needed.
+
+    Returns:
+        SentimentIntensityAnalyzer: Shared analyzer
+    """
+    global _sia
+    if _sia is None:
+        with _sia_lock:
+            if _sia is None:
+                import nltk
+                from nltk.sentiment.vader import SentimentIntensityAnalyzer
+
+                # Initialize NLTK resources
+                try:
+                    nltk.data.find('vader_lexicon')
+                except LookupError:
+                    nltk.download('vader_lexicon')
+
+                _sia = SentimentIntensityAnalyzer()
+    return _sia
+
+def __getattr__(name):
+    # Keeps `sentiment_analyzer.sia` working without loading NLTK at import time
+    if name == "sia":
+        return get_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@timed("sentiment.analyze")
 def analyze_sentiment(text, language_code="en"):
     """
     Analyze sentiment of text using appropriate analyzer for the language.
@@ -42,6 +85,8 @@ def analyze_sentiment(text, language_code="en"):
     # Clean the text
     text = clean_text(text)
     
+    sia = _sia or get_analyzer()
+
     # Use VADER for English
     if language_code == "en":
         scores = sia.polarity_scores(text)
@@ -94,18 +139,44 @@ def categorize_sentiment(score):
         score (float): Sentiment score between -1 and 1
         
     Returns:
-        str: Sentiment category ('positive', 'neutral', or 'negative')
+        str: Sentiment category ('positive', 'neutral', or 'negative'), or None
+            for a missing (NaN) score
     """
-    if score >= 0.05:
+    # Unscored texts stay uncategorized rather than counting as neutral
+    if score is None or score != score:
+        return None
+    if score >= CATEGORY_BOUNDARY:
         return "positive"
-    elif score <= -0.05:
+    elif score <= -CATEGORY_BOUNDARY:
         return "negative"
     else:
         return "neutral"
+
+def categorize_sentiment_array(scores):
+    """
+    Categorize a whole column of sentiment scores at once.
+    
+    Args:
+        scores (array-like): Sentiment scores between -1 and 1 (NaN for unscored)
         
-def get_sentiment_color(score):
+    Returns:
+        Categorical: Categories from SENTIMENT_CATEGORIES, missing where the score is NaN
     """
-    Get color code for sentiment visualization.
+    # Imported here so pages that only need the scalar helpers start without pandas
+    import numpy as np
+    import pandas as pd
+    
+    values = np.asarray(scores, dtype=float)
+    codes = np.select(
+        [values >= CATEGORY_BOUNDARY, values <= -CATEGORY_BOUNDARY, values == values],
+        [2, 0, 1],
+        default=-1
+    )
+    return pd.Categorical.from_codes(codes, SENTIMENT_CATEGORIES)
+
+def _gradient_color(score):
+    """
+    Compute the gradient color for one score.
     
     Args:
         score (float): Sentiment score between -1 and 1
@@ -113,17 +184,69 @@ def get_sentiment_color(score):
     Returns:
         str: Hex color code
     """
-    if score >= 0.05:
+    if score >= CATEGORY_BOUNDARY:
         # Positive - green gradient based on strength
         intensity = min(1.0, score * 2)
         return f"#{int(144 + 111 * intensity):02x}{int(238):02x}{int(144 + 111 * intensity):02x}"
-    elif score <= -0.05:
+    elif score <= -CATEGORY_BOUNDARY:
         # Negative - red gradient based on strength
         intensity = min(1.0, abs(score) * 2)
         return f"#{int(255):02x}{int(128 - 128 * intensity):02x}{int(128 - 128 * intensity):02x}"
     else:
         # Neutral - yellow
-        return "#FFC107"
+        return CATEGORY_COLORS["neutral"]
+
+# Gradient colors for COLOR_LUT_SIZE evenly spaced scores from -1 to 1
+_COLOR_LUT = [_gradient_color(-1 + 2 * i / (COLOR_LUT_SIZE - 1)) for i in range(COLOR_LUT_SIZE)]
+
+def get_sentiment_color(score):
+    """
+    Get color code for sentiment visualization.
+    
+    Args:
+        score (float): Sentiment score between -1 and 1
+        
+    Returns:
+        str: Hex color code (grey for a missing score)
+    """
+    if score is None or score != score:
+        return UNSCORED_COLOR
+    return _gradient_color(score)
+
+def get_sentiment_color_array(scores):
+    """
+    Map a whole column of scores to gradient colors through a precomputed
+    COLOR_LUT_SIZE-entry lookup table. Neutral and unscored texts get their
+    exact category colors, so colors always agree with categorize_sentiment.
+    
+    Args:
+        scores (array-like): Sentiment scores between -1 and 1 (NaN for unscored)
+        
+    Returns:
+        ndarray: Hex color code per score
+    """
+    import numpy as np
+    
+    values = np.asarray(scores, dtype=float)
+    missing = np.isnan(values)
+    index = np.rint((np.clip(np.where(missing, 0.0, values), -1, 1) + 1) * ((COLOR_LUT_SIZE - 1) / 2)).astype(np.intp)
+    
+    colors = np.asarray(_COLOR_LUT, dtype=object)[index]
+    colors[np.abs(values) < CATEGORY_BOUNDARY] = CATEGORY_COLORS["neutral"]
+    colors[missing] = UNSCORED_COLOR
+    return colors
+
+def get_category_color(category):
+    """
+    Get the badge color for a sentiment category.
+    
+    Args:
+        category (str): 'positive', 'neutral', 'negative', or None/'unscored'
+        
+    Returns:
+        str: Hex color code
+    """
+    return CATEGORY_COLORS.get(category, UNSCORED_COLOR)
 
 def get_language_specific_sentiment_model(language_code):
     """
@@ -138,4 +261,4 @@ def get_language_specific_sentiment_model(language_code):
     """
     # This is a placeholder - in a real implementation, this would
     # return language-specific sentiment models
-    return sia
+    return get_analyzer()
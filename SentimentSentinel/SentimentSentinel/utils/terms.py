@@ -0,0 +1,329 @@
+import re
+import numpy as np
+import pandas as pd
+from utils.sentiment_analyzer import clean_text, supported_languages
+
+# Word tokens after clean_text; apostrophes inside words are kept (e.g. "don't")
+TOKEN_PATTERN = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+
+# Shortest token kept as a term
+MIN_TOKEN_LENGTH = 2
+
+# Sentiment categories tracked per term
+TERM_CATEGORIES = ["negative", "neutral", "positive"]
+
+# Common function words removed per language code
+STOPWORDS = {
+    "en": frozenset("""
+        a about above after again against all also am an and any are aren't as at be because been before being
+        below between both but by can can't could couldn't did didn't do does doesn't doing don't down during
+        each few for from further had hadn't has hasn't have haven't having he her here hers herself him himself
+        his how i if in into is isn't it it's its itself just let's me more most my myself no nor not now of off
+        on once only or other our ours ourselves out over own same she should shouldn't so some such than that
+        that's the their theirs them themselves then there there's these they this those through to too under
+        until up us very was wasn't we were weren't what when where which while who whom why will with won't
+        would wouldn't you your yours yourself yourselves new says said one two year years
+    """.split()),
+    "id": frozenset("""
+        ada adalah agar akan aku anda antara atas atau bagi bahwa banyak baru bisa belum dalam dan dari dengan
+        di dia ini itu jadi juga kami kamu karena ke kita lagi lain masih mereka oleh pada para saat sangat
+        saja sebagai sebuah sedang sejak selain semua sudah tahun telah tentang tetapi tidak untuk yang
+    """.split()),
+    "ms": frozenset("""
+        ada adalah akan anda antara atas atau bagi bahawa banyak baru boleh dalam dan dari dengan di dia ini
+        itu jadi juga kami kamu kerana ke kita lagi lain masih mereka oleh pada para pula saja sebagai sebuah
+        sedang sejak selain semua sudah tahun telah tentang tetapi tidak untuk yang
+    """.split()),
+    "tl": frozenset("""
+        ako ang at ay dahil din hindi ito iyan iyon ka kami kanila kay kaya kung lang mga may na naman ng nga
+        ni nila nito noong pa pag para po sa sila siya tayo rin rito sino
+    """.split()),
+    "vi": frozenset("""
+        anh bị các cho có của cũng đã đang để đó được gì hơn khi không là lại làm một mà người những nhưng nên
+        này nhiều ra rằng rất sẽ tại theo thì trên trong từ và vào với vẫn về
+    """.split())
+}
+
+# Map language names (e.g. "English") to codes so either form can be passed
+_LANGUAGE_CODES = {name.lower(): code for name, code in supported_languages.items()}
+
+def _stopwords_for(language):
+    """
+    Get the stopword set for a language name or code.
+
+    Args:
+        language (str): Language code or name (unknown languages use English)
+
+    Returns:
+        frozenset: Stopwords
+    """
+    if not isinstance(language, str):
+        return STOPWORDS["en"]
+    code = _LANGUAGE_CODES.get(language.lower(), language.lower())
+    return STOPWORDS.get(code, STOPWORDS["en"])
+
+def tokenize(text, language="en", ngram_range=(1, 2)):
+    """
+    Split text into unigram and bigram terms.
+    Text gets the same normalization as clean_text, stopwords and very short
+    or purely numeric tokens are removed, and bigrams join the remaining
+    adjacent tokens with a space. Scripts written without spaces (Thai, Lao,
+    Khmer, Burmese) are kept as whole runs.
+
+    Args:
+        text (str): Raw text
+        language (str): Language code or name used for stopwords
+        ngram_range (tuple): Smallest and largest n-gram length (1 or 2)
+
+    Returns:
+        list: Terms in document order
+    """
+    stopwords = _stopwords_for(language)
+    tokens = [
+        token for token in TOKEN_PATTERN.findall(clean_text(text))
+        if len(token) >= MIN_TOKEN_LENGTH and not token.isdigit() and token not in stopwords
+    ]
+
+    low, high = ngram_range
+    terms = list(tokens) if low <= 1 else []
+    if high >= 2:
+        terms.extend(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    return terms
+
+class TermCounter:
+    """
+    Mergeable term statistics over a stream of documents.
+    Holds a growing vocabulary plus dense count arrays (total, per sentiment
+    category and document frequency). New chunks are added with update or
+    merge, so top terms can be re-ranked without recounting history.
+    """
+
+    def __init__(self, ngram_range=(1, 2), categories=TERM_CATEGORIES):
+        """
+        Args:
+            ngram_range (tuple): Smallest and largest n-gram length (1 or 2)
+            categories (list): Sentiment categories counted separately
+        """
+        self.ngram_range = tuple(ngram_range)
+        self.categories = list(categories)
+        self.vocabulary = {}
+        self.terms = []
+        self.total_counts = np.zeros(0, dtype=np.int64)
+        self.category_counts = np.zeros((len(self.categories), 0), dtype=np.int64)
+        self.document_frequency = np.zeros(0, dtype=np.int64)
+        self.n_documents = 0
+
+    def _grow(self):
+        """
+        Extend the count arrays to the current vocabulary size.
+        """
+        extra = len(self.terms) - len(self.total_counts)
+        if extra > 0:
+            self.total_counts = np.pad(self.total_counts, (0, extra))
+            self.category_counts = np.pad(self.category_counts, ((0, 0), (0, extra)))
+            self.document_frequency = np.pad(self.document_frequency, (0, extra))
+
+    def _term_id(self, term):
+        """
+        Get a term's id, adding it to the vocabulary if new.
+
+        Args:
+            term (str): Term
+
+        Returns:
+            int: Term id
+        """
+        term_id = self.vocabulary.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            self.vocabulary[term] = term_id
+            self.terms.append(term)
+        return term_id
+
+    def update(self, texts, languages=None, categories=None):
+        """
+        Count the terms of a chunk of documents.
+
+        Args:
+            texts (iterable): Raw document texts
+            languages (iterable): Optional language code or name per document
+            categories (iterable): Optional sentiment category per document
+
+        Returns:
+            TermCounter: self
+        """
+        texts = list(texts)
+        languages = ["en"] * len(texts) if languages is None else list(languages)
+        category_codes = {category: i for i, category in enumerate(self.categories)}
+        if categories is None:
+            codes = np.full(len(texts), -1, dtype=np.int64)
+        else:
+            codes = np.array([category_codes.get(c, -1) for c in categories], dtype=np.int64)
+
+        # Flatten every document's terms, remembering how many came from each document
+        terms = []
+        lengths = np.zeros(len(texts), dtype=np.int64)
+        for i, (text, language) in enumerate(zip(texts, languages)):
+            if isinstance(text, str) and text:
+                document_terms = tokenize(text, language, self.ngram_range)
+                terms.extend(document_terms)
+                lengths[i] = len(document_terms)
+
+        self.n_documents += len(texts)
+        if not terms:
+            return self
+
+        # Factorize the chunk in C, then map only its distinct terms to vocabulary ids
+        local_ids, chunk_terms = pd.factorize(np.array(terms, dtype=object))
+        global_ids = np.array([self._term_id(term) for term in chunk_terms], dtype=np.int64)
+        self._grow()
+
+        distinct = len(chunk_terms)
+        documents = np.repeat(np.arange(len(texts)), lengths)
+
+        self.total_counts[global_ids] += np.bincount(local_ids, minlength=distinct)
+
+        # Per-category counts in one bincount over (category, term) cells
+        term_codes = codes[documents]
+        labelled = term_codes >= 0
+        cells = term_codes[labelled] * distinct + local_ids[labelled]
+        self.category_counts[:, global_ids] += np.bincount(
+            cells, minlength=len(self.categories) * distinct
+        ).reshape(len(self.categories), distinct)
+
+        # Document frequency counts each (document, term) pair once
+        pairs = np.sort(documents * distinct + local_ids)
+        first = np.concatenate(([True], pairs[1:] != pairs[:-1]))
+        self.document_frequency[global_ids] += np.bincount(pairs[first] % distinct, minlength=distinct)
+
+        return self
+
+    def merge(self, other):
+        """
+        Add another counter's statistics to this one.
+
+        Args:
+            other (TermCounter): Counter built with the same categories
+
+        Returns:
+            TermCounter: self
+        """
+        if other.categories != self.categories:
+            raise ValueError("Cannot merge term counters with different categories")
+
+        ids = np.array([self._term_id(term) for term in other.terms], dtype=np.int64)
+        self._grow()
+
+        # Ids are unique, so fancy-index addition is safe
+        self.total_counts[ids] += other.total_counts
+        self.category_counts[:, ids] += other.category_counts
+        self.document_frequency[ids] += other.document_frequency
+        self.n_documents += other.n_documents
+        return self
+
+    def _top(self, weights, k, min_count):
+        """
+        Select the k highest-weighted terms.
+
+        Args:
+            weights (ndarray): Weight per term
+            k (int): Number of terms
+            min_count (int): Minimum total count for a term to be ranked
+
+        Returns:
+            dict: Terms mapped to weights, highest first
+        """
+        candidates = np.flatnonzero(self.total_counts >= min_count)
+        if len(candidates) == 0:
+            return {}
+
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-weights[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-weights[candidates], kind='stable')]
+        return {self.terms[i]: float(weights[i]) for i in candidates}
+
+    def top_terms(self, k=20, weighting='count', min_count=1):
+        """
+        Get the top terms by raw count or TF-IDF.
+
+        Args:
+            k (int): Number of terms
+            weighting (str): 'count' or 'tfidf' (corpus count times smoothed IDF)
+            min_count (int): Minimum total count for a term to be ranked
+
+        Returns:
+            dict: Terms mapped to weights, highest first
+        """
+        if weighting == 'count':
+            weights = self.total_counts.astype(np.float64)
+        elif weighting == 'tfidf':
+            idf = np.log((1 + self.n_documents) / (1 + self.document_frequency)) + 1
+            weights = self.total_counts * idf
+        else:
+            raise ValueError(f"Unsupported term weighting: {weighting}")
+
+        return self._top(weights, k, min_count)
+
+    def associated_terms(self, category='negative', k=20, min_count=2, prior_scale=1.0):
+        """
+        Get the terms most associated with a sentiment category.
+        Uses the log-odds ratio with an informative Dirichlet prior taken
+        from the overall term counts, ranked by z-score.
+
+        Args:
+            category (str): Sentiment category to contrast with all others
+            k (int): Number of terms
+            min_count (int): Minimum total count for a term to be ranked
+            prior_scale (float): Strength of the prior relative to the corpus counts
+
+        Returns:
+            dict: Terms mapped to z-scores, highest first (only positive scores)
+        """
+        if category not in self.categories:
+            raise ValueError(f"Unknown sentiment category: {category}")
+
+        index = self.categories.index(category)
+        target = self.category_counts[index].astype(np.float64)
+        rest = self.category_counts.sum(axis=0) - target
+
+        alpha = prior_scale * self.total_counts.astype(np.float64)
+        alpha_total = alpha.sum()
+        if alpha_total == 0:
+            return {}
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            target_odds = np.log((target + alpha) / (target.sum() + alpha_total - target - alpha))
+            rest_odds = np.log((rest + alpha) / (rest.sum() + alpha_total - rest - alpha))
+            z_scores = (target_odds - rest_odds) / np.sqrt(1 / (target + alpha) + 1 / (rest + alpha))
+
+        z_scores = np.nan_to_num(z_scores, nan=0.0, posinf=0.0, neginf=0.0)
+        return {term: z for term, z in self._top(z_scores, k, min_count).items() if z > 0}
+
+def count_terms(df, text_columns, language_column='language', category_column='sentiment_category',
+                ngram_range=(1, 2), counter=None):
+    """
+    Count the terms of a scored DataFrame.
+
+    Args:
+        df (DataFrame): Scored documents
+        text_columns (list): Text columns joined into one document per row
+        language_column (str): Optional column with language codes or names
+        category_column (str): Optional column with sentiment categories
+        ngram_range (tuple): Smallest and largest n-gram length (1 or 2)
+        counter (TermCounter): Existing counter to update (None starts a new one)
+
+    Returns:
+        TermCounter: Counter including the DataFrame's documents
+    """
+    if counter is None:
+        counter = TermCounter(ngram_range)
+    if df is None or df.empty:
+        return counter
+
+    columns = [df[c].astype(object).where(df[c].notna(), "").tolist() for c in text_columns if c in df.columns]
+    texts = [" ".join(parts) for parts in zip(*columns)] if columns else [""] * len(df)
+
+    languages = df[language_column].astype(object).tolist() if language_column in df.columns else None
+    categories = df[category_column].astype(object).tolist() if category_column in df.columns else None
+
+    return counter.update(texts, languages, categories)
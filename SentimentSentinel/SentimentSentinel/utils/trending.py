@@ -0,0 +1,486 @@
+import hashlib
+import heapq
+import re
+from collections import Counter, OrderedDict
+import numpy as np
+import pandas as pd
+from utils.figure_cache import frame_fingerprint
+
+# URLs are removed first so '#fragment' and '@' in links aren't counted
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+HASHTAG_PATTERN = re.compile(r'(?<![\w#])#(\w+)')
+MENTION_PATTERN = re.compile(r'(?<![\w@])@(\w+)')
+
+# Count-Min Sketch size: error <= e/width of the window total with probability 1 - exp(-depth)
+CMS_WIDTH = 4096
+CMS_DEPTH = 4
+
+# Heavy-hitter candidates kept per country and time bucket; tags above 1/TOP_K of a bucket are always kept
+TOP_K = 200
+
+# Burst detection: short-window rate must exceed the baseline rate by this factor
+BURST_RATIO = 3.0
+BURST_MIN_COUNT = 5
+
+# Key used for counts across all countries
+ALL_COUNTRIES = "*"
+
+# Fingerprints of counted frames remembered to skip repeats
+SEEN_FRAMES_LIMIT = 64
+
+def extract_tags(text):
+    """
+    Extract hashtags and mentions from raw text (before clean_text strips them).
+
+    Args:
+        text (str): Raw post text
+
+    Returns:
+        tuple: (list of '#tag' strings, list of '@mention' strings), lowercased
+    """
+    if not isinstance(text, str) or not text:
+        return [], []
+
+    text = URL_PATTERN.sub(' ', text.lower())
+    hashtags = ['#' + tag for tag in HASHTAG_PATTERN.findall(text)]
+    mentions = ['@' + name for name in MENTION_PATTERN.findall(text)]
+    return hashtags, mentions
+
+def extract_tag_columns(texts):
+    """
+    Extract hashtags and mentions for a column of texts.
+
+    Args:
+        texts (Series): Raw texts
+
+    Returns:
+        tuple: (Series of space-separated hashtags, Series of space-separated mentions)
+    """
+    extracted = [extract_tags(text) for text in texts.astype(object)]
+    hashtags = pd.Series([" ".join(tags) for tags, _ in extracted], index=texts.index)
+    mentions = pd.Series([" ".join(names) for _, names in extracted], index=texts.index)
+    return hashtags, mentions
+
+def _item_hashes(item):
+    """
+    Get two stable 32-bit hashes for an item (Python's str hash is salted per process).
+
+    Args:
+        item (str): Item
+
+    Returns:
+        tuple: (h1, h2) with h2 odd
+    """
+    digest = int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'little')
+    return digest & 0xFFFFFFFF, (digest >> 32) | 1
+
+class CountMinSketch:
+    """
+    Fixed-size frequency estimates for an unbounded set of items.
+    Estimates never undercount; overcounts are bounded by the table width.
+    """
+
+    def __init__(self, width=CMS_WIDTH, depth=CMS_DEPTH):
+        """
+        Args:
+            width (int): Counters per row
+            depth (int): Number of hash rows
+        """
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        self._rows = np.arange(depth)
+
+    def _columns(self, item):
+        """
+        Get the counter column of an item in every row (double hashing).
+
+        Args:
+            item (str): Item
+
+        Returns:
+            ndarray: Column per row
+        """
+        h1, h2 = _item_hashes(item)
+        return (h1 + self._rows * h2) % self.width
+
+    def add(self, item, count=1):
+        """
+        Add occurrences of an item.
+
+        Args:
+            item (str): Item
+            count (int): Occurrences
+
+        Returns:
+            int: The item's new estimated count
+        """
+        columns = self._columns(item)
+        self.table[self._rows, columns] += count
+        self.total += count
+        return int(self.table[self._rows, columns].min())
+
+    def add_many(self, items, counts):
+        """
+        Add occurrences of several distinct items in one update.
+
+        Args:
+            items (list): Distinct items
+            counts (list): Occurrences per item
+        """
+        columns = np.array([self._columns(item) for item in items], dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.int64)
+        np.add.at(self.table, (np.broadcast_to(self._rows, columns.shape), columns), counts[:, None])
+        self.total += int(counts.sum())
+
+    def estimate(self, item):
+        """
+        Estimate an item's count.
+
+        Args:
+            item (str): Item
+
+        Returns:
+            int: Estimated count (never below the true count)
+        """
+        return int(self.table[self._rows, self._columns(item)].min())
+
+class SpaceSaving:
+    """
+    Space-Saving top-K: tracks at most k candidate heavy hitters.
+    When full, a new item replaces the smallest counter and inherits its
+    count as the error bound, so every item with true frequency above
+    total/k is guaranteed to be kept. The smallest counter is found with a
+    min-heap whose outdated entries are skipped lazily.
+    """
+
+    def __init__(self, k=TOP_K):
+        """
+        Args:
+            k (int): Number of counters
+        """
+        self.k = k
+        self.counts = {}
+        self.errors = {}
+        self._heap = []
+
+    def _push(self, item):
+        """
+        Record an item's current count in the heap, compacting stale entries when it grows.
+
+        Args:
+            item (str): Item
+        """
+        heapq.heappush(self._heap, (self.counts[item], item))
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(count, item) for item, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def add(self, item, count=1):
+        """
+        Add occurrences of an item.
+
+        Args:
+            item (str): Item
+            count (int): Occurrences
+        """
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.k:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            # Skip heap entries whose count is outdated
+            while True:
+                floor, smallest = heapq.heappop(self._heap)
+                if self.counts.get(smallest) == floor:
+                    break
+            del self.counts[smallest]
+            del self.errors[smallest]
+            self.counts[item] = floor + count
+            self.errors[item] = floor
+        self._push(item)
+
+    def top(self, k=None):
+        """
+        Get the candidates with the highest counts.
+
+        Args:
+            k (int): Number of items (None for all candidates)
+
+        Returns:
+            list: (item, count, error) tuples, highest count first
+        """
+        ranked = sorted(self.counts.items(), key=lambda pair: pair[1], reverse=True)
+        return [(item, count, self.errors[item]) for item, count in ranked[:k]]
+
+class TrendingTracker:
+    """
+    Streaming hashtag and mention trends per country and time bucket.
+    Each bucket holds one Count-Min Sketch (keyed by country and tag) and a
+    Space-Saving top-K per country, and only the most recent long_buckets
+    buckets are kept, so memory is fixed however many distinct tags appear.
+    """
+
+    def __init__(self, bucket="1D", short_buckets=1, long_buckets=7, top_k=TOP_K,
+                 cms_width=CMS_WIDTH, cms_depth=CMS_DEPTH):
+        """
+        Args:
+            bucket (str): Bucket length as a pandas frequency (e.g. '1h', '1D')
+            short_buckets (int): Buckets in the short (recent) window
+            long_buckets (int): Buckets kept in total; those before the short
+                window form the burst baseline
+            top_k (int): Candidates per country and bucket
+            cms_width (int): Count-Min Sketch width
+            cms_depth (int): Count-Min Sketch depth
+        """
+        if short_buckets >= long_buckets:
+            raise ValueError("short_buckets must be smaller than long_buckets")
+
+        self.bucket = pd.tseries.frequencies.to_offset(bucket)
+        self.short_buckets = short_buckets
+        self.long_buckets = long_buckets
+        self.top_k = top_k
+        self.cms_width = cms_width
+        self.cms_depth = cms_depth
+        self._buckets = OrderedDict()
+        self._seen_frames = OrderedDict()
+
+    def _bucket_for(self, start):
+        """
+        Get (creating if needed) the bucket starting at a time.
+
+        Args:
+            start (Timestamp): Bucket start
+
+        Returns:
+            dict: Bucket with 'sketch' and per-country 'top', or None if the
+                bucket is older than the long window
+        """
+        if start not in self._buckets:
+            if self._buckets:
+                newest = max(start, next(reversed(self._buckets)))
+                if start < newest - (self.long_buckets - 1) * self.bucket:
+                    return None
+
+            self._buckets[start] = {"sketch": CountMinSketch(self.cms_width, self.cms_depth), "top": {}}
+            self._buckets = OrderedDict(sorted(self._buckets.items()))
+
+            # Drop buckets that fell out of the long window
+            newest = next(reversed(self._buckets))
+            oldest_kept = newest - (self.long_buckets - 1) * self.bucket
+            for old in [b for b in self._buckets if b < oldest_kept]:
+                del self._buckets[old]
+
+        return self._buckets.get(start)
+
+    def _add_counts(self, start, counts):
+        """
+        Add aggregated tag counts to a bucket.
+
+        Args:
+            start (Timestamp): Bucket start
+            counts (Counter): Counts keyed by (country key, tag)
+        """
+        bucket = self._bucket_for(start)
+        if bucket is None or not counts:
+            return
+
+        bucket["sketch"].add_many([f"{key}\x1f{tag}" for key, tag in counts], list(counts.values()))
+        for (key, tag), count in counts.items():
+            bucket["top"].setdefault(key, SpaceSaving(self.top_k)).add(tag, count)
+
+    @staticmethod
+    def _count_tags(counts, country, tags):
+        """
+        Add one post's tags to a Counter for its country and for all countries.
+
+        Args:
+            counts (Counter): Counts keyed by (country key, tag)
+            country (str): Post country (None counts only toward all countries)
+            tags (list): Hashtags and mentions
+        """
+        has_country = country is not None and not pd.isna(country)
+        for tag in tags:
+            counts[(ALL_COUNTRIES, tag)] += 1
+            if has_country:
+                counts[(str(country), tag)] += 1
+
+    def update(self, date, country, tags):
+        """
+        Count the tags of one post.
+
+        Args:
+            date: Post timestamp
+            country (str): Post country (None counts only toward all countries)
+            tags (list): Hashtags and mentions from extract_tags
+        """
+        if not tags or pd.isna(date):
+            return
+
+        counts = Counter()
+        self._count_tags(counts, country, tags)
+        self._add_counts(pd.Timestamp(date).floor(self.bucket), counts)
+
+    def update_frame(self, df, text_column='text', date_column='date', country_column='country'):
+        """
+        Count the tags of a DataFrame of posts. A frame already counted is skipped.
+        Posts are aggregated per bucket first, so each distinct tag is hashed
+        once per bucket.
+
+        Args:
+            df (DataFrame): Posts with raw text, or with 'hashtags' and
+                'mentions' columns from extract_tag_columns
+            text_column (str): Raw text column used when tag columns are absent
+            date_column (str): Timestamp column
+            country_column (str): Country column (optional)
+
+        Returns:
+            int: Number of posts counted
+        """
+        if df is None or df.empty:
+            return 0
+
+        fingerprint = frame_fingerprint(df)
+        if fingerprint in self._seen_frames:
+            return 0
+        self._seen_frames[fingerprint] = True
+        if len(self._seen_frames) > SEEN_FRAMES_LIMIT:
+            self._seen_frames.popitem(last=False)
+
+        if 'hashtags' in df.columns and 'mentions' in df.columns:
+            tags = [
+                f"{hashtags} {mentions}".split()
+                for hashtags, mentions in zip(df['hashtags'].fillna(""), df['mentions'].fillna(""))
+            ]
+        else:
+            tags = [hashtags + mentions for hashtags, mentions in map(extract_tags, df[text_column].astype(object))]
+
+        starts = pd.to_datetime(df[date_column], errors='coerce').dt.floor(self.bucket).to_numpy()
+        countries = df[country_column].astype(object).tolist() if country_column in df.columns else [None] * len(df)
+
+        # Feed buckets in time order so old buckets are dropped correctly
+        order = np.argsort(starts, kind='stable')
+        order = order[~np.isnat(starts[order])]
+        boundaries = np.flatnonzero(starts[order][1:] != starts[order][:-1]) + 1
+
+        for positions in np.split(order, boundaries):
+            if len(positions) == 0:
+                continue
+            counts = Counter()
+            for i in positions:
+                self._count_tags(counts, countries[i], tags[i])
+            self._add_counts(pd.Timestamp(starts[positions[0]]), counts)
+
+        return len(df)
+
+    def _window(self, short):
+        """
+        Get the buckets of the short window or of the baseline before it.
+
+        Args:
+            short (bool): True for the short window, False for the baseline
+
+        Returns:
+            list: Buckets, oldest first
+        """
+        if not self._buckets:
+            return []
+
+        newest = next(reversed(self._buckets))
+        short_start = newest - (self.short_buckets - 1) * self.bucket
+        return [
+            bucket for start, bucket in self._buckets.items()
+            if (start >= short_start) == short
+        ]
+
+    def _estimate(self, buckets, key, tag):
+        """
+        Sum a tag's estimated counts over buckets.
+
+        Args:
+            buckets (list): Buckets
+            key (str): Country key
+            tag (str): Tag
+
+        Returns:
+            int: Estimated count
+        """
+        return sum(bucket["sketch"].estimate(f"{key}\x1f{tag}") for bucket in buckets)
+
+    def _candidates(self, buckets, key):
+        """
+        Collect the Space-Saving candidates of a country over buckets.
+
+        Args:
+            buckets (list): Buckets
+            key (str): Country key
+
+        Returns:
+            set: Candidate tags
+        """
+        return {
+            tag for bucket in buckets if key in bucket["top"]
+            for tag, _, _ in bucket["top"][key].top()
+        }
+
+    def top_tags(self, country=None, k=10, window='long', kind=None):
+        """
+        Get the most frequent tags.
+
+        Args:
+            country (str): Country (None for all countries)
+            k (int): Number of tags
+            window (str): 'short' (recent buckets) or 'long' (all kept buckets)
+            kind (str): '#' for hashtags, '@' for mentions, None for both
+
+        Returns:
+            DataFrame: 'tag' and estimated 'count', highest first
+        """
+        key = ALL_COUNTRIES if country is None else str(country)
+        buckets = self._window(True) if window == 'short' else list(self._buckets.values())
+
+        counts = [
+            (tag, self._estimate(buckets, key, tag))
+            for tag in self._candidates(buckets, key)
+            if kind is None or tag.startswith(kind)
+        ]
+        counts.sort(key=lambda pair: (-pair[1], pair[0]))
+        return pd.DataFrame(counts[:k], columns=['tag', 'count'])
+
+    def bursts(self, country=None, ratio=BURST_RATIO, min_count=BURST_MIN_COUNT):
+        """
+        Flag tags whose recent rate jumps above their baseline rate.
+        Rates are counts per bucket; the ratio adds one to both rates so tags
+        new in the short window need at least min_count occurrences.
+
+        Args:
+            country (str): Country (None for all countries)
+            ratio (float): Minimum short/baseline rate ratio
+            min_count (int): Minimum count in the short window
+
+        Returns:
+            DataFrame: 'tag', 'short_count', 'short_rate', 'baseline_rate' and
+                'ratio', strongest burst first
+        """
+        key = ALL_COUNTRIES if country is None else str(country)
+        short = self._window(True)
+        baseline = self._window(False)
+        # Buckets with no posts are never stored, so rate over the whole window
+        baseline_buckets = self.long_buckets - self.short_buckets
+
+        rows = []
+        for tag in self._candidates(short, key):
+            short_count = self._estimate(short, key, tag)
+            if short_count < min_count:
+                continue
+
+            short_rate = short_count / self.short_buckets
+            baseline_rate = self._estimate(baseline, key, tag) / baseline_buckets
+            burst = (short_rate + 1) / (baseline_rate + 1)
+            if burst >= ratio:
+                rows.append((tag, short_count, short_rate, baseline_rate, burst))
+
+        rows.sort(key=lambda row: -row[-1])
+        return pd.DataFrame(rows, columns=['tag', 'short_count', 'short_rate', 'baseline_rate', 'ratio'])
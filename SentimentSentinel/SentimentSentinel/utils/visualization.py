@@ -1,10 +1,16 @@
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-from utils.sentiment_analyzer import get_sentiment_color
+from utils.sentiment_analyzer import CATEGORY_COLORS, SENTIMENT_CATEGORIES, get_category_color
+from utils.downsampling import downsample_frame, is_aggregated, DEFAULT_MAX_POINTS, WEBGL_THRESHOLD
+from utils.chart_data import prepare_time_frame, group_positions
+from utils.figure_cache import cached_figure
+from utils.aggregation import get_aggregate, aggregate_matrix
 
+# Continuous color scale from negative through neutral to positive
+SENTIMENT_COLOR_SCALE = [CATEGORY_COLORS[category] for category in SENTIMENT_CATEGORIES]
+
+@cached_figure
 def create_sentiment_pie_chart(data, title="Sentiment Distribution"):
     """
     Create a pie chart showing sentiment distribution.
@@ -22,7 +28,7 @@ def create_sentiment_pie_chart(data, title="Sentiment Distribution"):
             labels=["Positive", "Neutral", "Negative"],
             values=[0, 0, 0],
             hole=.4,
-            marker_colors=["#4CAF50", "#FFC107", "#F44336"]
+            marker_colors=[CATEGORY_COLORS["positive"], CATEGORY_COLORS["neutral"], CATEGORY_COLORS["negative"]]
         ))
         fig.update_layout(
             title=title,
@@ -34,9 +40,7 @@ def create_sentiment_pie_chart(data, title="Sentiment Distribution"):
     labels = list(data.keys())
     values = list(data.values())
     
-    colors = ["#4CAF50" if label == "positive" else 
-              "#FFC107" if label == "neutral" else 
-              "#F44336" for label in labels]
+    colors = [get_category_color(label) for label in labels]
     
     fig = go.Figure(go.Pie(
         labels=labels,
@@ -53,7 +57,78 @@ def create_sentiment_pie_chart(data, title="Sentiment Distribution"):
     
     return fig
 
-def create_sentiment_timeline(df, date_column, sentiment_column, title="Sentiment Over Time"):
+def _create_line_chart(df, x_column, y_column, title, color_column=None,
+                       max_points=DEFAULT_MAX_POINTS, downsample_method='lttb', groups=None):
+    """
+    Create a line chart from sorted data, downsampling each series to at most
+    max_points and switching to WebGL for large point counts.
+    
+    Args:
+        df (DataFrame): Data sorted by x
+        x_column (str): Column for x-axis
+        y_column (str): Column for y-axis
+        title (str): Chart title
+        color_column (str): Optional column splitting the data into series
+        max_points (int): Target points per series (None plots every row)
+        downsample_method (str): 'lttb', 'minmax' or 'bucket'
+        groups (list): Series of color_column to include (None includes all)
+        
+    Returns:
+        Figure: Plotly figure object
+    """
+    import plotly.express as px
+
+    plot_df = downsample_frame(df, x_column, y_column, max_points, color_column, downsample_method, groups)
+    render_mode = 'webgl' if len(plot_df) > WEBGL_THRESHOLD else 'svg'
+    
+    # Bucket aggregates are drawn as a mean line with a min-max band
+    if is_aggregated(plot_df):
+        fig = go.Figure()
+        scatter = go.Scattergl if render_mode == 'webgl' else go.Scatter
+        groups = plot_df.groupby(color_column, observed=True) if color_column else [(None, plot_df)]
+        
+        for name, group in groups:
+            fig.add_trace(scatter(
+                x=group[x_column],
+                y=group['max'],
+                line=dict(width=0),
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+            fig.add_trace(scatter(
+                x=group[x_column],
+                y=group['min'],
+                fill='tonexty',
+                fillcolor='rgba(128, 128, 128, 0.2)',
+                line=dict(width=0),
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+            fig.add_trace(scatter(
+                x=group[x_column],
+                y=group[y_column],
+                name=str(name) if name is not None else y_column,
+                customdata=group['count'],
+                hovertemplate="%{x}<br>Mean: %{y:.2f}<br>Posts: %{customdata}<extra></extra>",
+                mode='lines',
+                showlegend=color_column is not None
+            ))
+        
+        fig.update_layout(title=title)
+        return fig
+    
+    return px.line(
+        plot_df,
+        x=x_column,
+        y=y_column,
+        color=color_column,
+        title=title,
+        render_mode=render_mode
+    )
+
+@cached_figure
+def create_sentiment_timeline(df, date_column, sentiment_column, title="Sentiment Over Time",
+                              max_points=DEFAULT_MAX_POINTS, downsample_method='lttb'):
     """
     Create a line chart showing sentiment over time.
     
@@ -62,6 +137,8 @@ def create_sentiment_timeline(df, date_column, sentiment_column, title="Sentimen
         date_column (str): Column containing dates
         sentiment_column (str): Column containing sentiment scores
         title (str): Chart title
+        max_points (int): Target plotted points (None plots every row)
+        downsample_method (str): 'lttb', 'minmax' or 'bucket' (mean with min-max band)
         
     Returns:
         Figure: Plotly figure object
@@ -78,18 +155,17 @@ def create_sentiment_timeline(df, date_column, sentiment_column, title="Sentimen
         )
         return fig
         
-    # Ensure date column is datetime
-    df[date_column] = pd.to_datetime(df[date_column])
-    
-    # Sort by date
-    df = df.sort_values(by=date_column)
+    # Datetime dates sorted ascending (no-op for frames prepared at ingest)
+    df = prepare_time_frame(df, date_column)
     
     # Create chart
-    fig = px.line(
-        df, 
-        x=date_column, 
-        y=sentiment_column,
-        title=title
+    fig = _create_line_chart(
+        df,
+        date_column,
+        sentiment_column,
+        title,
+        max_points=max_points,
+        downsample_method=downsample_method
     )
     
     # Add reference line for neutral sentiment
@@ -111,25 +187,30 @@ def create_sentiment_timeline(df, date_column, sentiment_column, title="Sentimen
     
     return fig
 
-def create_word_cloud(words_with_weights, title="Top Words"):
+@cached_figure
+def create_word_cloud(words_with_weights, title="Top Words", value_label="Frequency"):
     """
     Create a word cloud visualization. Since we can't create actual word clouds,
     this returns a bar chart of top words.
     
     Args:
         words_with_weights (dict): Dictionary with words as keys and weights as values
+            (e.g. from TermCounter.top_terms)
         title (str): Chart title
+        value_label (str): Axis label for the weights
         
     Returns:
         Figure: Plotly figure object
     """
+    import plotly.express as px
+
     if not words_with_weights:
         # Return empty chart if no data
         fig = go.Figure()
         fig.update_layout(
             title=title,
-            xaxis_title="Word",
-            yaxis_title="Frequency",
+            xaxis_title=value_label,
+            yaxis_title="Word",
             height=400,
             margin=dict(l=20, r=20, t=40, b=20)
         )
@@ -149,17 +230,19 @@ def create_word_cloud(words_with_weights, title="Top Words"):
         title=title
     )
     
-    # Update layout
+    # Update layout, keeping the highest weight at the top
     fig.update_layout(
-        xaxis_title="Frequency",
+        xaxis_title=value_label,
         yaxis_title="Word",
+        yaxis=dict(autorange="reversed"),
         height=400,
         margin=dict(l=20, r=20, t=40, b=20)
     )
     
     return fig
 
-def create_sentiment_heatmap(df, x_column, y_column, sentiment_column, title="Sentiment Heatmap"):
+@cached_figure
+def create_sentiment_heatmap(df, x_column, y_column, sentiment_column, title="Sentiment Heatmap", aggregates=None):
     """
     Create a heatmap showing sentiment across two dimensions.
     
@@ -169,10 +252,13 @@ def create_sentiment_heatmap(df, x_column, y_column, sentiment_column, title="Se
         y_column (str): Column for y-axis
         sentiment_column (str): Column containing sentiment scores
         title (str): Chart title
+        aggregates (dict): Optional precomputed results from compute_aggregates
         
     Returns:
         Figure: Plotly figure object
     """
+    import plotly.express as px
+
     if df is None or df.empty:
         # Return empty chart if no data
         fig = go.Figure()
@@ -183,18 +269,14 @@ def create_sentiment_heatmap(df, x_column, y_column, sentiment_column, title="Se
         )
         return fig
         
-    # Pivot data
-    pivot = df.pivot_table(
-        values=sentiment_column,
-        index=y_column,
-        columns=x_column,
-        aggfunc='mean'
-    )
+    # Pivot mean sentiment per (y, x) cell
+    cells = get_aggregate(df, sentiment_column, (y_column, x_column), aggregates)
+    pivot = aggregate_matrix(cells, y_column, x_column, 'mean')
     
     # Create heatmap
     fig = px.imshow(
         pivot,
-        color_continuous_scale=["#F44336", "#FFC107", "#4CAF50"],
+        color_continuous_scale=SENTIMENT_COLOR_SCALE,
         title=title
     )
     
@@ -206,7 +288,8 @@ def create_sentiment_heatmap(df, x_column, y_column, sentiment_column, title="Se
     
     return fig
 
-def create_source_comparison(df, source_column, sentiment_column, title="Sentiment by Source"):
+@cached_figure
+def create_source_comparison(df, source_column, sentiment_column, title="Sentiment by Source", aggregates=None):
     """
     Create a bar chart comparing sentiment across different sources.
     
@@ -215,10 +298,13 @@ def create_source_comparison(df, source_column, sentiment_column, title="Sentime
         source_column (str): Column containing source names
         sentiment_column (str): Column containing sentiment scores
         title (str): Chart title
+        aggregates (dict): Optional precomputed results from compute_aggregates
         
     Returns:
         Figure: Plotly figure object
     """
+    import plotly.express as px
+
     if df is None or df.empty:
         # Return empty chart if no data
         fig = go.Figure()
@@ -231,8 +317,13 @@ def create_source_comparison(df, source_column, sentiment_column, title="Sentime
         )
         return fig
         
-    # Group by source and calculate mean sentiment
-    source_sentiment = df.groupby(source_column)[sentiment_column].mean().reset_index()
+    # Mean sentiment and article count per source
+    source_aggregate = get_aggregate(df, sentiment_column, source_column, aggregates)
+    source_sentiment = pd.DataFrame({
+        source_column: source_aggregate[source_column],
+        sentiment_column: source_aggregate['mean'],
+        'Article Count': source_aggregate['count']
+    })
     
     # Sort by sentiment
     source_sentiment = source_sentiment.sort_values(by=sentiment_column)
@@ -244,7 +335,8 @@ def create_source_comparison(df, source_column, sentiment_column, title="Sentime
         y=sentiment_column,
         title=title,
         color=sentiment_column,
-        color_continuous_scale=["#F44336", "#FFC107", "#4CAF50"]
+        color_continuous_scale=SENTIMENT_COLOR_SCALE,
+        hover_data=['Article Count']
     )
     
     # Add reference line for neutral sentiment
@@ -266,7 +358,159 @@ def create_source_comparison(df, source_column, sentiment_column, title="Sentime
     
     return fig
 
-def create_trend_chart(df, date_column, country_column, sentiment_column, countries, title="Sentiment Trends"):
+@cached_figure
+def create_topic_sentiment_chart(df, topic_column, sentiment_column, title="Average Sentiment by Topic and Country",
+                                 aggregates=None):
+    """
+    Create a bar chart of average sentiment per topic.
+    
+    Args:
+        df (DataFrame): DataFrame containing sentiment data
+        topic_column (str): Column containing topics
+        sentiment_column (str): Column containing sentiment scores
+        title (str): Chart title
+        aggregates (dict): Optional precomputed results from compute_aggregates
+        
+    Returns:
+        Figure: Plotly figure object
+    """
+    import plotly.express as px
+
+    if df is None or df.empty:
+        # Return empty chart if no data
+        fig = go.Figure()
+        fig.update_layout(
+            title=title,
+            xaxis_title="Topic",
+            yaxis_title="Average Sentiment",
+            height=400,
+            margin=dict(l=20, r=20, t=40, b=20)
+        )
+        return fig
+        
+    # Mean sentiment per topic
+    topic_aggregate = get_aggregate(df, sentiment_column, topic_column, aggregates)
+    topic_sentiment = pd.DataFrame({
+        'Topic': topic_aggregate[topic_column],
+        'Average Sentiment': topic_aggregate['mean']
+    })
+    
+    # Create chart
+    fig = px.bar(
+        topic_sentiment, 
+        x='Topic', 
+        y='Average Sentiment',
+        color='Average Sentiment',
+        color_continuous_scale=SENTIMENT_COLOR_SCALE,
+        title=title
+    )
+    fig.update_layout(height=400)
+    
+    return fig
+
+@cached_figure
+def create_source_count_chart(df, source_column, title="Article Count by Source", aggregates=None,
+                              value_column='sentiment_score'):
+    """
+    Create a bar chart of item counts per source.
+    
+    Args:
+        df (DataFrame): DataFrame containing source data
+        source_column (str): Column containing source names
+        title (str): Chart title
+        aggregates (dict): Optional precomputed results from compute_aggregates
+        value_column (str): Value column used if aggregates must be computed
+        
+    Returns:
+        Figure: Plotly figure object
+    """
+    import plotly.express as px
+
+    if df is None or df.empty:
+        # Return empty chart if no data
+        fig = go.Figure()
+        fig.update_layout(
+            title=title,
+            xaxis_title="Source",
+            yaxis_title="Count",
+            height=400,
+            margin=dict(l=20, r=20, t=40, b=20)
+        )
+        return fig
+        
+    # Count items per source
+    source_aggregate = get_aggregate(df, value_column, source_column, aggregates)
+    source_counts = pd.DataFrame({
+        'Source': source_aggregate[source_column],
+        'Count': source_aggregate['size']
+    }).sort_values('Count', ascending=False, kind='stable')
+    
+    # Create chart
+    fig = px.bar(
+        source_counts, 
+        x='Source', 
+        y='Count',
+        title=title,
+        color='Count',
+        color_continuous_scale="Viridis"
+    )
+    
+    return fig
+
+@cached_figure
+def create_topic_coverage_chart(df, source_column, topic_column, title="Topic Coverage by Media Outlet",
+                                aggregates=None, value_column='sentiment_score'):
+    """
+    Create a grouped bar chart of topic coverage per source.
+    
+    Args:
+        df (DataFrame): DataFrame containing source and topic data
+        source_column (str): Column containing source names
+        topic_column (str): Column containing topics
+        title (str): Chart title
+        aggregates (dict): Optional precomputed results from compute_aggregates
+        value_column (str): Value column used if aggregates must be computed
+        
+    Returns:
+        Figure: Plotly figure object
+    """
+    import plotly.express as px
+
+    if df is None or df.empty:
+        # Return empty chart if no data
+        fig = go.Figure()
+        fig.update_layout(
+            title=title,
+            height=400,
+            margin=dict(l=20, r=20, t=40, b=20)
+        )
+        return fig
+        
+    # Calculate topic coverage by source
+    cells = get_aggregate(df, value_column, (source_column, topic_column), aggregates)
+    topic_coverage = aggregate_matrix(cells, source_column, topic_column, 'size', fill_value=0).reset_index()
+    
+    # Melt for plotting
+    topic_coverage_melted = topic_coverage.melt(
+        id_vars=[source_column],
+        var_name='Topic',
+        value_name='Count'
+    )
+    
+    fig = px.bar(
+        topic_coverage_melted,
+        x=source_column,
+        y='Count',
+        color='Topic',
+        title=title,
+        barmode='group'
+    )
+    
+    return fig
+
+@cached_figure
+def create_trend_chart(df, date_column, country_column, sentiment_column, countries, title="Sentiment Trends",
+                       events=None, max_events=20, max_points=DEFAULT_MAX_POINTS, downsample_method='lttb'):
     """
     Create a line chart showing sentiment trends for multiple countries.
     
@@ -277,6 +521,11 @@ def create_trend_chart(df, date_column, country_column, sentiment_column, countr
         sentiment_column (str): Column containing sentiment scores
         countries (list): List of countries to include
         title (str): Chart title
+        events (DataFrame): Optional key events (e.g. detected change points)
+            with date, country, direction and method columns
+        max_events (int): Maximum number of event annotations, largest shifts first
+        max_points (int): Target plotted points per country (None plots every row)
+        downsample_method (str): 'lttb', 'minmax' or 'bucket' (mean with min-max band)
         
     Returns:
         Figure: Plotly figure object
@@ -293,22 +542,22 @@ def create_trend_chart(df, date_column, country_column, sentiment_column, countr
         )
         return fig
         
-    # Ensure date column is datetime
-    df[date_column] = pd.to_datetime(df[date_column])
+    # Datetime dates sorted ascending (no-op for frames prepared at ingest)
+    df = prepare_time_frame(df, date_column)
     
-    # Filter for selected countries
-    df = df[df[country_column].isin(countries)]
-    
-    # Sort by date
-    df = df.sort_values(by=date_column)
+    # Row positions of the selected countries, used instead of a filtered copy
+    positions = group_positions(df, country_column, countries)
     
     # Create chart
-    fig = px.line(
-        df, 
-        x=date_column, 
-        y=sentiment_column,
-        color=country_column,
-        title=title
+    fig = _create_line_chart(
+        df,
+        date_column,
+        sentiment_column,
+        title,
+        color_column=country_column,
+        max_points=max_points,
+        downsample_method=downsample_method,
+        groups=countries
     )
     
     # Add reference line for neutral sentiment
@@ -329,8 +578,36 @@ def create_trend_chart(df, date_column, country_column, sentiment_column, countr
         legend_title="Country"
     )
     
+    # Annotate key events
+    if events is not None and not events.empty:
+        events = events[events[country_column].isin(countries)]
+        if 'magnitude' in events.columns:
+            events = events.reindex(events['magnitude'].abs().sort_values(ascending=False).index)
+        
+        dates = df[date_column].to_numpy()
+        values = df[sentiment_column].to_numpy()
+        
+        for _, event in events.head(max_events).iterrows():
+            # Anchor the annotation on the country's line at the event date
+            rows = positions.get(event[country_column], [])
+            index = np.searchsorted(dates[rows], np.datetime64(pd.Timestamp(event[date_column])), side='right') - 1
+            y = values[rows[index]] if len(rows) and index >= 0 else 0
+            
+            arrow = "▲" if event.get('direction') == "increase" else "▼"
+            fig.add_annotation(
+                x=event[date_column],
+                y=y,
+                text=f"{arrow} {event[country_column]}",
+                hovertext=f"{event.get('method', 'Event')}: sentiment {event.get('direction', 'shift')}",
+                showarrow=True,
+                arrowhead=2,
+                ax=0,
+                ay=-30
+            )
+    
     return fig
 
+@cached_figure
 def create_forecast_chart(historical_df, forecast_df, date_column, sentiment_column, title="Sentiment Forecast"):
     """
     Create a line chart showing historical sentiment and forecast.
@@ -349,11 +626,8 @@ def create_forecast_chart(historical_df, forecast_df, date_column, sentiment_col
     
     # Check if historical data exists
     if historical_df is not None and not historical_df.empty:
-        # Ensure date column is datetime
-        historical_df[date_column] = pd.to_datetime(historical_df[date_column])
-        
-        # Sort by date
-        historical_df = historical_df.sort_values(by=date_column)
+        # Datetime dates sorted ascending (no-op for frames prepared at ingest)
+        historical_df = prepare_time_frame(historical_df, date_column)
         
         # Add historical data
         fig.add_trace(go.Scatter(
@@ -365,11 +639,26 @@ def create_forecast_chart(historical_df, forecast_df, date_column, sentiment_col
     
     # Check if forecast data exists
     if forecast_df is not None and not forecast_df.empty:
-        # Ensure date column is datetime
-        forecast_df[date_column] = pd.to_datetime(forecast_df[date_column])
+        # Datetime dates sorted ascending (no-op for frames prepared at ingest)
+        forecast_df = prepare_time_frame(forecast_df, date_column)
         
-        # Sort by date
-        forecast_df = forecast_df.sort_values(by=date_column)
+        # Add prediction interval band if available
+        if 'lower' in forecast_df.columns and 'upper' in forecast_df.columns:
+            fig.add_trace(go.Scatter(
+                x=forecast_df[date_column],
+                y=forecast_df['upper'],
+                line=dict(width=0),
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+            fig.add_trace(go.Scatter(
+                x=forecast_df[date_column],
+                y=forecast_df['lower'],
+                name='Prediction Interval',
+                fill='tonexty',
+                fillcolor='rgba(255, 0, 0, 0.15)',
+                line=dict(width=0)
+            ))
         
         # Add forecast data
         fig.add_trace(go.Scatter(
@@ -0,0 +1,325 @@
+import math
+from collections import deque
+import numpy as np
+import pandas as pd
+from utils.forecasting import build_series_matrix
+
+# Default rolling window (days) and EWMA span
+VOLATILITY_WINDOW = 7
+EWMA_SPAN = 7
+
+# CUSUM allowance and decision threshold, in standard deviations
+CUSUM_DRIFT = 0.5
+CUSUM_THRESHOLD = 5.0
+
+# Points observed before a detector may raise an alarm
+DETECTOR_WARMUP = 5
+
+# BOCPD expected run length between changes, run-length truncation and alarm settings
+BOCPD_HAZARD_LAMBDA = 30
+BOCPD_MAX_RUN_LENGTH = 120
+BOCPD_SHORT_RUN = 3
+BOCPD_THRESHOLD = 0.5
+
+class RollingStd:
+    """
+    Rolling standard deviation over a fixed window, updated in O(1) per point.
+    """
+
+    def __init__(self, window=VOLATILITY_WINDOW):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def update(self, value):
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            self.total -= old
+            self.total_sq -= old * old
+
+        n = len(self.values)
+        if n < 2:
+            return float('nan')
+        variance = (self.total_sq - self.total * self.total / n) / (n - 1)
+        return math.sqrt(max(variance, 0.0))
+
+class EWMAVolatility:
+    """
+    Exponentially weighted mean and volatility, updated in O(1) per point.
+    """
+
+    def __init__(self, span=EWMA_SPAN):
+        self.alpha = 2 / (span + 1)
+        self.mean = None
+        self.variance = 0.0
+
+    def update(self, value):
+        if self.mean is None:
+            self.mean = value
+            return 0.0
+
+        diff = value - self.mean
+        increment = self.alpha * diff
+        self.mean += increment
+        self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+        return math.sqrt(self.variance)
+
+class CusumDetector:
+    """
+    Two-sided CUSUM on standardized deviations from an EWMA baseline.
+    Updated in O(1) per point; the baseline restarts after each alarm.
+    """
+
+    def __init__(self, drift=CUSUM_DRIFT, threshold=CUSUM_THRESHOLD, span=EWMA_SPAN * 2):
+        self.drift = drift
+        self.threshold = threshold
+        self.span = span
+        self._reset()
+
+    def _reset(self):
+        self.baseline = EWMAVolatility(self.span)
+        self.upper = 0.0
+        self.lower = 0.0
+        self.count = 0
+
+    def update(self, value):
+        """
+        Add a point.
+
+        Args:
+            value (float): New observation
+
+        Returns:
+            dict or None: Change description if a shift was detected
+        """
+        self.count += 1
+        if self.count <= DETECTOR_WARMUP:
+            self.baseline.update(value)
+            return None
+
+        mean = self.baseline.mean
+        std = max(math.sqrt(self.baseline.variance), 1e-3)
+        z = (value - mean) / std
+
+        self.upper = max(0.0, self.upper + z - self.drift)
+        self.lower = max(0.0, self.lower - z - self.drift)
+
+        if self.upper > self.threshold or self.lower > self.threshold:
+            change = {
+                "method": "CUSUM",
+                "direction": "increase" if self.upper > self.threshold else "decrease",
+                "magnitude": value - mean,
+                "offset": 0
+            }
+            self._reset()
+            self.baseline.update(value)
+            self.count = 1
+            return change
+
+        self.baseline.update(value)
+        return None
+
+# log Gamma values for the Student-t predictive, indexed by run length
+_BOCPD_ALPHA0 = 1.0
+_BOCPD_LGAMMA = np.array([
+    math.lgamma(_BOCPD_ALPHA0 + r / 2 + 0.5) - math.lgamma(_BOCPD_ALPHA0 + r / 2)
+    for r in range(BOCPD_MAX_RUN_LENGTH + 1)
+])
+
+class BocpdDetector:
+    """
+    Bayesian online change-point detection (Adams & MacKay) with a
+    Normal-Gamma model. The run-length distribution is truncated at
+    BOCPD_MAX_RUN_LENGTH, so each update costs a constant amount of work.
+    """
+
+    def __init__(self, hazard_lambda=BOCPD_HAZARD_LAMBDA, max_run_length=BOCPD_MAX_RUN_LENGTH,
+                 mu0=0.0, kappa0=1.0, beta0=0.01):
+        self.hazard = 1 / hazard_lambda
+        self.max_run_length = min(max_run_length, BOCPD_MAX_RUN_LENGTH)
+        self.prior = (mu0, kappa0, _BOCPD_ALPHA0, beta0)
+
+        # Run-length posterior and sufficient statistics per run length
+        self.log_probs = np.array([0.0])
+        self.mu = np.array([mu0])
+        self.kappa = np.array([kappa0])
+        self.alpha = np.array([_BOCPD_ALPHA0])
+        self.beta = np.array([beta0])
+        self.count = 0
+        self.last_alarm = -BOCPD_SHORT_RUN - 1
+
+    def update(self, value):
+        """
+        Add a point.
+
+        Args:
+            value (float): New observation
+
+        Returns:
+            dict or None: Change description if a shift was detected
+        """
+        self.count += 1
+        runs = len(self.log_probs)
+
+        # Student-t predictive log density under each run length
+        scale = self.beta * (self.kappa + 1) / (self.alpha * self.kappa)
+        nu = 2 * self.alpha
+        log_pred = (
+            _BOCPD_LGAMMA[:runs]
+            - 0.5 * np.log(nu * math.pi * scale)
+            - (nu + 1) / 2 * np.log1p((value - self.mu) ** 2 / (nu * scale))
+        )
+
+        # Grow every run or reset to zero
+        log_growth = self.log_probs + log_pred + math.log(1 - self.hazard)
+        log_reset = np.logaddexp.reduce(self.log_probs + log_pred) + math.log(self.hazard)
+        log_probs = np.concatenate([[log_reset], log_growth])
+        log_probs -= np.logaddexp.reduce(log_probs)
+
+        # Update sufficient statistics for the grown runs
+        mu0, kappa0, alpha0, beta0 = self.prior
+        mu = np.concatenate([[mu0], (self.kappa * self.mu + value) / (self.kappa + 1)])
+        beta = np.concatenate([[beta0], self.beta + self.kappa * (value - self.mu) ** 2 / (2 * (self.kappa + 1))])
+        kappa = np.concatenate([[kappa0], self.kappa + 1])
+        alpha = np.concatenate([[alpha0], self.alpha + 0.5])
+
+        # Truncate the run-length distribution to keep updates constant-time
+        limit = self.max_run_length + 1
+        self.log_probs = log_probs[:limit] - np.logaddexp.reduce(log_probs[:limit])
+        self.mu, self.kappa, self.alpha, self.beta = mu[:limit], kappa[:limit], alpha[:limit], beta[:limit]
+
+        if self.count <= DETECTOR_WARMUP:
+            return None
+
+        # A change is flagged once most of the mass sits on a short run
+        short_mass = np.exp(self.log_probs[1:BOCPD_SHORT_RUN + 1]).sum()
+        if short_mass > BOCPD_THRESHOLD and self.count - self.last_alarm > BOCPD_SHORT_RUN:
+            self.last_alarm = self.count
+            run = int(np.argmax(self.log_probs[1:BOCPD_SHORT_RUN + 1])) + 1
+            previous_mean = self.mu[min(run + BOCPD_SHORT_RUN, len(self.mu) - 1)]
+            return {
+                "method": "BOCPD",
+                "direction": "increase" if self.mu[run] > previous_mean else "decrease",
+                "magnitude": float(self.mu[run] - previous_mean),
+                "offset": run - 1
+            }
+
+        return None
+
+class SentimentStreamMonitor:
+    """
+    Per-country volatility and change-point tracking for a live stream of
+    daily sentiment values. Every update is O(1).
+    """
+
+    def __init__(self, window=VOLATILITY_WINDOW, span=EWMA_SPAN, methods=("CUSUM", "BOCPD")):
+        self.window = window
+        self.span = span
+        self.methods = methods
+        self.states = {}
+
+    def _get_state(self, country):
+        if country not in self.states:
+            detectors = []
+            if "CUSUM" in self.methods:
+                detectors.append(CusumDetector())
+            if "BOCPD" in self.methods:
+                detectors.append(BocpdDetector())
+            self.states[country] = {
+                "rolling": RollingStd(self.window),
+                "ewma": EWMAVolatility(self.span),
+                "detectors": detectors,
+                "dates": deque(maxlen=BOCPD_SHORT_RUN + 1)
+            }
+        return self.states[country]
+
+    def update(self, country, date, value):
+        """
+        Add a daily value for a country.
+
+        Args:
+            country (str): Country name
+            date (Timestamp): Day of the value
+            value (float): Daily sentiment score
+
+        Returns:
+            tuple: (rolling std, EWMA volatility, list of change-point events)
+        """
+        state = self._get_state(country)
+        state["dates"].append(date)
+
+        events = []
+        for detector in state["detectors"]:
+            change = detector.update(value)
+            if change is not None:
+                # Date the event at the estimated start of the new regime
+                offset = min(change.pop("offset"), len(state["dates"]) - 1)
+                change.update({"date": state["dates"][-1 - offset], "country": country})
+                events.append(change)
+
+        return state["rolling"].update(value), state["ewma"].update(value), events
+
+def compute_volatility(df, date_column='date', country_column='country', sentiment_column='sentiment_score',
+                       window=VOLATILITY_WINDOW, span=EWMA_SPAN):
+    """
+    Compute daily rolling and EWMA volatility for every country at once.
+
+    Args:
+        df (DataFrame): Historical data
+        date_column (str): Column containing dates
+        country_column (str): Column containing country names
+        sentiment_column (str): Column containing sentiment scores
+        window (int): Rolling window in days
+        span (int): EWMA span in days
+
+    Returns:
+        DataFrame: Daily rows with date, country, mean sentiment, rolling_std and ewma_volatility
+    """
+    keys, days, Y = build_series_matrix(df, date_column, sentiment_column, [country_column])
+    daily = pd.DataFrame(Y.T, index=days, columns=keys[country_column])
+
+    rolling = daily.rolling(window, min_periods=2).std()
+    ewma = daily.ewm(span=span, adjust=False).std()
+
+    result = pd.concat(
+        {sentiment_column: daily, 'rolling_std': rolling, 'ewma_volatility': ewma},
+        axis=1
+    ).stack(level=1, future_stack=True).reset_index()
+    result.columns = [date_column, country_column, sentiment_column, 'rolling_std', 'ewma_volatility']
+    return result
+
+def detect_change_points(df, date_column='date', country_column='country', sentiment_column='sentiment_score',
+                         methods=("CUSUM", "BOCPD")):
+    """
+    Detect sentiment change points per country by replaying the daily series
+    through the same online detectors used on the live stream.
+
+    Args:
+        df (DataFrame): Historical data
+        date_column (str): Column containing dates
+        country_column (str): Column containing country names
+        sentiment_column (str): Column containing sentiment scores
+        methods (tuple): Detectors to run ('CUSUM', 'BOCPD')
+
+    Returns:
+        DataFrame: One row per event with date, country, method, direction and magnitude
+    """
+    keys, days, Y = build_series_matrix(df, date_column, sentiment_column, [country_column])
+    monitor = SentimentStreamMonitor(methods=methods)
+    events = []
+
+    for country, values in zip(keys[country_column], Y):
+        for date, value in zip(days, values):
+            events.extend(monitor.update(country, date, float(value))[2])
+
+    columns = [date_column, country_column, 'method', 'direction', 'magnitude']
+    if not events:
+        return pd.DataFrame(columns=columns)
+
+    events = pd.DataFrame(events).rename(columns={'date': date_column, 'country': country_column})
+    return events[columns].sort_values(date_column).reset_index(drop=True)